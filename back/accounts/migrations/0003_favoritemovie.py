@@ -0,0 +1,61 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_favorites_to_table(apps, schema_editor):
+    User = apps.get_model('accounts', 'User')
+    FavoriteMovie = apps.get_model('accounts', 'FavoriteMovie')
+
+    batch = []
+    for user in User.objects.only('id', 'favorite_movies').iterator(chunk_size=1000):
+        for movie_id in dict.fromkeys(user.favorite_movies or []):
+            try:
+                batch.append(FavoriteMovie(user_id=user.id, movie_id=int(movie_id)))
+            except (TypeError, ValueError):
+                continue
+        if len(batch) >= 1000:
+            FavoriteMovie.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        FavoriteMovie.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def copy_favorites_to_json(apps, schema_editor):
+    User = apps.get_model('accounts', 'User')
+    FavoriteMovie = apps.get_model('accounts', 'FavoriteMovie')
+
+    favorites = {}
+    for user_id, movie_id in FavoriteMovie.objects.order_by('created_at', 'id').values_list('user_id', 'movie_id'):
+        favorites.setdefault(user_id, []).append(movie_id)
+    for user_id, movie_ids in favorites.items():
+        User.objects.filter(id=user_id).update(favorite_movies=movie_ids)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_favorite_movies_alter_user_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FavoriteMovie',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('movie_id', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='favorites', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'movie_id'), name='unique_favorite_movie')],
+            },
+        ),
+        migrations.RunPython(copy_favorites_to_table, copy_favorites_to_json),
+        migrations.RemoveField(
+            model_name='user',
+            name='favorite_movies',
+        ),
+    ]
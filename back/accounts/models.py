@@ -10,9 +10,6 @@ class User(AbstractUser):
     favorite_actors = models.TextField(blank=True, null=True)  # 쉼표로 구분
     preferred_countries = models.JSONField(default=list, blank=True)  # ['한국', '미국']
 
-    # 찜한 영화 (TMDB movie_id 목록)
-    favorite_movies = models.JSONField(default=list, blank=True)  # [123, 456, 789]
-
     # 프로필 이미지 (선택사항)
     profile_image = models.URLField(blank=True, null=True)
     
@@ -21,4 +18,23 @@ class User(AbstractUser):
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return self.username
\ No newline at end of file
+        return self.username
+
+
+class FavoriteMovie(models.Model):
+    """찜한 영화 (사용자 × TMDB movie_id, 중복 불가)"""
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='favorites'
+    )
+    movie_id = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'movie_id'], name='unique_favorite_movie'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} ♥ {self.movie_id}"
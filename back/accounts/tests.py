@@ -1,3 +1,117 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from community.models import Review, Comment
+from .models import FavoriteMovie
+
+User = get_user_model()
+
+
+class MyReviewsQueryCountTest(APITestCase):
+    """내 리뷰 목록 조회 쿼리 수가 리뷰 개수와 무관하게 일정한지 확인"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='writer', password='password123')
+        self.other = User.objects.create_user(username='reader', password='password123')
+        self.client.force_authenticate(self.user)
+
+    def test_query_count_is_constant(self):
+        for count in (2, 15):
+            Review.objects.all().delete()
+            for i in range(count):
+                review = Review.objects.create(
+                    user=self.user, movie_id=i, title=f'리뷰 {i}', content='내용', rating=3.0,
+                )
+                review.likes.add(self.other)
+                Review.objects.filter(pk=review.pk).update(like_count=1)
+                Comment.objects.create(review=review, user=self.other, content='댓글')
+
+            with self.assertNumQueries(1):
+                response = self.client.get('/api/accounts/my-reviews/')
+            self.assertEqual(len(response.data['results']), count)
+            self.assertEqual(response.data['results'][0]['like_count'], 1)
+            self.assertEqual(response.data['results'][0]['comment_count'], 1)
+
+
+class FavoriteMovieMigrationTest(TransactionTestCase):
+    """0003: User.favorite_movies JSON 목록 → FavoriteMovie 행 (되돌리면 JSON 으로 복원)"""
+
+    before = [('accounts', '0002_user_favorite_movies_alter_user_id')]
+    after = [('accounts', '0003_favoritemovie')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_json_list_is_copied_and_restored(self):
+        apps = self.migrate(self.before)
+        OldUser = apps.get_model('accounts', 'User')
+        fan = OldUser.objects.create(username='fan', favorite_movies=[550, '13', 550, 'abc', None])
+        OldUser.objects.create(username='empty', favorite_movies=[])
+
+        apps = self.migrate(self.after)
+        rows = apps.get_model('accounts', 'FavoriteMovie').objects.values_list('user_id', 'movie_id')
+        self.assertEqual(sorted(rows), [(fan.id, 13), (fan.id, 550)])
+
+        apps = self.migrate(self.before)
+        OldUser = apps.get_model('accounts', 'User')
+        self.assertEqual(sorted(OldUser.objects.get(username='fan').favorite_movies), [13, 550])
+        self.assertEqual(OldUser.objects.get(username='empty').favorite_movies, [])
+
+
+class FavoriteMovieApiTest(APITestCase):
+    """찜 토글(행 delete 또는 insert) + 찜 여부 일괄 확인"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='fan', password='password123')
+        self.other = User.objects.create_user(username='other', password='password123')
+        self.client.force_authenticate(self.user)
+
+    def toggle(self, movie_id):
+        return self.client.post('/api/accounts/favorite-movies/toggle/', {'movie_id': movie_id}, format='json')
+
+    def test_toggle_inserts_then_deletes(self):
+        FavoriteMovie.objects.create(user=self.other, movie_id=550)
+
+        response = self.toggle('550')
+        self.assertEqual(response.data, {'message': '찜하기에 추가되었습니다.', 'is_favorite': True, 'movie_id': 550})
+        self.assertEqual(list(self.user.favorites.values_list('movie_id', flat=True)), [550])
+
+        response = self.toggle(550)
+        self.assertFalse(response.data['is_favorite'])
+        self.assertFalse(self.user.favorites.exists())
+        # 다른 사용자의 찜은 그대로
+        self.assertTrue(FavoriteMovie.objects.filter(user=self.other, movie_id=550).exists())
+
+    def test_toggle_validates_movie_id(self):
+        self.assertEqual(self.client.post('/api/accounts/favorite-movies/toggle/', {}, format='json').status_code, 400)
+        self.assertEqual(self.toggle('abc').status_code, 400)
+
+    def test_list_keeps_favorite_order(self):
+        for movie_id in (3, 1, 2):
+            self.toggle(movie_id)
+        response = self.client.get('/api/accounts/favorite-movies/')
+        self.assertEqual(response.data['favorite_movies'], [3, 1, 2])
+
+    def test_check_returns_favorites_in_request_order(self):
+        for movie_id in (1, 2, 3):
+            FavoriteMovie.objects.create(user=self.user, movie_id=movie_id)
+        FavoriteMovie.objects.create(user=self.other, movie_id=4)
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/accounts/favorite-movies/check/', {'ids': '3,4,9,1'})
+        self.assertEqual(response.data, {'favorites': [3, 1]})
+
+        self.assertEqual(self.client.get('/api/accounts/favorite-movies/check/', {'ids': ''}).data, {'favorites': []})
+        self.assertEqual(self.client.get('/api/accounts/favorite-movies/check/', {'ids': '1,x'}).status_code, 400)
+        ids = ','.join(str(i) for i in range(101))
+        self.assertEqual(self.client.get('/api/accounts/favorite-movies/check/', {'ids': ids}).status_code, 400)
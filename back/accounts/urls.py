@@ -2,7 +2,7 @@ from django.urls import path
 from . import views
 from .views import (
     CustomTokenObtainPairView, logout_view, delete_account, get_user_info,
-    favorite_movies, toggle_favorite_movie
+    favorite_movies, toggle_favorite_movie, check_favorite_movies
 )
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
@@ -39,4 +39,5 @@ urlpatterns = [
     # 찜한 영화 관리
     path('favorite-movies/', favorite_movies, name='favorite_movies'),
     path('favorite-movies/toggle/', toggle_favorite_movie, name='toggle_favorite_movie'),
+    path('favorite-movies/check/', check_favorite_movies, name='check_favorite_movies'),
 ]
\ No newline at end of file
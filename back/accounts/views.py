@@ -8,8 +8,10 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth import authenticate, logout
+from django.db import transaction, IntegrityError
 
 
+from .models import FavoriteMovie
 from .serializers import SignupSerializer
 from .serializers import (
     PasswordChangeSerializer,
@@ -18,6 +20,11 @@ from .serializers import (
 )
 from community.serializers import ReviewSerializer, CommentSerializer
 from community.models import Review, Comment
+from final_project.pagination import paginate, NewestFirstCursorPagination
+from movies.home_feed import PREFERENCE_FIELDS, invalidate_home_feed
+
+# 찜 여부 일괄 확인 시 한 번에 받을 수 있는 최대 ID 수
+MAX_FAVORITE_CHECK_IDS = 100
 
 # 회원가입 
 @api_view(['POST'])
@@ -115,7 +122,11 @@ def profile_view(request):
     elif request.method in ['PUT', 'PATCH']:
         serializer = UserProfileUpdateSerializer(user, data=request.data, partial=True)
         if serializer.is_valid():
+            before = {field: getattr(user, field) for field in PREFERENCE_FIELDS}
             serializer.save()
+            # 홈 피드에 영향을 주는 취향 필드가 바뀐 경우에만 피드 캐시 무효화
+            if any(getattr(user, field) != value for field, value in before.items()):
+                invalidate_home_feed(user.id)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -125,9 +136,11 @@ def profile_view(request):
 @permission_classes([IsAuthenticated])
 def my_reviews(request):
     """현재 로그인한 사용자가 작성한 리뷰 목록 반환"""
-    reviews = Review.objects.filter(user=request.user).order_by('-created_at')
-    serializer = ReviewSerializer(reviews, many=True, context={'request': request})
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    reviews = Review.objects.filter(user=request.user).with_stats(request.user)
+    return paginate(
+        request, reviews, NewestFirstCursorPagination,
+        lambda page: ReviewSerializer(page, many=True, context={'request': request}).data,
+    )
 
 
 # 내가 작성한 댓글 조회
@@ -135,9 +148,11 @@ def my_reviews(request):
 @permission_classes([IsAuthenticated])
 def my_comments(request):
     """현재 로그인한 사용자가 작성한 댓글 목록 반환"""
-    comments = Comment.objects.filter(user=request.user).order_by('-created_at').select_related('review')
-    serializer = CommentSerializer(comments, many=True, context={'request': request})
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    comments = Comment.objects.filter(user=request.user).select_related('user')
+    return paginate(
+        request, comments, NewestFirstCursorPagination,
+        lambda page: CommentSerializer(page, many=True, context={'request': request}).data,
+    )
 
 
 # 찜한 영화 목록 조회
@@ -145,9 +160,41 @@ def my_comments(request):
 @permission_classes([IsAuthenticated])
 def favorite_movies(request):
     """현재 로그인한 사용자가 찜한 영화 목록 반환"""
-    user = request.user
+    movie_ids = request.user.favorites.order_by('created_at', 'id').values_list('movie_id', flat=True)
+    return Response({
+        'favorite_movies': list(movie_ids)
+    }, status=status.HTTP_200_OK)
+
+
+# 찜 여부 일괄 확인
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def check_favorite_movies(request):
+    """
+    주어진 영화 ID 중 찜한 영화만 반환 (목록 페이지 하트 표시용, 쿼리 1번)
+
+    Query Parameters:
+    - ids: 쉼표로 구분한 movie_id 목록 (최대 100개)
+    """
+    try:
+        movie_ids = [int(movie_id) for movie_id in request.GET.get('ids', '').split(',') if movie_id.strip()]
+    except ValueError:
+        return Response(
+            {'error': '유효하지 않은 movie_id입니다.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if len(movie_ids) > MAX_FAVORITE_CHECK_IDS:
+        return Response(
+            {'error': f'한 번에 최대 {MAX_FAVORITE_CHECK_IDS}개까지 확인할 수 있습니다.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    favorites = set(
+        request.user.favorites.filter(movie_id__in=movie_ids).values_list('movie_id', flat=True)
+    )
     return Response({
-        'favorite_movies': user.favorite_movies
+        'favorites': [movie_id for movie_id in movie_ids if movie_id in favorites]
     }, status=status.HTTP_200_OK)
 
 
@@ -155,7 +202,12 @@ def favorite_movies(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def toggle_favorite_movie(request):
-    """영화 찜하기 추가/제거"""
+    """
+    영화 찜하기 추가/제거
+
+    응답: message, is_favorite, movie_id
+    (찜 목록 전체 favorite_movies 는 더 이상 내려주지 않음 → 필요하면 GET favorite-movies/)
+    """
     user = request.user
     movie_id = request.data.get('movie_id')
 
@@ -174,21 +226,25 @@ def toggle_favorite_movie(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    # 찜하기 토글
-    if movie_id in user.favorite_movies:
-        user.favorite_movies.remove(movie_id)
+    # 찜하기 토글 (행 하나 delete 또는 insert, User 행은 건드리지 않음)
+    deleted, _ = FavoriteMovie.objects.filter(user=user, movie_id=movie_id).delete()
+    if deleted:
         is_favorite = False
         message = '찜하기가 취소되었습니다.'
     else:
-        user.favorite_movies.append(movie_id)
+        try:
+            with transaction.atomic():
+                FavoriteMovie.objects.create(user=user, movie_id=movie_id)
+        except IntegrityError:
+            # 다른 탭에서 동시에 찜한 경우
+            pass
         is_favorite = True
         message = '찜하기에 추가되었습니다.'
-
-    user.save()
+    # 찜한 영화는 홈 피드에서 빠짐 (취소하면 다시 후보)
+    invalidate_home_feed(user.id)
 
     return Response({
         'message': message,
         'is_favorite': is_favorite,
-        'favorite_movies': user.favorite_movies
+        'movie_id': movie_id,
     }, status=status.HTTP_200_OK)
-
@@ -0,0 +1,7 @@
+"""
+성능 측정 도구 (python manage.py benchmark)
+
+- tmdb_stub: 지연 시간을 조절할 수 있는 로컬 TMDB 가짜 서버
+- dataset: 재현 가능한 합성 데이터 (같은 seed → 같은 데이터)
+- load: 로컬 WSGI 서버에 동시 요청을 보내 라우트별 지연 시간 분포 / 처리량 / 쿼리 수 측정
+"""
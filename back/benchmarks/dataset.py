@@ -0,0 +1,438 @@
+"""
+합성 데이터 생성 (seed 가 같으면 항상 같은 데이터)
+
+영화는 tmdb_stub.fake_movie 와 같은 내용이라 DB 영화와 가짜 TMDB 응답이 일치한다.
+리뷰/좋아요/댓글/찜은 Zipf 분포(순위^-skew 가중치)로 뽑아서 인기 영화·인기 리뷰·활동 많은 사용자에 몰린다.
+
+수백만 행을 몇 분 안에 넣기 위해
+- 난수는 numpy 로 청크 단위로 뽑고, 열마다 독립된 난수 스트림을 써서 청크 크기와 무관하게 같은 결과
+- 모델 객체 대신 값 튜플을 만들고, 청크마다 트랜잭션 하나로 INSERT
+  (PostgreSQL 은 COPY, SQLite 는 준비된 INSERT 문 executemany, 그 외는 bulk_create)
+- SQLite 는 적재 중에만 동기화/저널 PRAGMA 를 낮추고 외래 키 검사를 끔
+- 리뷰 검색 인덱스는 적재가 끝난 뒤 한 번에 다시 색인
+- 모델 시그널을 거치지 않으므로 파생 데이터(장르 연결, 감정 색인/집계, like_count)는 직접 채움
+- 리뷰 작성 시각은 id 순서대로 TIME_SPAN 에 고르게 퍼뜨리고, 댓글은 리뷰 작성 이후 시각으로 넣음
+  (모두 같은 시각이면 최신순 커서 페이지네이션이 id 로만 정렬되어 실제 분포와 달라짐)
+"""
+import io
+import json
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from final_project.fulltext import bigram_text
+
+from accounts.models import FavoriteMovie
+from community.models import Comment, Review, ReviewEmotion
+from community.search import deferred_search_index
+from movies.genres import sync_genres_for_tmdb_ids
+from movies.models import Movie
+from movies.tmdb import movie_fields, payload_hash
+from .tmdb_stub import fake_movie
+
+User = get_user_model()
+Like = Review.likes.through
+
+USERNAME_PREFIX = 'bench'
+PASSWORD = 'benchmark-password'
+BATCH_SIZE = 10000
+EMOTIONS = [code for code, _ in Review.EMOTION_CHOICES]
+PROFILE_GENRES = ['액션', '코미디', '드라마', '스릴러', 'SF', '로맨스']
+PROFILE_COUNTRIES = ['한국', '미국', '일본']
+RATINGS = [1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5]
+RATING_WEIGHTS = [0.02, 0.02, 0.04, 0.06, 0.12, 0.18, 0.24, 0.18, 0.14]
+# 리뷰당 감정 태그 수 0 / 1 / 2 비율
+TAG_COUNT_WEIGHTS = [0.2, 0.5, 0.3]
+# 리뷰 / 댓글 본문 단어 (검색 벤치마크가 '좋았다' 같은 단어를 찾을 수 있도록 고정 어휘)
+WORDS = [
+    '영화가', '정말', '좋았다', '배우', '연기가', '훌륭했다', '스토리', '지루했다', '감동적인', '장면',
+    '음악이', '인상적이었다', '결말이', '아쉬웠다', '다시', '보고', '싶다', '추천', '합니다', '최고의',
+    '연출', '몰입감', '긴장감', '웃음', '눈물', '기대', '이상', '이하', '평범한', '독특한',
+]
+REVIEW_WORDS = 12
+COMMENT_WORDS = 5
+# 리뷰 작성 시각 범위 (seed 를 실행한 시각 기준 과거)
+TIME_SPAN = timedelta(days=365)
+
+# 열마다 독립된 난수 스트림 (순서를 바꾸면 같은 seed 라도 데이터가 달라짐)
+STREAMS = [
+    'review_movie', 'review_user', 'review_rating', 'review_tag_count', 'review_tag', 'review_second_tag',
+    'review_words',
+    'like_review', 'like_user', 'comment_review', 'comment_user', 'comment_words',
+    'favorite_user', 'favorite_movie', 'comment_delay',
+]
+
+
+class ZipfSampler:
+    """0..size-1 중 순위 r 을 (r + 1)^-skew 에 비례하는 확률로 뽑음 (0 이 가장 자주 나옴)"""
+
+    def __init__(self, size, skew):
+        weights = 1.0 / np.arange(1, size + 1, dtype=np.float64) ** skew
+        self.cdf = np.cumsum(weights)
+        self.cdf /= self.cdf[-1]
+
+    def __call__(self, stream, count):
+        picks = np.searchsorted(self.cdf, stream.random(count), side='right')
+        return np.minimum(picks, len(self.cdf) - 1)
+
+
+def unique_pairs(left, right, right_size):
+    """(left, right) 쌍 중복 제거 (유니크 제약이 있는 좋아요 / 찜용), left 순으로 정렬됨"""
+    keys = np.unique(left.astype(np.int64) * right_size + right)
+    return keys // right_size, keys % right_size
+
+
+def _chunks(total, size):
+    for start in range(0, total, size):
+        yield start, min(start + size, total)
+
+
+def _next_id(model):
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+def _words(picks):
+    return [' '.join(WORDS[index] for index in row) for row in picks.tolist()]
+
+
+def review_ages(indexes, total):
+    """리뷰 순번 → 기준 시각 이전 경과 시간(마이크로초), 순번이 클수록 최근"""
+    span = TIME_SPAN // timedelta(microseconds=1)
+    return (total - np.asarray(indexes, dtype=np.int64)) * (span // max(total, 1))
+
+
+def _timestamps(now, ages):
+    return [now - timedelta(microseconds=age) for age in ages.tolist()]
+
+
+# ========== 대량 INSERT ==========
+
+# 변환 없이 그대로 DB 에 넘길 수 있는 필드 (SQLite)
+_PASSTHROUGH_TYPES = {
+    'AutoField', 'BigAutoField', 'IntegerField', 'BigIntegerField', 'SmallIntegerField',
+    'PositiveIntegerField', 'PositiveSmallIntegerField', 'FloatField', 'CharField', 'TextField', 'ForeignKey',
+}
+
+
+def _copy_text(value):
+    """PostgreSQL COPY 텍스트 형식 값"""
+    if value is None:
+        return r'\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value, ensure_ascii=False)
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def _fields(model, names):
+    """
+    (지정한 필드, [(나머지 필드, 값)])
+
+    나머지 필드는 bulk_create 와 같게 auto_now / auto_now_add 는 현재 시각, 그 외는 기본값으로 채움
+    """
+    by_name = {}
+    for field in model._meta.concrete_fields:
+        by_name[field.name] = by_name[field.attname] = field
+    given = [by_name[name] for name in names]
+    now = timezone.now()
+    rest = [
+        (field, now if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False) else field.get_default())
+        for field in model._meta.concrete_fields
+        if field not in given and not field.primary_key
+    ]
+    return given, rest
+
+
+def _copy(table, given, rest, rows):
+    """PostgreSQL: COPY FROM STDIN"""
+    extra = ''.join('\t' + _copy_text(field.get_prep_value(value)) for field, value in rest)
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(_copy_text(field.get_prep_value(value)) for field, value in zip(given, row)))
+        buffer.write(extra)
+        buffer.write('\n')
+
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(field.column) for field in given + [field for field, _ in rest])
+    sql = f"COPY {quote(table)} ({columns}) FROM STDIN"
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        if hasattr(raw, 'copy'):
+            # psycopg 3
+            with raw.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+        else:
+            # psycopg2
+            buffer.seek(0)
+            raw.copy_expert(sql, buffer)
+
+
+def _executemany(table, given, rest, rows):
+    """SQLite: 준비된 INSERT 문 하나를 executemany (bulk_create 의 행별 SQL 조립 비용이 없음)"""
+    # connection 은 스레드별 프록시라 속성 접근이 느림 → 값마다 쓰지 않고 실제 연결 객체를 한 번만 꺼냄
+    db = connections[DEFAULT_DB_ALIAS]
+    extra = tuple(field.get_db_prep_save(value, db) for field, value in rest)
+    converters = [None if field.get_internal_type() in _PASSTHROUGH_TYPES else field for field in given]
+    if any(converters):
+        rows = (
+            tuple(
+                value if field is None else field.get_db_prep_save(value, db)
+                for field, value in zip(converters, row)
+            )
+            for row in rows
+        )
+    fields = given + [field for field, _ in rest]
+    quote = connection.ops.quote_name
+    sql = (
+        f"INSERT INTO {quote(table)} ({', '.join(quote(field.column) for field in fields)}) "
+        f"VALUES ({', '.join(['%s'] * len(fields))})"
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [row + extra for row in rows])
+
+
+def insert(model, names, rows):
+    """
+    청크 하나 INSERT (트랜잭션은 호출하는 쪽에서)
+
+    names: 필드 이름 (또는 attname) 목록, rows: 그 순서의 값 튜플 목록
+    PostgreSQL 은 COPY, SQLite 는 executemany, 그 외는 bulk_create. 모델 시그널은 거치지 않는다.
+    """
+    if not rows:
+        return
+    if connection.vendor in ('postgresql', 'sqlite'):
+        given, rest = _fields(model, names)
+        write = _copy if connection.vendor == 'postgresql' else _executemany
+        write(model._meta.db_table, given, rest, rows)
+    else:
+        model.objects.bulk_create([model(**dict(zip(names, row))) for row in rows])
+
+
+@contextmanager
+def bulk_load_settings():
+    """
+    적재 중에만 쓰는 DB 설정
+
+    - SQLite: 커밋마다 fsync 하지 않고(synchronous=OFF) 롤백 저널은 메모리에,
+      페이지 캐시 확대, 외래 키 검사 끔 (데이터는 생성 순서상 항상 참조가 맞음)
+    - PostgreSQL: synchronous_commit 끔 (비정상 종료 시 마지막 몇 커밋만 잃고 DB 는 일관성 유지)
+    """
+    vendor = connection.vendor
+    with connection.cursor() as cursor:
+        if vendor == 'sqlite':
+            saved = {}
+            for name in ('synchronous', 'cache_size', 'temp_store', 'journal_mode'):
+                cursor.execute(f'PRAGMA {name}')
+                saved[name] = cursor.fetchone()[0]
+            cursor.execute('PRAGMA synchronous = OFF')
+            cursor.execute('PRAGMA cache_size = -262144')
+            cursor.execute('PRAGMA temp_store = MEMORY')
+            if saved['journal_mode'] != 'wal':
+                cursor.execute('PRAGMA journal_mode = MEMORY')
+        elif vendor == 'postgresql':
+            cursor.execute('SET synchronous_commit TO OFF')
+
+    try:
+        with connection.constraint_checks_disabled():
+            yield
+    finally:
+        with connection.cursor() as cursor:
+            if vendor == 'sqlite':
+                for name, value in saved.items():
+                    cursor.execute(f'PRAGMA {name} = {value}')
+            elif vendor == 'postgresql':
+                cursor.execute('RESET synchronous_commit')
+
+
+@contextmanager
+def deferred_indexes(*models):
+    """
+    적재하는 동안 Meta.indexes 를 지웠다가 끝난 뒤 다시 생성
+
+    행마다 여러 B-tree 를 갱신하는 것보다 다 넣은 뒤 정렬해서 한 번에 만드는 편이 빠르다.
+    (유니크 제약과 외래 키 인덱스는 그대로 둠)
+    """
+    indexes = [(model, index) for model in models for index in model._meta.indexes]
+    with connection.schema_editor() as editor:
+        for model, index in indexes:
+            editor.remove_index(model, index)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                editor.add_index(model, index)
+
+
+class _Progress:
+    def __init__(self, stdout):
+        self.stdout = stdout
+
+    @contextmanager
+    def step(self, label):
+        started = time.perf_counter()
+        counter = {'rows': 0}
+        yield counter
+        elapsed = time.perf_counter() - started
+        if self.stdout is not None:
+            rate = f", {counter['rows'] / elapsed:,.0f}행/초" if counter['rows'] and elapsed else ''
+            self.stdout.write(f"  {label}: {counter['rows']:,}행 {elapsed:.1f}초{rate}")
+
+
+# ========== 생성 ==========
+
+def seed(users=200, movies=1000, reviews=5000, comments=5000, likes=10000, favorites=2000,
+         seed=42, skew=1.0, prefix=USERNAME_PREFIX, batch_size=BATCH_SIZE, stdout=None):
+    """
+    합성 데이터 생성, 실제로 만든 행 수 dict 반환
+
+    좋아요 / 찜은 중복 쌍을 제거하므로 요청한 수보다 적을 수 있다.
+    기존 데이터가 있는 DB 에도 넣을 수 있지만 prefix 로 시작하는 사용자가 이미 있으면 안 된다.
+    """
+    children = np.random.SeedSequence(seed).spawn(len(STREAMS))
+    streams = {name: np.random.default_rng(child) for name, child in zip(STREAMS, children)}
+    pick_user = ZipfSampler(users, skew)
+    pick_movie = ZipfSampler(movies, skew)
+    pick_review = ZipfSampler(reviews, skew)
+    progress = _Progress(stdout)
+    counts = {}
+    now = timezone.now()
+
+    with bulk_load_settings():
+        with progress.step('사용자') as step:
+            first_user_id = _next_id(User)
+            password = make_password(PASSWORD)
+            profile = random.Random(seed)
+            for start, end in _chunks(users, batch_size):
+                with transaction.atomic():
+                    insert(User, ['id', 'username', 'password', 'favorite_genres', 'preferred_countries'], [
+                        (
+                            first_user_id + i, f'{prefix}{i}', password,
+                            profile.sample(PROFILE_GENRES, profile.randint(0, 2)),
+                            profile.sample(PROFILE_COUNTRIES, profile.randint(0, 1)),
+                        )
+                        for i in range(start, end)
+                    ])
+            counts['users'] = step['rows'] = users
+
+        with progress.step('영화') as step:
+            # 같은 tmdb_id 영화가 이미 있으면 그대로 사용 (리뷰 / 찜은 tmdb_id 로 연결)
+            existing = set(Movie.objects.filter(tmdb_id__lte=movies).values_list('tmdb_id', flat=True))
+            new_ids = [tmdb_id for tmdb_id in range(1, movies + 1) if tmdb_id not in existing]
+            names = None
+            for start, end in _chunks(len(new_ids), batch_size):
+                rows = []
+                for tmdb_id in new_ids[start:end]:
+                    fields = movie_fields(fake_movie(tmdb_id))
+                    names = names or ['tmdb_id', 'payload_hash', 'search_bigrams', *fields]
+                    search_bigrams = bigram_text(*(fields[name] for name in Movie.SEARCH_FIELDS))
+                    rows.append((tmdb_id, payload_hash(fields), search_bigrams, *fields.values()))
+                with transaction.atomic():
+                    insert(Movie, names, rows)
+                    sync_genres_for_tmdb_ids(new_ids[start:end])
+            counts['movies'] = step['rows'] = len(new_ids)
+
+        # 좋아요를 먼저 뽑아서 리뷰의 like_count 를 INSERT 할 때 같이 채움
+        like_reviews, like_users = unique_pairs(
+            pick_review(streams['like_review'], likes), pick_user(streams['like_user'], likes), users,
+        )
+        like_counts = np.bincount(like_reviews, minlength=reviews)
+
+        with progress.step('리뷰') as step, deferred_search_index(), deferred_indexes(Review, ReviewEmotion):
+            first_review_id = _next_id(Review)
+            emotion_rows = 0
+            for start, end in _chunks(reviews, batch_size):
+                size = end - start
+                review_ids = range(first_review_id + start, first_review_id + end)
+                movie_ids = (pick_movie(streams['review_movie'], size) + 1).tolist()
+                user_ids = (pick_user(streams['review_user'], size) + first_user_id).tolist()
+                ratings = streams['review_rating'].choice(RATINGS, size, p=RATING_WEIGHTS).tolist()
+                tag_counts = streams['review_tag_count'].choice(3, size, p=TAG_COUNT_WEIGHTS).tolist()
+                # 서로 다른 감정 2개를 뽑아 두고 태그 수만큼 사용
+                first_tags = streams['review_tag'].integers(0, len(EMOTIONS), size)
+                second_tags = (first_tags + streams['review_second_tag'].integers(1, len(EMOTIONS), size)) % len(EMOTIONS)
+                tags = [
+                    [EMOTIONS[index] for index in pair[:count]]
+                    for pair, count in zip(np.stack([first_tags, second_tags], axis=1).tolist(), tag_counts)
+                ]
+                contents = _words(streams['review_words'].integers(0, len(WORDS), (size, REVIEW_WORDS)))
+                chunk_likes = like_counts[start:end].tolist()
+                created = _timestamps(now, review_ages(np.arange(start, end), reviews))
+
+                titles = [f'리뷰 {start + i}' for i in range(size)]
+                rows = [
+                    (
+                        review_ids[i], user_ids[i], movie_ids[i], titles[i], contents[i],
+                        bigram_text(titles[i], contents[i]), ratings[i], tags[i], chunk_likes[i], created[i],
+                    )
+                    for i in range(size)
+                ]
+                emotions = [
+                    (review_ids[i], movie_ids[i], emotion) for i in range(size) for emotion in tags[i]
+                ]
+                with transaction.atomic():
+                    insert(Review, [
+                        'id', 'user_id', 'movie_id', 'title', 'content', 'search_bigrams', 'rating', 'emotion_tags',
+                        'like_count', 'created_at',
+                    ], rows)
+                    insert(ReviewEmotion, ['review_id', 'movie_id', 'emotion'], emotions)
+                emotion_rows += len(emotions)
+            counts['reviews'] = step['rows'] = reviews
+            counts['review_emotions'] = emotion_rows
+
+        with progress.step('좋아요') as step:
+            review_ids = (like_reviews + first_review_id).tolist()
+            user_ids = (like_users + first_user_id).tolist()
+            for start, end in _chunks(len(review_ids), batch_size):
+                with transaction.atomic():
+                    insert(Like, ['review_id', 'user_id'], list(zip(review_ids[start:end], user_ids[start:end])))
+            counts['likes'] = step['rows'] = len(review_ids)
+
+        with progress.step('댓글') as step, deferred_indexes(Comment):
+            for start, end in _chunks(comments, batch_size):
+                size = end - start
+                review_indexes = pick_review(streams['comment_review'], size)
+                review_ids = (review_indexes + first_review_id).tolist()
+                user_ids = (pick_user(streams['comment_user'], size) + first_user_id).tolist()
+                contents = _words(streams['comment_words'].integers(0, len(WORDS), (size, COMMENT_WORDS)))
+                # 리뷰 작성 시각과 기준 시각 사이
+                ages = review_ages(review_indexes, reviews)
+                created = _timestamps(now, (ages * streams['comment_delay'].random(size)).astype(np.int64))
+                with transaction.atomic():
+                    insert(Comment, ['review_id', 'user_id', 'content', 'created_at'],
+                           list(zip(review_ids, user_ids, contents, created)))
+            counts['comments'] = step['rows'] = comments
+
+        with progress.step('찜') as step:
+            favorite_users, favorite_movies = unique_pairs(
+                pick_user(streams['favorite_user'], favorites), pick_movie(streams['favorite_movie'], favorites), movies,
+            )
+            user_ids = (favorite_users + first_user_id).tolist()
+            movie_ids = (favorite_movies + 1).tolist()
+            for start, end in _chunks(len(user_ids), batch_size):
+                with transaction.atomic():
+                    insert(FavoriteMovie, ['user_id', 'movie_id'], list(zip(user_ids[start:end], movie_ids[start:end])))
+            counts['favorites'] = step['rows'] = len(user_ids)
+
+    # id 를 직접 넣은 테이블은 시퀀스를 최댓값 뒤로 (PostgreSQL)
+    sequence_sql = connection.ops.sequence_reset_sql(no_style(), [User, Review])
+    with progress.step('집계 / 통계'), connection.cursor() as cursor:
+        for sql in sequence_sql:
+            cursor.execute(sql)
+        # ReviewEmotion 은 위에서 채웠으므로 영화별 감정 집계만 다시 계산
+        call_command('reconcile_emotion_stats', stdout=io.StringIO())
+        # 쿼리 플래너 통계 갱신
+        cursor.execute('ANALYZE')
+
+    return counts
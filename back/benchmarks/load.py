@@ -0,0 +1,179 @@
+"""
+로컬 WSGI 서버에 동시 요청을 보내 라우트별 성능 측정
+
+라우트마다 같은 수의 요청을 같은 동시성으로 보내고,
+지연 시간 분포(p50/p95/p99), 처리량, 요청당 DB 쿼리 수 / TMDB 호출 수를 모은다.
+쿼리 수와 TMDB 호출 수는 RequestMetricsMiddleware 의 Server-Timing 헤더에서 읽는다.
+"""
+import random
+import re
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import requests
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+
+_TIMING_COUNT = re.compile(r'(\w+);dur=[\d.]+;desc="(\d+) ')
+
+
+@dataclass
+class Route:
+    """
+    측정할 API 하나
+
+    build(ctx, rng, i) → (경로, JSON 본문 또는 None, JWT 또는 None)
+    i 는 0 부터 시작하는 요청 번호 (삭제처럼 매번 다른 대상이 필요한 경우에 사용)
+    max_requests: 측정 요청 수 상한 (비밀번호 해시처럼 요청 하나가 매우 느린 라우트용)
+    """
+    name: str
+    method: str
+    build: Callable
+    warmup: bool = True
+    max_requests: Optional[int] = None
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalServer:
+    """Django WSGI 앱을 로컬 스레드 서버로 띄움 (runserver 와 같은 서버, 요청마다 스레드)"""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self.httpd = ThreadedWSGIServer((host, port), _QuietHandler)
+        self.httpd.set_app(get_wsgi_application())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def percentile(sorted_values, fraction):
+    """정렬된 값의 백분위수 (가장 가까운 순위 방식)"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _request_seed(*parts):
+    """요청별 rng seed (내장 hash() 는 프로세스마다 달라서 쓰지 않음)"""
+    return zlib.crc32(":".join(map(str, parts)).encode())
+
+
+def _timing_counts(header):
+    """Server-Timing 헤더 → {'db': 쿼리 수, 'tmdb': 호출 수}"""
+    return {name: int(count) for name, count in _TIMING_COUNT.findall(header or '')}
+
+
+class LoadRunner:
+    def __init__(self, base_url, ctx, concurrency=8, requests_per_route=200, seed=42, timeout=30):
+        self.base_url = base_url
+        self.ctx = ctx
+        self.concurrency = concurrency
+        self.requests_per_route = requests_per_route
+        self.seed = seed
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _send(self, route, rng_seed, i):
+        path, body, token = route.build(self.ctx, random.Random(rng_seed), i)
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        started = time.perf_counter()
+        try:
+            response = self._session().request(
+                route.method, f"{self.base_url}{path}", json=body, headers=headers, timeout=self.timeout,
+            )
+        except requests.RequestException:
+            # 연결 오류 / 타임아웃은 상태 코드 0 으로 기록, 연결이 깨졌을 수 있으므로 세션 교체
+            self._local.session = None
+            return time.perf_counter() - started, 0, {}
+        elapsed = time.perf_counter() - started
+        return elapsed, response.status_code, _timing_counts(response.headers.get('Server-Timing'))
+
+    def warm_up(self, route, count):
+        for i in range(count):
+            self._send(route, _request_seed(self.seed, route.name, 'warmup', i), i)
+
+    def run(self, route):
+        """라우트 하나를 측정해서 결과 dict 반환"""
+        # 요청별 rng seed 는 (seed, 라우트, 번호) 로 고정 → 실행마다 같은 요청 순서
+        count = min(self.requests_per_route, route.max_requests or self.requests_per_route)
+        seeds = [_request_seed(self.seed, route.name, i) for i in range(count)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = list(executor.map(lambda i: self._send(route, seeds[i], i), range(count)))
+        wall = time.perf_counter() - started
+
+        latencies = sorted(elapsed for elapsed, _, _ in results)
+        errors = sum(1 for _, status_code, _ in results if status_code >= 500)
+        connection_errors = sum(1 for _, status_code, _ in results if status_code == 0)
+        client_errors = sum(1 for _, status_code, _ in results if 400 <= status_code < 500)
+        queries = [counts.get('db', 0) for _, _, counts in results]
+        tmdb_calls = [counts.get('tmdb', 0) for _, _, counts in results]
+
+        def ms(value):
+            return round(value * 1000, 2) if value is not None else None
+
+        return {
+            'method': route.method,
+            'requests': len(results),
+            'server_errors': errors,
+            'client_errors': client_errors,
+            'connection_errors': connection_errors,
+            'throughput_rps': round(len(results) / wall, 1) if wall else None,
+            'latency_ms': {
+                'mean': ms(sum(latencies) / len(latencies)),
+                'p50': ms(percentile(latencies, 0.50)),
+                'p95': ms(percentile(latencies, 0.95)),
+                'p99': ms(percentile(latencies, 0.99)),
+                'max': ms(latencies[-1]),
+            },
+            'db_queries': {'mean': round(sum(queries) / len(queries), 2), 'max': max(queries)},
+            'tmdb_calls': {'mean': round(sum(tmdb_calls) / len(tmdb_calls), 2), 'max': max(tmdb_calls)},
+        }
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    두 결과의 p95 / 평균 쿼리 수 비교
+
+    반환값: [(라우트, 항목, 이전 값, 현재 값)] - threshold 비율 이상 나빠진 것만
+    """
+    regressions = []
+    for name, result in current['routes'].items():
+        before = baseline.get('routes', {}).get(name)
+        if before is None:
+            continue
+        checks = [
+            ('p95_ms', before['latency_ms']['p95'], result['latency_ms']['p95']),
+            ('db_queries', before['db_queries']['mean'], result['db_queries']['mean']),
+        ]
+        for metric, old, new in checks:
+            if old is not None and new is not None and new > old * (1 + threshold) and new - old > 0.5:
+                regressions.append((name, metric, old, new))
+    return regressions
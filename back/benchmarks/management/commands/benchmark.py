@@ -0,0 +1,173 @@
+import json
+import logging
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+import movies.tmdb
+from benchmarks import dataset
+from benchmarks.load import LoadRunner, LocalServer, compare
+from benchmarks.routes import ROUTES, build_context
+from benchmarks.tmdb_stub import CATALOG_SIZE, TMDBStubServer
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True, cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        '별도 벤치마크 DB에 합성 데이터를 넣고, 로컬 TMDB 가짜 서버와 로컬 서버를 띄워 '
+        '모든 /api 라우트에 동시 요청을 보낸 뒤 p50/p95/p99, 처리량, 쿼리 수를 JSON 으로 저장'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200, help='합성 사용자 수 (기본 200)')
+        parser.add_argument('--movies', type=int, default=1000, help='합성 영화 수 (기본 1000)')
+        parser.add_argument('--reviews', type=int, default=5000, help='합성 리뷰 수 (기본 5000)')
+        parser.add_argument('--seed', type=int, default=42, help='데이터 / 요청 순서 난수 seed (기본 42)')
+        parser.add_argument('--skew', type=float, default=1.0, help='합성 데이터 Zipf 지수 (기본 1.0)')
+        parser.add_argument('--concurrency', type=int, default=8, help='동시 요청 수 (기본 8)')
+        parser.add_argument('--requests', type=int, default=200, help='라우트별 측정 요청 수 (기본 200)')
+        parser.add_argument('--warmup', type=int, default=10, help='라우트별 측정 전 요청 수 (기본 10)')
+        parser.add_argument('--tmdb-latency', type=float, default=0.05, help='가짜 TMDB 응답 지연 (초, 기본 0.05)')
+        parser.add_argument('--route', action='append', help='이 이름으로 시작하는 라우트만 측정 (여러 번 지정 가능)')
+        parser.add_argument('--skip-build', action='store_true', help='추천/유사 영화 사전 계산 생략')
+        parser.add_argument('--output', help='결과 JSON 저장 경로')
+        parser.add_argument('--compare', help='비교할 이전 결과 JSON (p95 / 쿼리 수가 20%% 이상 나빠지면 실패)')
+        parser.add_argument('--threshold', type=float, default=0.2, help='--compare 허용 비율 (기본 0.2)')
+
+    def handle(self, *args, **options):
+        routes = [
+            route for route in ROUTES
+            if not options['route'] or any(route.name.startswith(prefix) for prefix in options['route'])
+        ]
+        if not routes:
+            raise CommandError('측정할 라우트가 없습니다.')
+
+        # 개발 DB는 건드리지 않도록 테스트 DB와 같은 방식으로 별도 DB 생성
+        if connection.vendor == 'sqlite':
+            connection.settings_dict['TEST']['NAME'] = settings.BASE_DIR / 'benchmark_db.sqlite3'
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            result = self._run(routes, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"💾 {options['output']} 저장"))
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as f:
+                baseline = json.load(f)
+            regressions = compare(baseline, result, options['threshold'])
+            for name, metric, old, new in regressions:
+                self.stdout.write(self.style.ERROR(f"❌ {name} {metric}: {old} → {new}"))
+            if regressions:
+                raise CommandError(f"{len(regressions)}개 항목이 기준보다 나빠졌습니다.")
+            self.stdout.write(self.style.SUCCESS(f"✅ {options['compare']} 대비 성능 저하 없음"))
+
+    def _run(self, routes, options):
+        # 응답 캐시에 이전 실행(또는 개발 DB)의 항목이 남아 있으면 결과가 달라짐
+        cache.clear()
+        settings.DEBUG = False
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, '127.0.0.1', 'localhost']
+
+        started = time.perf_counter()
+        counts = dataset.seed(
+            users=options['users'],
+            movies=options['movies'],
+            reviews=options['reviews'],
+            comments=options['reviews'],
+            likes=options['reviews'] * 2,
+            favorites=options['users'] * 10,
+            seed=options['seed'],
+            skew=options['skew'],
+            stdout=self.stdout,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"\n🌱 합성 데이터 {counts} ({time.perf_counter() - started:.1f}초)"
+        ))
+
+        # DB 에 없는 영화도 가짜 TMDB 에는 있도록 카탈로그를 넉넉하게
+        catalog_size = max(CATALOG_SIZE, options['movies'] + 1000)
+        with TMDBStubServer(latency=options['tmdb_latency'], catalog_size=catalog_size) as stub:
+            settings.TMDB_BASE_URL = stub.base_url
+            settings.TMDB_API_KEY = 'benchmark'
+            movies.tmdb._client = None
+
+            if not options['skip_build']:
+                for command in ('refresh_emotion_recommendations', 'build_similar_movies', 'train_recommendations'):
+                    call_command(command, stdout=self.stdout)
+
+            ctx = build_context(options['movies'], options['requests'])
+            runner = LoadRunner(
+                base_url=None, ctx=ctx,
+                concurrency=options['concurrency'], requests_per_route=options['requests'], seed=options['seed'],
+            )
+
+            # 요청 로그 / 느린 요청 경고가 결과 표를 가리지 않도록 측정 중에는 ERROR 만 출력
+            logging.disable(logging.WARNING)
+            try:
+                results = self._measure(runner, routes, options)
+            finally:
+                logging.disable(logging.NOTSET)
+            tmdb_requests = stub.requests
+
+        return {
+            'meta': {
+                'commit': _git_commit(),
+                'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'cache': settings.CACHES['default']['BACKEND'],
+                'parameters': {
+                    key: options[key]
+                    for key in (
+                        'users', 'movies', 'reviews', 'seed', 'skew',
+                        'concurrency', 'requests', 'warmup', 'tmdb_latency',
+                    )
+                },
+                'dataset': counts,
+                'tmdb_stub_requests': tmdb_requests,
+            },
+            'routes': results,
+        }
+
+    def _measure(self, runner, routes, options):
+        results = {}
+        with LocalServer() as server:
+            runner.base_url = server.base_url
+            self.stdout.write(
+                f"\n{'route':<42} {'p50':>8} {'p95':>8} {'p99':>8} {'rps':>8} {'queries':>8} {'tmdb':>6} {'err':>5}"
+            )
+            for route in routes:
+                if route.warmup and options['warmup']:
+                    runner.warm_up(route, options['warmup'])
+                result = results[route.name] = runner.run(route)
+                latency = result['latency_ms']
+                errors = result['server_errors'] + result['client_errors'] + result['connection_errors']
+                line = (
+                    f"{route.name:<42} {latency['p50']:>8} {latency['p95']:>8} {latency['p99']:>8} "
+                    f"{result['throughput_rps']:>8} {result['db_queries']['mean']:>8} "
+                    f"{result['tmdb_calls']['mean']:>6} {errors:>5}"
+                )
+                self.stdout.write(self.style.ERROR(line) if errors else line)
+        return results
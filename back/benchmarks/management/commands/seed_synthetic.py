@@ -0,0 +1,75 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from benchmarks import dataset
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        '부하 테스트용 대량 합성 데이터 생성 (Zipf 분포 인기도, seed 가 같으면 같은 데이터). '
+        f'사용자 비밀번호는 모두 "{dataset.PASSWORD}"'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100_000, help='사용자 수 (기본 100,000)')
+        parser.add_argument('--movies', type=int, default=50_000, help='영화 수 (기본 50,000)')
+        parser.add_argument('--reviews', type=int, default=5_000_000, help='리뷰 수 (기본 5,000,000)')
+        parser.add_argument('--likes', type=int, default=5_000_000, help='좋아요 수, 중복 제거 전 (기본 5,000,000)')
+        parser.add_argument('--comments', type=int, default=2_000_000, help='댓글 수 (기본 2,000,000)')
+        parser.add_argument('--favorites', type=int, default=1_000_000, help='찜 수, 중복 제거 전 (기본 1,000,000)')
+        parser.add_argument('--seed', type=int, default=42, help='난수 seed (기본 42)')
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.0,
+            help='Zipf 지수, 클수록 인기 영화/리뷰/사용자에 더 몰림 (기본 1.0)'
+        )
+        parser.add_argument('--prefix', default='synthetic', help='사용자 이름 앞부분 (기본 synthetic)')
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=dataset.BATCH_SIZE,
+            help=f'트랜잭션 하나에 넣을 행 수 (기본 {dataset.BATCH_SIZE})'
+        )
+
+    def handle(self, *args, **options):
+        sizes = ('users', 'movies', 'reviews')
+        if any(options[name] < 1 for name in sizes) or options['batch_size'] < 1:
+            raise CommandError('--users / --movies / --reviews / --batch-size 는 1 이상이어야 합니다.')
+        if User.objects.filter(username__startswith=options['prefix']).exists():
+            raise CommandError(
+                f"'{options['prefix']}' 로 시작하는 사용자가 이미 있습니다. --prefix 를 바꾸거나 빈 DB 에서 실행하세요."
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"\n🌱 합성 데이터 생성 ({connection.vendor}, seed={options['seed']}, skew={options['skew']})"
+        ))
+        started = time.perf_counter()
+        counts = dataset.seed(
+            users=options['users'],
+            movies=options['movies'],
+            reviews=options['reviews'],
+            comments=options['comments'],
+            likes=options['likes'],
+            favorites=options['favorites'],
+            seed=options['seed'],
+            skew=options['skew'],
+            prefix=options['prefix'],
+            batch_size=options['batch_size'],
+            stdout=self.stdout,
+        )
+        elapsed = time.perf_counter() - started
+        total = sum(counts.values())
+
+        self.stdout.write("\n" + "=" * 50)
+        for name, count in counts.items():
+            self.stdout.write(f"  {name:<16} {count:>12,}")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ 총 {total:,}행 {elapsed:.1f}초 ({total / elapsed:,.0f}행/초)"
+        ))
+        self.stdout.write("=" * 50)
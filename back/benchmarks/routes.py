@@ -0,0 +1,226 @@
+"""
+측정 대상 /api 라우트 목록과 요청에 필요한 준비 데이터
+
+읽기 라우트를 먼저, 쓰기 라우트를 나중에, 계정 삭제를 마지막에 측정해서
+쓰기가 읽기 결과에 섞이지 않게 한다.
+삭제 / 비밀번호 변경처럼 같은 대상을 두 번 쓸 수 없는 라우트는 요청 번호(i)마다 미리 만든 대상을 쓴다.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from community.models import Comment, Review
+from .dataset import EMOTIONS, PASSWORD, PROFILE_COUNTRIES, PROFILE_GENRES, USERNAME_PREFIX
+from .load import Route
+from .tmdb_stub import GENRES
+
+User = get_user_model()
+
+# JWT 를 미리 발급해 둘 사용자 수 / 수정 라우트에서 쓸 본인 리뷰·댓글 수
+TOKEN_USERS = 200
+OWNED_OBJECTS = 50
+NEW_PASSWORD = 'benchmark-password-changed'
+# 비밀번호 해시(PBKDF2)를 계산하는 라우트는 요청 하나에 CPU 를 1초 가까이 써서 요청 수를 제한
+PASSWORD_HASH_REQUESTS = 40
+
+
+def _tokens(user):
+    refresh = RefreshToken.for_user(user)
+    return str(refresh.access_token), str(refresh)
+
+
+def build_context(movies, requests_per_route):
+    """
+    라우트가 쓸 토큰 / ID 준비 (dataset.seed 직후 실행)
+
+    movies: 시드한 영화 수 (이보다 큰 TMDB ID 는 DB 미스)
+    """
+    users = list(User.objects.filter(username__startswith=USERNAME_PREFIX).order_by('id')[:TOKEN_USERS])
+    tokens = [(user.id, *_tokens(user)) for user in users]
+    access_by_user = {user_id: access for user_id, access, _ in tokens}
+
+    owned_reviews = list(
+        Review.objects.filter(user_id__in=access_by_user).order_by('id').values_list('id', 'user_id')[:OWNED_OBJECTS]
+    )
+    owned_comments = list(
+        Comment.objects.filter(user_id__in=access_by_user).order_by('id').values_list('id', 'user_id')[:OWNED_OBJECTS]
+    )
+
+    # 요청마다 하나씩 소모하는 대상
+    password = make_password(PASSWORD)
+    disposable = User.objects.bulk_create([
+        User(username=f'{USERNAME_PREFIX}-disposable-{kind}-{i}', password=password)
+        for kind in ('password', 'delete')
+        for i in range(requests_per_route)
+    ])
+    disposable_tokens = {user.username: _tokens(user)[0] for user in disposable}
+    owner_id, owner_access, _ = tokens[0]
+    delete_reviews = [
+        Review(user_id=owner_id, movie_id=1, title=f'삭제용 {i}', content='삭제용 리뷰', rating=3)
+        for i in range(requests_per_route)
+    ]
+    # bulk_create 는 pre_save 시그널을 거치지 않으므로 2글자 검색 색인 컬럼을 직접 채움
+    for review in delete_reviews:
+        review.fill_search_bigrams()
+    delete_reviews = Review.objects.bulk_create(delete_reviews)
+    delete_comments = Comment.objects.bulk_create([
+        Comment(review_id=delete_reviews[0].id, user_id=owner_id, content=f'삭제용 {i}')
+        for i in range(requests_per_route)
+    ])
+
+    return {
+        'movies': movies,
+        'users': [(user.id, user.username) for user in users],
+        'tokens': tokens,
+        'review_ids': list(Review.objects.order_by('id').values_list('id', flat=True)[:1000]),
+        'owned_reviews': [(review_id, access_by_user[user_id]) for review_id, user_id in owned_reviews],
+        'owned_comments': [(comment_id, access_by_user[user_id]) for comment_id, user_id in owned_comments],
+        'password_tokens': [disposable_tokens[f'{USERNAME_PREFIX}-disposable-password-{i}'] for i in range(requests_per_route)],
+        'delete_tokens': [disposable_tokens[f'{USERNAME_PREFIX}-disposable-delete-{i}'] for i in range(requests_per_route)],
+        'delete_reviews': [review.id for review in delete_reviews],
+        'delete_comments': [comment.id for comment in delete_comments],
+        'owner_access': owner_access,
+    }
+
+
+def _access(ctx, rng):
+    return rng.choice(ctx['tokens'])[1]
+
+
+def _movie(ctx, rng):
+    return rng.randint(1, ctx['movies'])
+
+
+def _review(ctx, rng):
+    return rng.choice(ctx['review_ids'])
+
+
+def _get(path_fn, auth=False):
+    """GET 라우트용 build 함수"""
+    def build(ctx, rng, i):
+        return path_fn(ctx, rng, i), None, _access(ctx, rng) if auth else None
+    return build
+
+
+def _favorite_ids(ctx, rng):
+    return ','.join(str(_movie(ctx, rng)) for _ in range(20))
+
+
+def _batch_ids(ctx, rng, i):
+    # 대부분 DB 히트, 일부는 DB 에 없는 영화 (TMDB 로 보충)
+    ids = [_movie(ctx, rng) for _ in range(18)] + [ctx['movies'] + 1 + rng.randint(0, 1000) for _ in range(2)]
+    return ','.join(map(str, ids))
+
+
+def _review_patch(ctx, rng, i):
+    review_id, access = rng.choice(ctx['owned_reviews'])
+    return f'/api/community/reviews/{review_id}/update/', {'content': f'수정한 리뷰 {i}'}, access
+
+
+def _comment_patch(ctx, rng, i):
+    comment_id, access = rng.choice(ctx['owned_comments'])
+    return f'/api/community/comments/{comment_id}/update/', {'content': f'수정한 댓글 {i}'}, access
+
+
+def _profile_patch(ctx, rng, i):
+    body = {
+        'favorite_genres': rng.sample(PROFILE_GENRES, 2),
+        'preferred_countries': rng.sample(PROFILE_COUNTRIES, 1),
+    }
+    return '/api/accounts/profile/', body, _access(ctx, rng)
+
+
+def _login(ctx, rng, i):
+    _, username = rng.choice(ctx['users'])
+    return '/api/accounts/login/', {'username': username, 'password': PASSWORD}, None
+
+
+def _refresh(ctx, rng, i):
+    return '/api/accounts/token/refresh/', {'refresh': rng.choice(ctx['tokens'])[2]}, None
+
+
+def _signup(ctx, rng, i):
+    body = {'username': f'{USERNAME_PREFIX}-signup-{i}', 'password': PASSWORD, 'password2': PASSWORD}
+    return '/api/accounts/signup/', body, None
+
+
+def _change_password(ctx, rng, i):
+    body = {'old_password': PASSWORD, 'new_password': NEW_PASSWORD, 'new_password2': NEW_PASSWORD}
+    return '/api/accounts/change-password/', body, ctx['password_tokens'][i]
+
+
+ROUTES = [
+    # ========== 영화 (읽기) ==========
+    Route('movies/popular', 'GET', _get(lambda ctx, rng, i: f'/api/movies/popular/?page={rng.randint(1, 5)}')),
+    Route('movies/<id>', 'GET', _get(lambda ctx, rng, i: f'/api/movies/{_movie(ctx, rng)}/')),
+    Route('movies/recommend', 'GET', _get(lambda ctx, rng, i: f'/api/movies/recommend/?emotion={rng.choice(EMOTIONS)}')),
+    Route('movies/db', 'GET', _get(
+        lambda ctx, rng, i: f'/api/movies/db/?genre={rng.choice(GENRES)[0]}'
+                            f'&sort={rng.choice(["popularity", "rating", "latest"])}'
+    )),
+    Route('movies/db/popular', 'GET', _get(lambda ctx, rng, i: '/api/movies/db/popular/')),
+    Route('movies/db/batch', 'GET', _get(lambda ctx, rng, i: f'/api/movies/db/batch/?ids={_batch_ids(ctx, rng, i)}')),
+    Route('movies/db/<id>', 'GET', _get(lambda ctx, rng, i: f'/api/movies/db/{_movie(ctx, rng)}/')),
+    Route('movies/db/<id>/similar', 'GET', _get(lambda ctx, rng, i: f'/api/movies/db/{_movie(ctx, rng)}/similar/')),
+    Route('movies/for-you', 'GET', _get(lambda ctx, rng, i: '/api/movies/for-you/', auth=True)),
+    Route('movies/home', 'GET', _get(lambda ctx, rng, i: '/api/movies/home/', auth=True)),
+    Route('movies/search', 'GET', _get(lambda ctx, rng, i: f'/api/movies/search/?q=영화 {_movie(ctx, rng)}')),
+    Route('movies/tmdb/status', 'GET', _get(lambda ctx, rng, i: '/api/movies/tmdb/status/')),
+    Route('movies/emotion-sorted', 'GET', _get(
+        lambda ctx, rng, i: f'/api/movies/emotion-sorted/?emotion={rng.choice(EMOTIONS)}'
+    )),
+
+    # ========== 커뮤니티 (읽기) ==========
+    Route('community/reviews/<movie_id>', 'GET', _get(
+        lambda ctx, rng, i: f'/api/community/reviews/{_movie(ctx, rng)}/', auth=True
+    )),
+    Route('community/reviews/search', 'GET', _get(
+        lambda ctx, rng, i: f'/api/community/reviews/search/?q=좋았다&emotion={rng.choice(EMOTIONS)}'
+    )),
+    Route('community/reviews/<id>/comments', 'GET', _get(
+        lambda ctx, rng, i: f'/api/community/reviews/{_review(ctx, rng)}/comments/'
+    )),
+
+    # ========== 계정 (읽기) ==========
+    Route('accounts/me', 'GET', _get(lambda ctx, rng, i: '/api/accounts/me/', auth=True)),
+    Route('accounts/profile', 'GET', _get(lambda ctx, rng, i: '/api/accounts/profile/', auth=True)),
+    Route('accounts/my-reviews', 'GET', _get(lambda ctx, rng, i: '/api/accounts/my-reviews/', auth=True)),
+    Route('accounts/my-comments', 'GET', _get(lambda ctx, rng, i: '/api/accounts/my-comments/', auth=True)),
+    Route('accounts/favorite-movies', 'GET', _get(lambda ctx, rng, i: '/api/accounts/favorite-movies/', auth=True)),
+    Route('accounts/favorite-movies/check', 'GET', _get(
+        lambda ctx, rng, i: f'/api/accounts/favorite-movies/check/?ids={_favorite_ids(ctx, rng)}', auth=True
+    )),
+
+    # ========== 쓰기 ==========
+    Route('accounts/login', 'POST', _login, max_requests=PASSWORD_HASH_REQUESTS),
+    Route('accounts/token/refresh', 'POST', _refresh),
+    Route('accounts/logout', 'POST', lambda ctx, rng, i: ('/api/accounts/logout/', None, _access(ctx, rng))),
+    Route('accounts/signup', 'POST', _signup, warmup=False, max_requests=PASSWORD_HASH_REQUESTS),
+    Route('accounts/profile (PATCH)', 'PATCH', _profile_patch),
+    Route('accounts/favorite-movies/toggle', 'POST', lambda ctx, rng, i: (
+        '/api/accounts/favorite-movies/toggle/', {'movie_id': _movie(ctx, rng)}, _access(ctx, rng)
+    )),
+    Route('community/reviews/<movie_id>/create', 'POST', lambda ctx, rng, i: (
+        f'/api/community/reviews/{_movie(ctx, rng)}/create/',
+        {'title': f'새 리뷰 {i}', 'content': '벤치마크 리뷰', 'rating': 4, 'emotion_tags': [rng.choice(EMOTIONS)]},
+        _access(ctx, rng),
+    )),
+    Route('community/reviews/<id>/like', 'POST', lambda ctx, rng, i: (
+        f'/api/community/reviews/{_review(ctx, rng)}/like/', None, _access(ctx, rng)
+    )),
+    Route('community/reviews/<id>/update', 'PATCH', _review_patch),
+    Route('community/reviews/<id>/comments/create', 'POST', lambda ctx, rng, i: (
+        f'/api/community/reviews/{_review(ctx, rng)}/comments/create/', {'content': f'새 댓글 {i}'}, _access(ctx, rng)
+    )),
+    Route('community/comments/<id>/update', 'PATCH', _comment_patch),
+    Route('community/comments/<id>/delete', 'DELETE', lambda ctx, rng, i: (
+        f'/api/community/comments/{ctx["delete_comments"][i]}/delete/', None, ctx['owner_access']
+    ), warmup=False),
+    Route('community/reviews/<id>/delete', 'DELETE', lambda ctx, rng, i: (
+        f'/api/community/reviews/{ctx["delete_reviews"][i]}/delete/', None, ctx['owner_access']
+    ), warmup=False),
+    Route('accounts/change-password', 'POST', _change_password, warmup=False, max_requests=PASSWORD_HASH_REQUESTS),
+    Route('accounts/delete', 'POST', lambda ctx, rng, i: (
+        '/api/accounts/delete/', None, ctx['delete_tokens'][i]
+    ), warmup=False),
+]
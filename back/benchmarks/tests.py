@@ -0,0 +1,88 @@
+from collections import Counter
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase
+
+from community.models import Comment, Review
+from community.search import search_reviews
+from . import dataset
+
+User = get_user_model()
+
+
+class SeedSyntheticTest(TransactionTestCase):
+    """합성 데이터: 같은 seed 면 같은 데이터, 적재 뒤 인덱스/검색 트리거 복원, Zipf 쏠림"""
+
+    def seed(self, prefix, batch_size, **options):
+        sizes = dict(users=30, movies=40, reviews=300, comments=200, likes=500, favorites=100)
+        sizes.update(options)
+        call_command('seed_synthetic', prefix=prefix, batch_size=batch_size, stdout=StringIO(), **sizes)
+
+    def snapshot(self, prefix):
+        """사용자 / 리뷰 id 를 첫 id 기준 상대값으로 바꾼 데이터 (실행 시각에 따라 달라지는 값은 제외)"""
+        first_user = User.objects.filter(username__startswith=prefix).order_by('id').values_list('id', flat=True)[0]
+        reviews = list(
+            Review.objects.filter(user__username__startswith=prefix).order_by('id').values_list(
+                'id', 'user_id', 'movie_id', 'content', 'rating', 'emotion_tags', 'like_count',
+            )
+        )
+        first_review = reviews[0][0]
+        comments = Comment.objects.filter(user__username__startswith=prefix).order_by('id').values_list(
+            'review_id', 'user_id', 'content',
+        )
+        return (
+            [(user - first_user, *rest) for _, user, *rest in reviews],
+            [(review - first_review, user - first_user, content) for review, user, content in comments],
+        )
+
+    def test_same_seed_same_data(self):
+        self.seed('left', batch_size=1000)
+        # 청크 크기가 달라도 같은 데이터 (열마다 독립된 난수 스트림)
+        self.seed('right', batch_size=7)
+        self.assertEqual(self.snapshot('left'), self.snapshot('right'))
+
+        self.seed('other', batch_size=1000, seed=7)
+        self.assertNotEqual(self.snapshot('left'), self.snapshot('other'))
+
+    def test_restores_indexes_and_search_triggers(self):
+        self.seed('bench', batch_size=64)
+
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Review._meta.db_table)
+            comment_constraints = connection.introspection.get_constraints(cursor, Comment._meta.db_table)
+        self.assertTrue({index.name for index in Review._meta.indexes} <= set(constraints))
+        self.assertTrue({index.name for index in Comment._meta.indexes} <= set(comment_constraints))
+
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s",
+                               [Review._meta.db_table])
+                triggers = {row[0] for row in cursor.fetchall()}
+            self.assertTrue({'community_review_fts_ai', 'community_review_bigram_ai'} <= triggers)
+
+        # 적재한 리뷰가 3글자 / 2글자 검색 색인에 모두 들어감
+        for term in ('좋았다', '배우'):
+            self.assertEqual(search_reviews(q=term).count(), Review.objects.filter(content__contains=term).count())
+        # 적재 뒤 새로 쓴 리뷰도 트리거로 색인됨
+        review = Review.objects.create(user=User.objects.first(), movie_id=1, title='새 리뷰', content='전혀 새로운 어휘',
+                                       rating=4)
+        self.assertEqual(list(search_reviews(q='새로운').values_list('id', flat=True)), [review.id])
+
+    def test_zipf_skew_and_timestamps(self):
+        self.seed('bench', batch_size=64, reviews=2000)
+
+        per_movie = Counter(Review.objects.values_list('movie_id', flat=True))
+        # 1위 영화(tmdb_id 1)가 가장 많고, 균등 분포(2000 / 40 = 50)보다 훨씬 많음
+        self.assertEqual(per_movie.most_common(1)[0][0], 1)
+        self.assertGreater(per_movie[1], 4 * 2000 / 40)
+        self.assertGreater(per_movie[1], per_movie[10])
+
+        # 작성 시각은 id 순으로 서로 다르게 퍼져 있고, 댓글은 리뷰 작성 이후
+        created = list(Review.objects.order_by('id').values_list('created_at', flat=True))
+        self.assertEqual(created, sorted(set(created)))
+        self.assertGreater(created[-1] - created[0], dataset.TIME_SPAN / 2)
+        for comment in Comment.objects.select_related('review')[:50]:
+            self.assertGreaterEqual(comment.created_at, comment.review.created_at)
@@ -0,0 +1,131 @@
+"""
+로컬 TMDB 가짜 서버
+
+우리가 쓰는 엔드포인트(popular, 상세, discover, search, changes)만 흉내 내고,
+응답 내용은 영화 ID 로부터 결정적으로 만들어서 실행할 때마다 같다.
+latency 초만큼 응답을 늦춰서 TMDB 가 느릴 때의 동작도 측정할 수 있다.
+"""
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# 가짜 카탈로그 기본 크기 (popular / discover / search 결과가 여기서 나옴)
+CATALOG_SIZE = 10000
+PAGE_SIZE = 20
+GENRES = [
+    (28, '액션'), (35, '코미디'), (18, '드라마'), (53, '스릴러'), (27, '공포'),
+    (878, 'SF'), (14, '판타지'), (10749, '로맨스'), (16, '애니메이션'), (99, '다큐멘터리'),
+]
+LANGUAGES = ['ko', 'en', 'ja', 'zh', 'fr']
+
+_DETAIL_PATH = re.compile(r"^/3/movie/(\d+)/?$")
+
+
+def fake_movie(movie_id):
+    """영화 ID → TMDB 상세 응답 형태의 가짜 영화"""
+    rng = random.Random(movie_id)
+    return {
+        'id': movie_id,
+        'title': f'영화 {movie_id}',
+        'original_title': f'Movie {movie_id}',
+        'overview': f'영화 {movie_id} 의 줄거리',
+        'poster_path': f'/poster{movie_id}.jpg',
+        'backdrop_path': f'/backdrop{movie_id}.jpg',
+        'release_date': f'{rng.randint(1980, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+        'runtime': rng.randint(80, 180),
+        'vote_average': round(rng.uniform(3, 9), 1),
+        'vote_count': rng.randint(0, 20000),
+        'popularity': round(CATALOG_SIZE / movie_id, 3),
+        'genres': [{'id': genre_id, 'name': name} for genre_id, name in rng.sample(GENRES, rng.randint(1, 3))],
+        'original_language': rng.choice(LANGUAGES),
+    }
+
+
+def _page(ids, page):
+    start = (page - 1) * PAGE_SIZE
+    return {
+        'page': page,
+        'results': [fake_movie(movie_id) for movie_id in ids[start:start + PAGE_SIZE]],
+        'total_pages': max(1, (len(ids) + PAGE_SIZE - 1) // PAGE_SIZE),
+        'total_results': len(ids),
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "TMDBStub/1.0"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        page = int(params.get('page', 1))
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.server.count()
+
+        detail = _DETAIL_PATH.match(url.path)
+        if detail:
+            movie_id = int(detail.group(1))
+            if not 1 <= movie_id <= self.server.catalog_size:
+                return self._send(404, {'status_message': 'not found'})
+            return self._send(200, fake_movie(movie_id))
+
+        if url.path in ('/3/movie/popular', '/3/discover/movie'):
+            return self._send(200, _page(range(1, self.server.catalog_size + 1), page))
+        if url.path == '/3/search/movie':
+            # 검색어에 포함된 숫자로 끝나는 ID (없으면 빈 결과)
+            digits = ''.join(ch for ch in params.get('query', '') if ch.isdigit())
+            ids = [i for i in range(1, self.server.catalog_size + 1) if digits and str(i).endswith(digits)]
+            return self._send(200, _page(ids, page))
+        if url.path == '/3/movie/changes':
+            return self._send(200, {'page': page, 'results': [{'id': i} for i in range(1, 51)], 'total_pages': 1})
+        return self._send(404, {'status_message': 'unknown endpoint'})
+
+    def _send(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TMDBStubServer(ThreadingHTTPServer):
+    """
+    with TMDBStubServer(latency=0.05) as stub:
+        settings.TMDB_BASE_URL = stub.base_url
+    """
+    daemon_threads = True
+
+    def __init__(self, latency=0.0, catalog_size=CATALOG_SIZE, host='127.0.0.1', port=0):
+        super().__init__((host, port), _Handler)
+        self.latency = latency
+        self.catalog_size = catalog_size
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/3"
+
+    def count(self):
+        with self._lock:
+            self.requests += 1
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from community.models import Review, ReviewEmotion, MovieEmotionStats
+
+
+class Command(BaseCommand):
+    help = 'ReviewEmotion / MovieEmotionStats 를 리뷰 데이터 기준으로 처음부터 다시 계산'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild-index',
+            action='store_true',
+            help='Review.emotion_tags 로부터 ReviewEmotion 도 다시 생성 (fixture 로딩 후 사용)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='bulk_create 배치 크기 (기본 1000)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        with transaction.atomic():
+            if options['rebuild_index']:
+                total = self.rebuild_review_emotions(batch_size)
+                self.stdout.write(self.style.SUCCESS(f"✅ ReviewEmotion 재생성: {total}행"))
+
+            total = self.rebuild_movie_emotion_stats(batch_size)
+            self.stdout.write(self.style.SUCCESS(f"✅ MovieEmotionStats 재계산: {total}편"))
+
+    def rebuild_review_emotions(self, batch_size):
+        valid_emotions = {code for code, _ in Review.EMOTION_CHOICES}
+        ReviewEmotion.objects.all().delete()
+
+        total = 0
+        batch = []
+        reviews = Review.objects.only('id', 'movie_id', 'emotion_tags').iterator(chunk_size=batch_size)
+        for review in reviews:
+            for emotion in set(review.emotion_tags or []) & valid_emotions:
+                batch.append(ReviewEmotion(review_id=review.id, movie_id=review.movie_id, emotion=emotion))
+            if len(batch) >= batch_size:
+                ReviewEmotion.objects.bulk_create(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            ReviewEmotion.objects.bulk_create(batch)
+            total += len(batch)
+        return total
+
+    def rebuild_movie_emotion_stats(self, batch_size):
+        stats = {}
+        rows = ReviewEmotion.objects.values('movie_id', 'emotion').annotate(count=Count('id'))
+        for row in rows:
+            obj = stats.setdefault(row['movie_id'], MovieEmotionStats(movie_id=row['movie_id']))
+            setattr(obj, MovieEmotionStats.count_field(row['emotion']), row['count'])
+
+        MovieEmotionStats.objects.all().delete()
+        MovieEmotionStats.objects.bulk_create(stats.values(), batch_size=batch_size)
+        return len(stats)
+
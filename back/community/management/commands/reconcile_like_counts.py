@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from community.models import Review
+
+
+class Command(BaseCommand):
+    help = 'Review.like_count 를 좋아요 중간 테이블 행 수로 다시 계산 (fixture 로딩은 like_count 를 맞춰주지 않음)'
+
+    def handle(self, *args, **options):
+        Like = Review.likes.through
+        counts = (
+            Like.objects
+            .filter(review_id=OuterRef('pk'))
+            .order_by()
+            .values('review_id')
+            .annotate(count=Count('pk'))
+            .values('count')
+        )
+        total = Review.objects.update(like_count=Coalesce(Subquery(counts), 0))
+        self.stdout.write(self.style.SUCCESS(f"✅ like_count 재계산: 리뷰 {total}개"))
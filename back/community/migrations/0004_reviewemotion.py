@@ -0,0 +1,27 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0003_alter_comment_id_alter_emotiondiary_id_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewEmotion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('movie_id', models.IntegerField()),
+                ('emotion', models.CharField(choices=[('joy', '기쁨'), ('sadness', '슬픔'), ('anger', '분노'), ('fear', '두려움'), ('excitement', '흥분'), ('calm', '평온'), ('depression', '우울')], max_length=20)),
+                ('review', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='emotions', to='community.review')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['emotion', 'movie_id'], name='reviewemotion_emotion_movie')],
+                'constraints': [models.UniqueConstraint(fields=('review', 'emotion'), name='unique_review_emotion')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:06
+
+from django.db import migrations
+
+VALID_EMOTIONS = {'joy', 'sadness', 'anger', 'fear', 'excitement', 'calm', 'depression'}
+BATCH_SIZE = 1000
+
+
+def backfill_review_emotions(apps, schema_editor):
+    Review = apps.get_model('community', 'Review')
+    ReviewEmotion = apps.get_model('community', 'ReviewEmotion')
+
+    batch = []
+    reviews = Review.objects.only('id', 'movie_id', 'emotion_tags').iterator(chunk_size=BATCH_SIZE)
+    for review in reviews:
+        for emotion in set(review.emotion_tags or []) & VALID_EMOTIONS:
+            batch.append(ReviewEmotion(review_id=review.id, movie_id=review.movie_id, emotion=emotion))
+        if len(batch) >= BATCH_SIZE:
+            ReviewEmotion.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        ReviewEmotion.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def clear_review_emotions(apps, schema_editor):
+    apps.get_model('community', 'ReviewEmotion').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0004_reviewemotion'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_review_emotions, clear_review_emotions),
+    ]
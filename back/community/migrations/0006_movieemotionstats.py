@@ -0,0 +1,27 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0005_backfill_reviewemotion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovieEmotionStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('movie_id', models.IntegerField(unique=True)),
+                ('joy_count', models.IntegerField(db_index=True, default=0)),
+                ('sadness_count', models.IntegerField(db_index=True, default=0)),
+                ('anger_count', models.IntegerField(db_index=True, default=0)),
+                ('fear_count', models.IntegerField(db_index=True, default=0)),
+                ('excitement_count', models.IntegerField(db_index=True, default=0)),
+                ('calm_count', models.IntegerField(db_index=True, default=0)),
+                ('depression_count', models.IntegerField(db_index=True, default=0)),
+            ],
+        ),
+    ]
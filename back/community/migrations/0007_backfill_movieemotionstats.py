@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:06
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def backfill_movie_emotion_stats(apps, schema_editor):
+    ReviewEmotion = apps.get_model('community', 'ReviewEmotion')
+    MovieEmotionStats = apps.get_model('community', 'MovieEmotionStats')
+
+    stats = {}
+    rows = ReviewEmotion.objects.values('movie_id', 'emotion').annotate(count=Count('id'))
+    for row in rows:
+        obj = stats.setdefault(row['movie_id'], MovieEmotionStats(movie_id=row['movie_id']))
+        setattr(obj, f"{row['emotion']}_count", row['count'])
+
+    MovieEmotionStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+def clear_movie_emotion_stats(apps, schema_editor):
+    apps.get_model('community', 'MovieEmotionStats').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0006_movieemotionstats'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_movie_emotion_stats, clear_movie_emotion_stats),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:10
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_like_count(apps, schema_editor):
+    Review = apps.get_model('community', 'Review')
+    Like = Review.likes.through
+    counts = (
+        Like.objects
+        .filter(review_id=OuterRef('pk'))
+        .order_by()
+        .values('review_id')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    Review.objects.update(like_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0008_review_comment_cursor_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='like_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_like_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+from final_project.fulltext import sqlite_fts5_sql, postgres_trigram_sql
+
+
+def _statements(vendor):
+    if vendor == 'sqlite':
+        return sqlite_fts5_sql('community_review', 'community_review_fts', ['title', 'content'])
+    if vendor == 'postgresql':
+        return postgres_trigram_sql(
+            'community_review', 'review_text_trgm', "(title || ' ' || content)"
+        )
+    return [], []
+
+
+def create_search_index(apps, schema_editor):
+    forward, _ = _statements(schema_editor.connection.vendor)
+    for sql in forward:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    _, backward = _statements(schema_editor.connection.vendor)
+    for sql in backward:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0009_review_like_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['-created_at', '-id'], name='review_created'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,61 @@
+from django.db import migrations, models
+
+from final_project.fulltext import (
+    backfill_search_bigrams, bigram_column_sql, postgres_bigram_sql, sqlite_bigram_sql,
+)
+
+
+def _statements(vendor):
+    # 2글자 검색어용 bigram 인덱스 (3글자 이상은 0010 의 trigram 인덱스)
+    if vendor == 'sqlite':
+        # 색인 대상은 저장할 때 애플리케이션이 채우는 search_bigrams 컬럼 (트리거는 SQL 만 사용)
+        return sqlite_bigram_sql('community_review', 'community_review_bigram')
+    if vendor == 'postgresql':
+        return postgres_bigram_sql(
+            'community_review', 'review_text_bigram', "(title || ' ' || content)"
+        )
+    return [], []
+
+
+def create_search_index(apps, schema_editor):
+    forward, _ = _statements(schema_editor.connection.vendor)
+    for sql in forward:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    _, backward = _statements(schema_editor.connection.vendor)
+    for sql in backward:
+        schema_editor.execute(sql)
+
+
+def fill_search_bigrams(apps, schema_editor):
+    backfill_search_bigrams(apps.get_model('community', 'Review'), ['title', 'content'])
+
+
+ADD_COLUMN, DROP_COLUMN = bigram_column_sql('community_review')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0010_review_search_index'),
+    ]
+
+    operations = [
+        # AddField 는 SQLite 에서 테이블을 다시 만들어 0010 의 trigram 트리거를 지우므로 컬럼은 직접 추가
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(
+                    model_name='review',
+                    name='search_bigrams',
+                    field=models.TextField(blank=True, default='', editable=False),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(ADD_COLUMN, DROP_COLUMN),
+            ],
+        ),
+        migrations.RunPython(fill_search_bigrams, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
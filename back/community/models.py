@@ -1,8 +1,47 @@
 from django.db import models
+from django.db.models import F, Count, Exists, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.conf import settings
 
+from final_project.fulltext import SearchBigramsModel, SearchBigramsQuerySet
+
+
+def _count_subquery(queryset, field):
+    """OuterRef('pk') 기준 관련 행 수를 세는 서브쿼리 (JOIN 으로 행이 불어나지 않음)"""
+    counts = (
+        queryset
+        .filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+class ReviewQuerySet(SearchBigramsQuerySet):
+    def with_stats(self, user=None):
+        """
+        목록 조회용: 작성자, 댓글 수, 현재 사용자 좋아요 여부를
+        한 번의 쿼리로 가져오도록 select_related / annotate
+        """
+        Like = Review.likes.through
+        if user is not None and user.is_authenticated:
+            is_liked = Exists(Like.objects.filter(review_id=OuterRef('pk'), user_id=user.id))
+        else:
+            is_liked = Value(False)
+
+        return self.select_related('user').annotate(
+            comment_count=_count_subquery(Comment.objects.all(), 'review'),
+            is_liked=is_liked,
+        )
+
+
 # Create your models here.
-class Review(models.Model):
+class Review(SearchBigramsModel):
+    # 2글자 검색 색인 대상 (search_bigrams, migrations/0011)
+    SEARCH_FIELDS = ('title', 'content')
+
     # 감정 선택지 정의
     EMOTION_CHOICES = [
         ('joy', '기쁨'),
@@ -30,13 +69,118 @@ class Review(models.Model):
         related_name='liked_reviews',
         blank=True
     )
+    # 좋아요 수 (toggle_like 에서 F() 로 증감, 매번 COUNT 하지 않음)
+    like_count = models.IntegerField(default=0)
     
     # 👇 감정 태그 필드 추가!
     emotion_tags = models.JSONField(default=list, blank=True)  # ['joy', 'excitement']
 
+    objects = ReviewQuerySet.as_manager()
+
+    class Meta:
+        # 커서 페이지네이션 정렬 키 (final_project/pagination.py)
+        indexes = [
+            models.Index(fields=['movie_id', '-created_at', '-id'], name='review_movie_created'),
+            models.Index(fields=['user', '-created_at', '-id'], name='review_user_created'),
+            # 영화/작성자 조건 없는 리뷰 검색 (community/search.py)
+            models.Index(fields=['-created_at', '-id'], name='review_created'),
+        ]
+
     def __str__(self):
         return f"{self.title} by {self.user.username}"
 
+    def sync_emotions(self):
+        """
+        emotion_tags / movie_id 를 ReviewEmotion 테이블에 반영
+        
+        다른 영화로 옮긴 리뷰는 남는 감정 행의 movie_id 도 옮기고, 카운터도 예전 영화에서 새 영화로 옮긴다.
+        반환값: {movie_id: (추가된 감정 set, 삭제된 감정 set)} (MovieEmotionStats.apply_changes 에 넘길 값)
+        """
+        valid_emotions = {code for code, _ in self.EMOTION_CHOICES}
+        tags = {tag for tag in self.emotion_tags if tag in valid_emotions}
+        # {감정: 그 행의 movie_id}
+        current = dict(self.emotions.values_list('emotion', 'movie_id'))
+
+        added = tags - current.keys()
+        removed = current.keys() - tags
+        moved = {emotion for emotion in tags & current.keys() if current[emotion] != self.movie_id}
+
+        changes = {}
+        for emotion in removed | moved:
+            changes.setdefault(current[emotion], (set(), set()))[1].add(emotion)
+        if added | moved:
+            changes.setdefault(self.movie_id, (set(), set()))[0].update(added | moved)
+
+        if removed:
+            self.emotions.filter(emotion__in=removed).delete()
+        if moved:
+            self.emotions.filter(emotion__in=moved).update(movie_id=self.movie_id)
+        if added:
+            ReviewEmotion.objects.bulk_create([
+                ReviewEmotion(review=self, movie_id=self.movie_id, emotion=emotion)
+                for emotion in added
+            ])
+        return changes
+
+
+class ReviewEmotion(models.Model):
+    """
+    Review.emotion_tags 정규화 테이블 (리뷰 1개 × 감정 1개 = 1행)
+    감정별 영화 집계를 SQLite/PostgreSQL 모두에서 GROUP BY 로 처리하기 위해 사용
+    """
+    review = models.ForeignKey(
+        Review,
+        on_delete=models.CASCADE,
+        related_name='emotions'
+    )
+    movie_id = models.IntegerField()
+    emotion = models.CharField(max_length=20, choices=Review.EMOTION_CHOICES)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['review', 'emotion'], name='unique_review_emotion'),
+        ]
+        indexes = [
+            models.Index(fields=['emotion', 'movie_id'], name='reviewemotion_emotion_movie'),
+        ]
+
+    def __str__(self):
+        return f"{self.emotion} - review {self.review_id}"
+
+
+class MovieEmotionStats(models.Model):
+    """
+    영화별 감정 리뷰 수 (리뷰 작성/수정/삭제 시 F() 로 증감)
+    감정별 상위 영화 조회를 인덱스 ORDER BY ... LIMIT 으로 처리하기 위해 사용
+    """
+    movie_id = models.IntegerField(unique=True)
+
+    joy_count = models.IntegerField(default=0, db_index=True)
+    sadness_count = models.IntegerField(default=0, db_index=True)
+    anger_count = models.IntegerField(default=0, db_index=True)
+    fear_count = models.IntegerField(default=0, db_index=True)
+    excitement_count = models.IntegerField(default=0, db_index=True)
+    calm_count = models.IntegerField(default=0, db_index=True)
+    depression_count = models.IntegerField(default=0, db_index=True)
+
+    def __str__(self):
+        return f"movie {self.movie_id} emotion stats"
+
+    @staticmethod
+    def count_field(emotion):
+        return f"{emotion}_count"
+
+    @classmethod
+    def apply_changes(cls, movie_id, added=(), removed=()):
+        """추가/삭제된 감정만큼 카운터 증감 (호출하는 쪽의 트랜잭션 안에서 실행)"""
+        deltas = {cls.count_field(emotion): F(cls.count_field(emotion)) + 1 for emotion in added}
+        deltas.update({cls.count_field(emotion): F(cls.count_field(emotion)) - 1 for emotion in removed})
+        if not deltas:
+            return
+
+        cls.objects.get_or_create(movie_id=movie_id)
+        cls.objects.filter(movie_id=movie_id).update(**deltas)
+
 class Comment(models.Model):
     review = models.ForeignKey(
         Review,
@@ -50,6 +194,12 @@ class Comment(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['review', 'created_at', 'id'], name='comment_review_created'),
+            models.Index(fields=['user', '-created_at', '-id'], name='comment_user_created'),
+        ]
+
     def __str__(self):
         return f"Comment by {self.user.username} on {self.review.title}"
 
@@ -0,0 +1,120 @@
+"""
+리뷰 검색
+
+제목/본문 전문 검색 인덱스(migrations/0010 trigram, 0011 bigram)로 후보 리뷰 id 를 좁힌 뒤
+감정/평점/영화/작성자 조건과 커서 페이지네이션(최신순)을 적용한다.
+"""
+from contextlib import contextmanager
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from final_project.fulltext import (
+    BIGRAM_COLUMN, BIGRAM_FUNCTION, split_terms, fts5_match_expression, like_pattern, postgres_bigram_sql,
+    postgres_trigram_sql, sqlite_fts5_drop_insert_trigger_sql, sqlite_fts5_insert_trigger_sql, sqlite_fts5_rebuild_sql,
+)
+from .models import Review, ReviewEmotion
+
+FTS_TABLE = "community_review_fts"
+BIGRAM_TABLE = "community_review_bigram"
+FTS_COLUMNS = ["title", "content"]
+# PostgreSQL 인덱스 이름 / 식 (migrations/0010, 0011 과 같아야 함)
+PG_SEARCH_INDEX = "review_text_trgm"
+PG_BIGRAM_INDEX = "review_text_bigram"
+PG_SEARCH_EXPRESSION = "(title || ' ' || content)"
+
+
+@contextmanager
+def deferred_search_index():
+    """
+    대량 INSERT 동안 검색 인덱스 갱신을 멈추고, 끝난 뒤 한 번에 다시 색인
+
+    SQLite 는 INSERT 트리거를 빼고 끝난 뒤 전체 재색인, PostgreSQL 은 인덱스를 지웠다가 다시 생성
+    (bigram 색인은 search_bigrams 컬럼을 읽으므로 적재하는 쪽에서 컬럼 값을 채워 넣어야 함)
+    """
+    table = Review._meta.db_table
+    if connection.vendor == "sqlite":
+        before = [sqlite_fts5_drop_insert_trigger_sql(FTS_TABLE), sqlite_fts5_drop_insert_trigger_sql(BIGRAM_TABLE)]
+        after = [
+            sqlite_fts5_insert_trigger_sql(table, FTS_TABLE, FTS_COLUMNS),
+            sqlite_fts5_rebuild_sql(FTS_TABLE),
+            sqlite_fts5_insert_trigger_sql(table, BIGRAM_TABLE, [BIGRAM_COLUMN]),
+            sqlite_fts5_rebuild_sql(BIGRAM_TABLE),
+        ]
+    elif connection.vendor == "postgresql":
+        create, drop = postgres_trigram_sql(table, PG_SEARCH_INDEX, PG_SEARCH_EXPRESSION)
+        create_bigram, drop_bigram = postgres_bigram_sql(table, PG_BIGRAM_INDEX, PG_SEARCH_EXPRESSION)
+        before, after = drop + drop_bigram, create + create_bigram
+    else:
+        before, after = [], []
+
+    with connection.cursor() as cursor:
+        for sql in before:
+            cursor.execute(sql)
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            for sql in after:
+                cursor.execute(sql)
+
+
+def text_condition(query):
+    """검색어의 모든 단어를 제목 또는 본문에 포함하는 리뷰 조건"""
+    trigram_terms, bigram_terms, like_terms = split_terms(query)
+    condition = Q()
+
+    if connection.vendor == "sqlite":
+        if trigram_terms:
+            condition &= Q(id__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                [fts5_match_expression(trigram_terms)],
+            ))
+        if bigram_terms:
+            condition &= Q(id__in=RawSQL(
+                f"SELECT rowid FROM {BIGRAM_TABLE} WHERE {BIGRAM_TABLE} MATCH %s",
+                [fts5_match_expression(bigram_terms)],
+            ))
+    elif connection.vendor == "postgresql":
+        # pg_trgm GIN 인덱스는 ILIKE '%단어%' 도 인덱스로 처리 (3글자 이상)
+        for term in trigram_terms:
+            condition &= Q(id__in=RawSQL(
+                f"SELECT id FROM community_review WHERE {PG_SEARCH_EXPRESSION} ILIKE %s",
+                [like_pattern(term)],
+            ))
+        # 2글자는 bigram 배열 GIN 인덱스 (모든 조각을 포함 = @>)
+        if bigram_terms:
+            condition &= Q(id__in=RawSQL(
+                f"SELECT id FROM community_review WHERE {BIGRAM_FUNCTION}({PG_SEARCH_EXPRESSION}) @> %s::text[]",
+                [[term.lower() for term in bigram_terms]],
+            ))
+    else:
+        like_terms = trigram_terms + bigram_terms + like_terms
+
+    # 1글자 단어는 인덱스로 찾을 수 없으므로 부분 일치 조건으로 추가
+    for term in like_terms:
+        condition &= Q(title__icontains=term) | Q(content__icontains=term)
+    return condition
+
+
+def search_reviews(q=None, emotion=None, min_rating=None, max_rating=None, movie_id=None, author=None):
+    """조건에 맞는 리뷰 QuerySet (정렬/페이지네이션은 호출하는 쪽에서)"""
+    reviews = Review.objects.all()
+    if q:
+        reviews = reviews.filter(text_condition(q))
+    if emotion:
+        # (emotion, movie_id) 인덱스를 타는 감정 태그 색인 테이블 사용
+        emotion_reviews = ReviewEmotion.objects.filter(emotion=emotion)
+        if movie_id is not None:
+            emotion_reviews = emotion_reviews.filter(movie_id=movie_id)
+        reviews = reviews.filter(id__in=emotion_reviews.values('review_id'))
+    if min_rating is not None:
+        reviews = reviews.filter(rating__gte=min_rating)
+    if max_rating is not None:
+        reviews = reviews.filter(rating__lte=max_rating)
+    if movie_id is not None:
+        reviews = reviews.filter(movie_id=movie_id)
+    if author:
+        reviews = reviews.filter(user__username=author)
+    return reviews
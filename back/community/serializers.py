@@ -3,9 +3,9 @@ from .models import Review, Comment
 
 class ReviewSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
-    like_count = serializers.IntegerField(source='likes.count', read_only=True)
+    like_count = serializers.IntegerField(read_only=True)
     is_liked = serializers.SerializerMethodField()
-    comment_count = serializers.IntegerField(source='comments.count', read_only=True)
+    comment_count = serializers.SerializerMethodField()
     emotion_tags = serializers.ListField(
         child=serializers.CharField(),
         required=False,
@@ -31,7 +31,16 @@ class ReviewSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'movie_id', 'username', 'like_count', 'is_liked', 'comment_count', 'emotion_display', 'created_at']
     
+    # 목록 조회는 Review.objects.with_stats() 의 annotate 값을 사용하고,
+    # 작성/수정 직후처럼 annotate 가 없는 객체만 개별 쿼리로 계산
+    def get_comment_count(self, obj):
+        if hasattr(obj, 'comment_count'):
+            return obj.comment_count
+        return obj.comments.count()
+
     def get_is_liked(self, obj):
+        if hasattr(obj, 'is_liked'):
+            return obj.is_liked
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.likes.filter(id=request.user.id).exists()
@@ -63,4 +72,18 @@ class CommentSerializer(serializers.ModelSerializer):
             'content',
             'created_at',
         ]
-        read_only_fields = ['id', 'review', 'username', 'created_at']
\ No newline at end of file
+        read_only_fields = ['id', 'review', 'username', 'created_at']
+
+class ReviewSearchParamsSerializer(serializers.Serializer):
+    """리뷰 검색 쿼리 파라미터 검증"""
+    q = serializers.CharField(required=False, allow_blank=True, max_length=100)
+    emotion = serializers.ChoiceField(choices=Review.EMOTION_CHOICES, required=False)
+    min_rating = serializers.FloatField(required=False, min_value=0, max_value=5)
+    max_rating = serializers.FloatField(required=False, min_value=0, max_value=5)
+    movie_id = serializers.IntegerField(required=False)
+    author = serializers.CharField(required=False, max_length=150)
+
+    def validate(self, attrs):
+        if not any(attrs.get(field) not in (None, '') for field in self.fields):
+            raise serializers.ValidationError('검색어 또는 필터를 하나 이상 입력해주세요.')
+        return attrs
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.db.models import F
+from django.db.models.signals import post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from final_project.fulltext import fill_search_bigrams
+
+from .models import Review, MovieEmotionStats
+
+
+# 2글자 검색 색인 컬럼 채우기 (fixture 의 raw 저장 포함)
+pre_save.connect(fill_search_bigrams, sender=Review, dispatch_uid='review_search_bigrams')
+
+
+# 리뷰 작성/수정 시 감정 태그 인덱스(ReviewEmotion)와 영화별 감정 카운터 동기화
+@receiver(post_save, sender=Review)
+def sync_review_emotions(sender, instance, raw=False, **kwargs):
+    # fixture 로딩(raw) 중에는 건너뜀 → reconcile_emotion_stats 로 재계산
+    if raw:
+        return
+    for movie_id, (added, removed) in instance.sync_emotions().items():
+        MovieEmotionStats.apply_changes(movie_id, added, removed)
+
+
+# 리뷰 삭제 시 (회원 탈퇴로 인한 CASCADE 삭제 포함) 카운터 감소
+# ReviewEmotion 행은 FK CASCADE 로 함께 삭제됨
+@receiver(pre_delete, sender=Review)
+def decrease_emotion_stats(sender, instance, **kwargs):
+    removed = list(instance.emotions.values_list('emotion', flat=True))
+    MovieEmotionStats.apply_changes(instance.movie_id, removed=removed)
+
+
+# 회원 탈퇴 시 그 사용자가 누른 좋아요만큼 like_count 감소
+# (좋아요 중간 테이블 행은 CASCADE 로 함께 삭제됨)
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def decrease_like_counts(sender, instance, **kwargs):
+    Review.objects.filter(likes=instance).update(like_count=F('like_count') - 1)
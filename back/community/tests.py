@@ -1,3 +1,537 @@
-from django.test import TestCase
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from io import StringIO
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import serializers
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+
+from .models import Review, ReviewEmotion, MovieEmotionStats, Comment
+
+User = get_user_model()
+
+
+def load_fixture(objects):
+    """loaddata 와 같은 방식(raw=True)으로 fixture 객체 저장"""
+    for obj in serializers.deserialize('json', json.dumps(objects)):
+        obj.save()
+
+
+class ReviewEmotionIndexTest(APITestCase):
+    """Review.emotion_tags → ReviewEmotion 색인 동기화"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='writer', password='password123')
+
+    def emotions(self, review):
+        return set(ReviewEmotion.objects.filter(review=review).values_list('movie_id', 'emotion'))
+
+    def test_follows_create_edit_and_delete(self):
+        review = Review.objects.create(
+            user=self.user, movie_id=7, title='리뷰', content='내용', rating=4.0,
+            emotion_tags=['joy', 'sadness', 'joy', 'unknown'],
+        )
+        self.assertEqual(self.emotions(review), {(7, 'joy'), (7, 'sadness')})
+
+        review.emotion_tags = ['sadness', 'calm']
+        review.save()
+        self.assertEqual(self.emotions(review), {(7, 'sadness'), (7, 'calm')})
+
+        # 태그와 무관한 수정은 행을 다시 만들지 않음
+        ids = set(ReviewEmotion.objects.values_list('id', flat=True))
+        review.title = '제목 수정'
+        review.save()
+        self.assertEqual(set(ReviewEmotion.objects.values_list('id', flat=True)), ids)
+
+        review.delete()
+        self.assertFalse(ReviewEmotion.objects.exists())
+
+    def test_api_edit_updates_index(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post('/api/community/reviews/7/create/', {
+            'title': '리뷰', 'content': '내용', 'rating': 4.0, 'emotion_tags': ['fear'],
+        }, format='json')
+        review = Review.objects.get(pk=response.data['id'])
+        self.assertEqual(self.emotions(review), {(7, 'fear')})
+
+        self.client.patch(f'/api/community/reviews/{review.id}/update/', {'emotion_tags': ['joy']}, format='json')
+        self.assertEqual(self.emotions(review), {(7, 'joy')})
+
+    def test_raw_fixture_load_is_skipped(self):
+        load_fixture([{
+            'model': 'community.review', 'pk': 50,
+            'fields': {
+                'user': self.user.pk, 'movie_id': 7, 'title': '리뷰', 'content': '내용', 'rating': 3.0,
+                'created_at': '2025-01-01T00:00:00Z', 'emotion_tags': ['joy'], 'likes': [],
+            },
+        }])
+        self.assertTrue(Review.objects.filter(pk=50).exists())
+        self.assertFalse(ReviewEmotion.objects.exists())
+
+
+class MovieEmotionStatsTest(APITestCase):
+    """영화별 감정 카운터 증감 + reconcile_emotion_stats 재계산"""
+
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', password='password123')
+        self.bob = User.objects.create_user(username='bob', password='password123')
+
+    def counts(self, movie_id):
+        stats = MovieEmotionStats.objects.filter(movie_id=movie_id).values(
+            'joy_count', 'sadness_count', 'calm_count',
+        ).first()
+        return stats and tuple(stats.values())
+
+    def review(self, user, movie_id, tags):
+        return Review.objects.create(
+            user=user, movie_id=movie_id, title='리뷰', content='내용', rating=3.0, emotion_tags=tags,
+        )
+
+    def test_counters_follow_create_update_and_delete(self):
+        first = self.review(self.alice, 1, ['joy', 'sadness'])
+        self.review(self.bob, 1, ['joy'])
+        self.assertEqual(self.counts(1), (2, 1, 0))
+
+        first.emotion_tags = ['calm', 'joy']
+        first.save()
+        self.assertEqual(self.counts(1), (2, 0, 1))
+
+        first.delete()
+        self.assertEqual(self.counts(1), (1, 0, 0))
+
+    def test_moving_review_to_other_movie_moves_counters(self):
+        review = self.review(self.alice, 1, ['joy', 'sadness'])
+        self.review(self.bob, 1, ['joy'])
+
+        review.movie_id = 2
+        review.emotion_tags = ['joy', 'calm']
+        review.save()
+        self.assertEqual(self.counts(1), (1, 0, 0))
+        self.assertEqual(self.counts(2), (1, 0, 1))
+        self.assertEqual(set(review.emotions.values_list('movie_id', flat=True)), {2})
+
+        review.delete()
+        self.assertEqual(self.counts(2), (0, 0, 0))
+
+    def test_user_delete_cascades_to_counters(self):
+        self.review(self.alice, 1, ['joy'])
+        self.review(self.alice, 2, ['sadness'])
+        self.review(self.bob, 1, ['joy', 'calm'])
+
+        self.alice.delete()
+        self.assertEqual(self.counts(1), (1, 0, 1))
+        self.assertEqual(self.counts(2), (0, 0, 0))
+
+    def test_reconcile_rebuilds_counters(self):
+        self.review(self.alice, 1, ['joy'])
+        self.review(self.bob, 2, ['calm'])
+        # 카운터가 어긋난 상태 + fixture 로 들어온(색인 안 된) 리뷰
+        MovieEmotionStats.objects.filter(movie_id=1).update(joy_count=99, sadness_count=3)
+        MovieEmotionStats.objects.create(movie_id=3, joy_count=5)
+        load_fixture([{
+            'model': 'community.review', 'pk': 50,
+            'fields': {
+                'user': self.bob.pk, 'movie_id': 2, 'title': '리뷰', 'content': '내용', 'rating': 3.0,
+                'created_at': '2025-01-01T00:00:00Z', 'emotion_tags': ['calm', 'joy'], 'likes': [],
+            },
+        }])
+
+        call_command('reconcile_emotion_stats', stdout=StringIO())
+        self.assertEqual(self.counts(1), (1, 0, 0))
+        self.assertEqual(self.counts(2), (0, 0, 1))
+        self.assertIsNone(self.counts(3))
+
+        call_command('reconcile_emotion_stats', rebuild_index=True, batch_size=1, stdout=StringIO())
+        self.assertEqual(self.counts(2), (1, 0, 2))
+        self.assertEqual(ReviewEmotion.objects.count(), 4)
+
+
+class ReviewListQueryCountTest(APITestCase):
+    """리뷰 목록 조회 쿼리 수가 리뷰 개수와 무관하게 일정한지 확인"""
+
+    movie_id = 550
+
+    def setUp(self):
+        cache.clear()
+        self.viewer = User.objects.create_user(username='viewer', password='password123')
+        self.authors = [
+            User.objects.create_user(username=f'author{i}', password='password123')
+            for i in range(3)
+        ]
+
+    def create_reviews(self, count):
+        for i in range(count):
+            review = Review.objects.create(
+                user=self.authors[i % len(self.authors)],
+                movie_id=self.movie_id,
+                title=f'리뷰 {i}',
+                content='내용',
+                rating=4.0,
+                emotion_tags=['joy'],
+            )
+            likers = self.authors[: i % 3 + 1]
+            if i % 2 == 0:
+                likers.append(self.viewer)
+            review.likes.add(*likers)
+            Review.objects.filter(pk=review.pk).update(like_count=len(likers))
+            Comment.objects.create(review=review, user=self.viewer, content='댓글')
+
+    def test_query_count_is_constant(self):
+        for count in (2, 15):
+            Review.objects.all().delete()
+            cache.clear()
+            self.create_reviews(count)
+
+            # ETag 검증값 조회 1 + 목록 1
+            with self.assertNumQueries(2):
+                response = self.client.get(f'/api/community/reviews/{self.movie_id}/')
+            self.assertEqual(len(response.data['results']), count)
+
+    def test_annotated_values(self):
+        self.create_reviews(2)
+        self.client.force_authenticate(self.viewer)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/community/reviews/{self.movie_id}/')
+
+        by_title = {review['title']: review for review in response.data['results']}
+        self.assertEqual(by_title['리뷰 0']['like_count'], 2)
+        self.assertTrue(by_title['리뷰 0']['is_liked'])
+        self.assertEqual(by_title['리뷰 1']['like_count'], 2)
+        self.assertFalse(by_title['리뷰 1']['is_liked'])
+        self.assertEqual(by_title['리뷰 1']['comment_count'], 1)
+        self.assertEqual(by_title['리뷰 1']['username'], 'author1')
+
+
+class ReviewCursorPaginationTest(APITestCase):
+    """리뷰/댓글 목록 커서 페이지네이션"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='writer', password='password123')
+        self.reviews = [
+            Review.objects.create(user=self.user, movie_id=1, title=f'리뷰 {i}', content='내용', rating=3.0)
+            for i in range(25)
+        ]
+
+    def test_pages_are_disjoint_and_newest_first(self):
+        response = self.client.get('/api/community/reviews/1/', {'page_size': 10})
+        seen = [review['id'] for review in response.data['results']]
+
+        while response.data['next']:
+            with self.assertNumQueries(2):
+                response = self.client.get(response.data['next'])
+            seen.extend(review['id'] for review in response.data['results'])
+
+        expected = [review.id for review in sorted(self.reviews, key=lambda r: (r.created_at, r.id), reverse=True)]
+        self.assertEqual(seen, expected)
+
+    def test_comment_list_is_paginated(self):
+        review = self.reviews[0]
+        for i in range(3):
+            Comment.objects.create(review=review, user=self.user, content=f'댓글 {i}')
+
+        response = self.client.get(f'/api/community/reviews/{review.id}/comments/', {'page_size': 2})
+        self.assertEqual([c['content'] for c in response.data['results']], ['댓글 0', '댓글 1'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual([c['content'] for c in response.data['results']], ['댓글 2'])
+        self.assertIsNone(response.data['next'])
+
+
+class ToggleLikeConcurrencyTest(TransactionTestCase):
+    """동시에 여러 사용자가 좋아요를 토글해도 like_count 와 실제 좋아요 수가 일치하는지 확인"""
+
+    workers = 8
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # 공유 메모리 테스트 DB 는 동시 쓰기 때 잠금을 기다리지 않고 바로 실패하므로
+        # 이 테스트만 테스트 DB 를 파일로 복사해서 실행
+        if connection.vendor != 'sqlite' or not connection.is_in_memory_db():
+            return
+        memory_name = connection.settings_dict['NAME']
+        # 복사본을 쓰는 동안 메모리 DB 가 사라지지 않도록 연결 하나를 붙잡아 둠
+        keeper = sqlite3.connect(memory_name, uri=True)
+        tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(tmpdir.name, 'db.sqlite3')
+
+        connection.ensure_connection()
+        target = sqlite3.connect(path)
+        connection.connection.backup(target)
+        target.close()
+        connection.settings_dict['NAME'] = path
+        connection.close()
+
+        def restore():
+            connection.close()
+            connection.settings_dict['NAME'] = memory_name
+            connection.ensure_connection()
+            keeper.close()
+            tmpdir.cleanup()
+
+        cls.addClassCleanup(restore)
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f'liker{i}', password='password123')
+            for i in range(self.workers)
+        ]
+        self.review = Review.objects.create(
+            user=self.users[0], movie_id=1, title='리뷰', content='내용', rating=5.0,
+        )
+
+    def toggle_all_concurrently(self):
+        barrier = threading.Barrier(self.workers)
+        results = []
+
+        def toggle(user):
+            client = APIClient()
+            client.force_authenticate(user)
+            try:
+                barrier.wait()
+                response = client.post(f'/api/community/reviews/{self.review.id}/like/')
+                results.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=toggle, args=(user,)) for user in self.users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_parallel_toggles_keep_count_consistent(self):
+        self.assertEqual(self.toggle_all_concurrently(), [200] * self.workers)
+        self.review.refresh_from_db()
+        self.assertEqual(self.review.like_count, self.workers)
+        self.assertEqual(self.review.likes.count(), self.workers)
+
+        self.assertEqual(self.toggle_all_concurrently(), [200] * self.workers)
+        self.review.refresh_from_db()
+        self.assertEqual(self.review.like_count, 0)
+        self.assertEqual(self.review.likes.count(), 0)
+
+
+class LikeCountReconcileTest(APITestCase):
+    """fixture 로딩 후 reconcile_like_counts 로 like_count 재계산"""
+
+    def counts(self):
+        return {
+            review.id: (review.like_count, review.likes.count())
+            for review in Review.objects.prefetch_related('likes')
+        }
+
+    def test_loaddata_then_reconcile_is_consistent(self):
+        fixtures = settings.BASE_DIR / 'fixtures'
+        call_command('loaddata', fixtures / 'users.json', fixtures / 'reviews.json', verbosity=0)
+        for like_count, likes in self.counts().values():
+            self.assertEqual(like_count, likes)
+
+        # like_count 가 없던 예전 fixture / 어긋난 카운터
+        Review.objects.update(like_count=0)
+        call_command('reconcile_like_counts', stdout=StringIO())
+        counts = self.counts()
+        self.assertTrue(any(likes for _, likes in counts.values()))
+        for like_count, likes in counts.values():
+            self.assertEqual(like_count, likes)
+
+        # 좋아요 취소해도 음수가 되지 않음
+        review = Review.objects.filter(like_count__gt=0).first()
+        self.client.force_authenticate(review.likes.first())
+        self.client.post(f'/api/community/reviews/{review.id}/like/')
+        review.refresh_from_db()
+        self.assertEqual(review.like_count, review.likes.count())
+
+
+class ReviewListConditionalGetTest(APITestCase):
+    """리뷰 목록 ETag → 304, 쓰기 후에는 새 ETag"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='writer', password='password123')
+        self.review = Review.objects.create(user=self.user, movie_id=1, title='리뷰', content='내용', rating=3.0)
+
+    def test_not_modified_until_write(self):
+        url = '/api/community/reviews/1/'
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/community/reviews/{self.review.id}/like/')
+        self.client.force_authenticate(None)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['results'][0]['like_count'], 1)
+
+    def test_no_last_modified_for_lists(self):
+        # 수정/삭제는 Max(created_at) 을 올리지 않으므로 If-Modified-Since 만 보낸 클라이언트에 304 를 주면 안 됨
+        url = '/api/community/reviews/1/'
+        response = self.client.get(url)
+        self.assertNotIn('Last-Modified', response)
+        self.assertNotIn('Last-Modified', self.client.get(f'/api/community/reviews/{self.review.id}/comments/'))
+
+        self.client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/community/reviews/{self.review.id}/update/', {'title': '고친 리뷰'}, format='json')
+        self.client.force_authenticate(None)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['title'], '고친 리뷰')
+
+
+class ReviewListResponseCacheTest(APITestCase):
+    """리뷰 목록 공유 응답 캐시 + 사용자별 is_liked 덧씌우기"""
+
+    def setUp(self):
+        cache.clear()
+        self.writer = User.objects.create_user(username='writer', password='password123')
+        self.liker = User.objects.create_user(username='liker', password='password123')
+        self.review = Review.objects.create(user=self.writer, movie_id=1, title='리뷰', content='내용', rating=3.0)
+        self.review.likes.add(self.liker)
+        Review.objects.filter(pk=self.review.pk).update(like_count=1)
+
+    def test_cached_entry_is_shared_between_users(self):
+        url = '/api/community/reviews/1/'
+        self.client.force_authenticate(self.liker)
+        self.assertTrue(self.client.get(url).data['results'][0]['is_liked'])
+
+        # 캐시 적중: 검증값 조회 1 + is_liked 조회 1
+        self.client.force_authenticate(self.writer)
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertFalse(response.data['results'][0]['is_liked'])
+        self.assertEqual(response.data['results'][0]['like_count'], 1)
+
+        self.client.force_authenticate(None)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertFalse(response.data['results'][0]['is_liked'])
+
+    def test_write_invalidates_only_affected_movie(self):
+        Review.objects.create(user=self.writer, movie_id=2, title='다른 영화', content='내용', rating=3.0)
+        self.client.get('/api/community/reviews/1/')
+        self.client.get('/api/community/reviews/2/')
+
+        self.client.force_authenticate(self.writer)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/community/reviews/1/create/', {
+                'title': '새 리뷰', 'content': '내용', 'rating': 4.0,
+            }, format='json')
+        self.client.force_authenticate(None)
+
+        response = self.client.get('/api/community/reviews/1/')
+        self.assertEqual(len(response.data['results']), 2)
+        with self.assertNumQueries(1):
+            self.client.get('/api/community/reviews/2/')
+
+
+class ReviewSearchTest(APITestCase):
+    """리뷰 전문 검색 + 필터"""
+
+    url = '/api/community/reviews/search/'
+
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', password='password123')
+        self.bob = User.objects.create_user(username='bob', password='password123')
+        self.twist = Review.objects.create(
+            user=self.alice, movie_id=1, title='반전이 대단한 영화', content='마지막 장면에서 소름',
+            rating=5.0, emotion_tags=['excitement'],
+        )
+        self.sad = Review.objects.create(
+            user=self.bob, movie_id=2, title='눈물 버튼', content='반전은 없지만 슬픈 결말',
+            rating=3.5, emotion_tags=['sadness'],
+        )
+        self.other = Review.objects.create(
+            user=self.bob, movie_id=1, title='그저 그럼', content='지루했다', rating=2.0,
+        )
+
+    def search(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [review['id'] for review in response.data['results']]
+
+    def test_text_search_matches_title_and_content(self):
+        self.assertEqual(self.search(q='반전'), [self.sad.id, self.twist.id])
+        self.assertEqual(self.search(q='마지막 장면'), [self.twist.id])
+
+    def test_terms_use_trigram_and_bigram_indexes(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.search(q='대단한'), [self.twist.id])
+        self.assertIn('community_review_fts', queries[-1]['sql'])
+        self.assertNotIn('LIKE', queries[-1]['sql'])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.search(q='소름'), [self.twist.id])
+        self.assertIn('community_review_bigram', queries[-1]['sql'])
+        self.assertNotIn('LIKE', queries[-1]['sql'])
+
+        self.assertEqual(self.search(q='지루했다'), [self.other.id])
+        self.assertEqual(self.search(q='결말 없지만'), [self.sad.id])
+        # 단어 중간의 2글자
+        self.assertEqual(self.search(q='장면'), [self.twist.id])
+        self.assertEqual(self.search(q='루했'), [self.other.id])
+
+    def test_one_letter_terms_filter_indexed_candidates(self):
+        self.assertEqual(self.search(q='반전 슬'), [self.sad.id])
+        self.assertEqual(self.search(q='럼'), [self.other.id])
+
+    def test_filters_combine_with_text(self):
+        self.assertEqual(self.search(q='반전', emotion='sadness'), [self.sad.id])
+        self.assertEqual(self.search(q='반전', min_rating=4), [self.twist.id])
+        self.assertEqual(self.search(movie_id=1, author='bob'), [self.other.id])
+
+    def test_index_follows_update_and_delete(self):
+        self.twist.title = '평범한 영화'
+        self.twist.content = '그냥 그랬다'
+        self.twist.save()
+        self.assertEqual(self.search(q='대단한'), [])
+        self.assertEqual(self.search(q='소름'), [])
+        self.assertEqual(self.search(q='그랬다'), [self.twist.id])
+        self.assertEqual(self.search(q='평범'), [self.twist.id])
+
+        Review.objects.filter(pk=self.other.pk).update(content='지루하지 않았다')
+        self.assertEqual(self.search(q='지루했다'), [])
+        self.assertEqual(self.search(q='않았다'), [self.other.id])
+
+        self.sad.delete()
+        self.assertEqual(self.search(q='반전'), [])
+        self.assertEqual(self.search(q='없지만'), [])
+
+    def test_fixture_and_raw_sql_writes(self):
+        # fixture(raw 저장)도 pre_save 에서 2글자 색인 컬럼을 채움
+        load_fixture([{
+            'model': 'community.review', 'pk': 100,
+            'fields': {'user': self.alice.pk, 'movie_id': 3, 'title': '명작', 'content': '여운이 길다', 'rating': 4.5,
+                       'created_at': '2025-01-01T00:00:00Z'},
+        }])
+        self.assertEqual(self.search(q='여운'), [100])
+
+        # 트리거는 SQL 만 쓰므로 원시 SQL 쓰기도 실패하지 않고, refresh_search_bigrams() 로 다시 채움
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE community_review SET content = '긴장감 가득' WHERE id = %s", [self.other.id])
+        self.assertEqual(self.search(q='긴장감'), [self.other.id])
+        self.assertEqual(self.search(q='긴장'), [])
+        Review.objects.filter(pk=self.other.pk).refresh_search_bigrams()
+        self.assertEqual(self.search(q='긴장'), [self.other.id])
+
+    def test_requires_query_or_filter(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'emotion': 'melancholy'}).status_code, 400)
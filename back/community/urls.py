@@ -4,6 +4,7 @@ from . import views
 urlpatterns = [
     # ========== 리뷰 관련 ==========
     path('reviews/<int:movie_id>/', views.review_list),
+    path('reviews/search/', views.review_search),
     path('reviews/<int:movie_id>/create/', views.create_review),
     path('reviews/<int:review_id>/like/', views.toggle_like),
     
@@ -1,47 +1,130 @@
+import logging
+
 from django.shortcuts import render, get_object_or_404
+from django.http import Http404
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
+from django.db import transaction, IntegrityError
+from django.db.models import F, Max
 from datetime import date
 
+from final_project.cache_versions import get_version, bump_version_on_commit
+from final_project.conditional import conditional_get, request_fingerprint
+from final_project.pagination import paginate, NewestFirstCursorPagination, OldestFirstCursorPagination
+from final_project.response_cache import response_cache_key, get_or_build
+from movies.home_feed import invalidate_home_feed
 from .models import Review, Comment
-from .serializers import ReviewSerializer, CommentSerializer
+from .search import search_reviews
+from .serializers import ReviewSerializer, CommentSerializer, ReviewSearchParamsSerializer
+
+logger = logging.getLogger(__name__)
+
+# ========== 목록 버전 (ETag / 캐시 무효화용) ==========
+def _bump_review_list(movie_id):
+    bump_version_on_commit('reviews', movie_id)
+
+
+def _bump_comment_list(review_id, movie_id):
+    bump_version_on_commit('comments', review_id)
+    # 리뷰 목록의 comment_count 도 바뀜
+    bump_version_on_commit('reviews', movie_id)
+
+
+# 목록은 수정/좋아요/삭제로도 바뀌므로 Max(created_at) 은 Last-Modified 로 쓸 수 없음
+# (삭제하면 오히려 과거로 돌아감) → 쓰기마다 올라가는 버전을 넣은 ETag 로만 검증
+def _review_list_validators(request, movie_id):
+    last_id = Review.objects.filter(movie_id=movie_id).aggregate(last_id=Max('id'))['last_id']
+    etag_source = (
+        f"reviews:{movie_id}:{last_id}:{get_version('reviews', movie_id)}"
+        f"|{request_fingerprint(request)}"
+    )
+    return etag_source, None
+
+
+def _comment_list_validators(request, review_id):
+    last_id = Comment.objects.filter(review_id=review_id).aggregate(last_id=Max('id'))['last_id']
+    etag_source = (
+        f"comments:{review_id}:{last_id}:{get_version('comments', review_id)}"
+        f"|{request_fingerprint(request)}"
+    )
+    return etag_source, None
+
+
+# 응답 캐시에는 is_liked 를 빼고(False) 저장하고, 로그인 사용자에게는 한 번의 쿼리로 덧씌움
+def _without_is_liked(data):
+    return {**data, 'results': [{**review, 'is_liked': False} for review in data['results']]}
+
+
+def _with_is_liked(data, user):
+    if not user.is_authenticated or not data['results']:
+        return data
+    liked = set(
+        Review.likes.through.objects.filter(
+            user_id=user.id, review_id__in=[review['id'] for review in data['results']]
+        ).values_list('review_id', flat=True)
+    )
+    return {**data, 'results': [{**review, 'is_liked': review['id'] in liked} for review in data['results']]}
+
 
 # ========== 리뷰 목록 조회 ==========
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_get(_review_list_validators)
 def review_list(request, movie_id):
-    reviews = Review.objects.filter(movie_id=movie_id).order_by('-created_at')
-    serializer = ReviewSerializer(reviews, many=True, context={'request': request})
-    return Response(serializer.data)
+    def build():
+        reviews = Review.objects.filter(movie_id=movie_id).with_stats(request.user)
+        return paginate(
+            request, reviews, NewestFirstCursorPagination,
+            lambda page: ReviewSerializer(page, many=True, context={'request': request}).data,
+        ).data
+
+    key = response_cache_key('reviews', movie_id, get_version('reviews', movie_id), request)
+    data, cached = get_or_build(key, build, shared=_without_is_liked)
+    if cached:
+        data = _with_is_liked(data, request.user)
+    return Response(data)
+
+# ========== 리뷰 검색 ==========
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def review_search(request):
+    """
+    제목/본문 전문 검색 + 필터 (최신순 커서 페이지네이션)
+
+    Query Parameters: q, emotion, min_rating, max_rating, movie_id, author(username), cursor, page_size
+    """
+    params = ReviewSearchParamsSerializer(data=request.query_params)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    reviews = search_reviews(**params.validated_data).with_stats(request.user)
+    return paginate(
+        request, reviews, NewestFirstCursorPagination,
+        lambda page: ReviewSerializer(page, many=True, context={'request': request}).data,
+    )
 
 # ========== 리뷰 작성 ==========
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_review(request, movie_id):
-    print("=" * 50)
-    print(f"📝 리뷰 작성 요청")
-    print(f"👤 사용자: {request.user.username}")
-    print(f"🎬 영화 ID: {movie_id}")
-    print(f"📦 받은 데이터: {request.data}")
-    print(f"📦 데이터 타입: {type(request.data)}")
-    print("=" * 50)
-    
     serializer = ReviewSerializer(data=request.data, context={'request': request})
     
     if serializer.is_valid():
-        serializer.save(
-            user=request.user,
-            movie_id=movie_id
-        )
-        print(f"✅ 리뷰 작성 성공!")
+        # 감정 인덱스/카운터 갱신(signals)까지 한 트랜잭션으로 처리
+        with transaction.atomic():
+            serializer.save(
+                user=request.user,
+                movie_id=movie_id
+            )
+            _bump_review_list(movie_id)
+            # 리뷰를 쓴 영화는 홈 피드에서 빠짐
+            invalidate_home_feed(request.user.id)
+        logger.info("리뷰 작성 review_id=%s movie_id=%s user_id=%s", serializer.instance.id, movie_id, request.user.id)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
-    
-    print(f"❌ Serializer 검증 실패:")
-    print(f"   에러: {serializer.errors}")
-    print("=" * 50)
-    
+
+    logger.info("리뷰 작성 검증 실패 movie_id=%s user_id=%s fields=%s", movie_id, request.user.id, sorted(serializer.errors))
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 # ========== 리뷰 수정 ==========
@@ -59,11 +142,13 @@ def update_review(request, review_id):
     serializer = ReviewSerializer(review, data=request.data, partial=True, context={'request': request})
     
     if serializer.is_valid():
-        serializer.save()
-        print(f"✅ 리뷰 수정 성공: {review.id}")
+        with transaction.atomic():
+            serializer.save()
+            _bump_review_list(review.movie_id)
+        logger.info("리뷰 수정 review_id=%s user_id=%s", review.id, request.user.id)
         return Response(serializer.data)
-    
-    print(f"❌ 리뷰 수정 실패: {serializer.errors}")
+
+    logger.info("리뷰 수정 검증 실패 review_id=%s fields=%s", review.id, sorted(serializer.errors))
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 # ========== 리뷰 삭제 ==========
@@ -79,50 +164,68 @@ def delete_review(request, review_id):
         )
     
     review.delete()
-    print(f"✅ 리뷰 삭제 성공: {review_id}")
-    return Response(
-        {'message': '리뷰가 삭제되었습니다.'},
-        status=status.HTTP_204_NO_CONTENT
-    )
+    _bump_review_list(review.movie_id)
+    invalidate_home_feed(review.user_id)
+    logger.info("리뷰 삭제 review_id=%s user_id=%s", review_id, request.user.id)
+    # 204 응답에는 본문을 보내지 않음 (본문이 있으면 keep-alive 연결의 다음 응답이 깨짐)
+    return Response(status=status.HTTP_204_NO_CONTENT)
 
 # ========== 좋아요 토글 ==========
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def toggle_like(request, review_id):
-    review = get_object_or_404(Review, id=review_id)
-    user = request.user
+    movie_id = Review.objects.filter(id=review_id).values_list('movie_id', flat=True).first()
+    if movie_id is None:
+        raise Http404
+
+    Like = Review.likes.through
+    reviews = Review.objects.filter(id=review_id)
 
-    if user in review.likes.all():
-        review.likes.remove(user)
-        liked = False
-    else:
-        review.likes.add(user)
-        liked = True
+    # 중간 테이블 insert/delete 한 번 + like_count F() 증감을 한 트랜잭션으로 처리
+    with transaction.atomic():
+        deleted, _ = Like.objects.filter(review_id=review_id, user_id=request.user.id).delete()
+        if deleted:
+            liked = False
+            reviews.update(like_count=F('like_count') - 1)
+        else:
+            liked = True
+            try:
+                with transaction.atomic():
+                    Like.objects.create(review_id=review_id, user_id=request.user.id)
+            except IntegrityError:
+                # 같은 사용자의 동시 요청이 먼저 좋아요를 넣은 경우 (카운트는 이미 반영됨)
+                pass
+            else:
+                reviews.update(like_count=F('like_count') + 1)
+
+        like_count = reviews.values_list('like_count', flat=True).get()
+        _bump_review_list(movie_id)
 
     return Response({
         'liked': liked,
-        'like_count': review.likes.count()
+        'like_count': like_count
     })
 
 # ========== 댓글 목록 조회 ==========
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_get(_comment_list_validators)
 def comment_list(request, review_id):
-    comments = Comment.objects.filter(review_id=review_id).order_by('created_at')
-    serializer = CommentSerializer(comments, many=True)
-    return Response(serializer.data)
+    def build():
+        comments = Comment.objects.filter(review_id=review_id).select_related('user')
+        return paginate(
+            request, comments, OldestFirstCursorPagination,
+            lambda page: CommentSerializer(page, many=True).data,
+        ).data
+
+    key = response_cache_key('comments', review_id, get_version('comments', review_id), request)
+    data, _ = get_or_build(key, build)
+    return Response(data)
 
 # ========== 댓글 작성 ==========
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_comment(request, review_id):
-    print("=" * 50)
-    print(f"💬 댓글 작성 요청")
-    print(f"👤 사용자: {request.user.username}")
-    print(f"📝 리뷰 ID: {review_id}")
-    print(f"📦 받은 데이터: {request.data}")
-    print("=" * 50)
-    
     review = get_object_or_404(Review, id=review_id)
     serializer = CommentSerializer(data=request.data)
     
@@ -131,20 +234,18 @@ def create_comment(request, review_id):
             user=request.user,
             review=review
         )
-        print(f"✅ 댓글 작성 성공!")
+        _bump_comment_list(review.id, review.movie_id)
+        logger.info("댓글 작성 comment_id=%s review_id=%s user_id=%s", serializer.instance.id, review.id, request.user.id)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
-    
-    print(f"❌ Serializer 검증 실패:")
-    print(f"   에러: {serializer.errors}")
-    print("=" * 50)
-    
+
+    logger.info("댓글 작성 검증 실패 review_id=%s user_id=%s fields=%s", review.id, request.user.id, sorted(serializer.errors))
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 # ========== 댓글 수정 ==========
 @api_view(['PUT', 'PATCH'])
 @permission_classes([IsAuthenticated])
 def update_comment(request, comment_id):
-    comment = get_object_or_404(Comment, id=comment_id)
+    comment = get_object_or_404(Comment.objects.select_related('review'), id=comment_id)
     
     if comment.user != request.user:
         return Response(
@@ -156,17 +257,18 @@ def update_comment(request, comment_id):
     
     if serializer.is_valid():
         serializer.save()
-        print(f"✅ 댓글 수정 성공: {comment.id}")
+        _bump_comment_list(comment.review_id, comment.review.movie_id)
+        logger.info("댓글 수정 comment_id=%s user_id=%s", comment.id, request.user.id)
         return Response(serializer.data)
-    
-    print(f"❌ 댓글 수정 실패: {serializer.errors}")
+
+    logger.info("댓글 수정 검증 실패 comment_id=%s fields=%s", comment.id, sorted(serializer.errors))
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 # ========== 댓글 삭제 ==========
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
 def delete_comment(request, comment_id):
-    comment = get_object_or_404(Comment, id=comment_id)
+    comment = get_object_or_404(Comment.objects.select_related('review'), id=comment_id)
     
     if comment.user != request.user and not request.user.is_superuser:
         return Response(
@@ -175,8 +277,7 @@ def delete_comment(request, comment_id):
         )
     
     comment.delete()
-    print(f"✅ 댓글 삭제 성공: {comment_id}")
-    return Response(
-        {'message': '댓글이 삭제되었습니다.'},
-        status=status.HTTP_204_NO_CONTENT
-    )
\ No newline at end of file
+    _bump_comment_list(comment.review_id, comment.review.movie_id)
+    logger.info("댓글 삭제 comment_id=%s user_id=%s", comment_id, request.user.id)
+    # 204 응답에는 본문을 보내지 않음 (본문이 있으면 keep-alive 연결의 다음 응답이 깨짐)
+    return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+캐시 버전 카운터
+
+목록 응답의 ETag / 캐시 키에 버전 번호를 넣고, 쓰기가 일어나면 버전만 올려서
+이전 버전의 ETag·캐시 항목을 한 번에 무효화한다.
+버전은 Django 캐시에 저장되므로 모든 프로세스가 같은 캐시(file / redis)를 봐야 한다.
+(프로세스별 캐시면 워커마다 ETag 가 다르고, 쓰기를 못 본 워커가 예전 ETag 에 304 를 줌
+ → settings.CACHE_BACKEND, final_project/checks.py)
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_TIMEOUT = None  # 만료 없음
+
+
+def _version_key(scope, key):
+    return f"version:{scope}:{key}"
+
+
+def _initial_version():
+    # 캐시에서 밀려난 뒤 다시 만들어져도 이전 값과 겹치지 않도록 시각 기반으로 시작
+    return time.time_ns() // 1000
+
+
+def get_version(scope, key):
+    """scope/key 의 현재 버전 (없으면 새로 생성)"""
+    version_key = _version_key(scope, key)
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, _initial_version(), VERSION_TIMEOUT)
+        version = cache.get(version_key)
+    return version
+
+
+def bump_version(scope, key):
+    """버전을 올려 기존 ETag / 캐시 항목 무효화"""
+    version_key = _version_key(scope, key)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.add(version_key, _initial_version(), VERSION_TIMEOUT)
+
+
+def bump_version_on_commit(scope, key):
+    """현재 트랜잭션이 커밋된 뒤 버전 올리기 (커밋 전 데이터가 새 버전으로 캐시되는 것 방지)"""
+    transaction.on_commit(lambda: bump_version(scope, key))
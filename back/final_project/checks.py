@@ -0,0 +1,31 @@
+"""
+프로젝트 설정 검사 (manage.py check / runserver / 관리 명령 실행 전에 실행됨)
+"""
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# 프로세스별 캐시 백엔드 (다른 프로세스의 버전 올리기 / 응답 캐시를 볼 수 없음)
+PROCESS_LOCAL_CACHES = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    DEBUG 가 아니면 공유 캐시 필수
+
+    캐시 버전 카운터가 프로세스별이면 fetch_movies 등 관리 명령의 무효화가 웹 워커에 닿지 않고,
+    워커마다 ETag 가 달라 RESPONSE_CACHE_TIMEOUT 동안 오래된 응답을 내보낸다.
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    if settings.DEBUG or backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Error(
+            f"{backend} 는 프로세스마다 따로인 캐시라 캐시 무효화가 다른 프로세스에 전달되지 않습니다.",
+            hint="CACHE_BACKEND=file 또는 redis 를 사용하세요.",
+            id="final_project.E001",
+        )
+    ]
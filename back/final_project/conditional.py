@@ -0,0 +1,53 @@
+"""
+조건부 GET (ETag / Last-Modified → 304 Not Modified)
+
+뷰 실행 전에 가벼운 검증값만 계산하고, 클라이언트가 가진 버전과 같으면
+쿼리·직렬화 없이 바로 304 를 반환한다.
+"""
+import hashlib
+from calendar import timegm
+from functools import wraps
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+def conditional_get(validators):
+    """
+    validators(request, *args, **kwargs) -> (etag 재료 문자열 | None, last_modified datetime | None)
+
+    @api_view 안쪽(함수 바로 위)에 붙여서 request.user 가 인증된 상태로 계산되게 한다.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def inner(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            etag_source, last_modified = validators(request, *args, **kwargs)
+            etag = None
+            if etag_source is not None:
+                etag = quote_etag(hashlib.md5(etag_source.encode('utf-8')).hexdigest())
+            last_modified_ts = timegm(last_modified.utctimetuple()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+
+            if response.status_code in (200, 304):
+                if etag and not response.has_header('ETag'):
+                    response.headers['ETag'] = etag
+                if last_modified_ts and not response.has_header('Last-Modified'):
+                    response.headers['Last-Modified'] = http_date(last_modified_ts)
+                # 매번 서버에 재검증 요청 (ETag 로 304 응답)
+                patch_cache_control(response, no_cache=True)
+                patch_vary_headers(response, ('Authorization',))
+            return response
+        return inner
+    return decorator
+
+
+def request_fingerprint(request):
+    """쿼리스트링(커서 등)과 사용자별로 응답이 달라지는 목록용 ETag 재료"""
+    user_id = request.user.id if request.user.is_authenticated else 0
+    return f"{request.get_full_path()}|user:{user_id}"
@@ -0,0 +1,269 @@
+"""
+전문 검색(Full-text) 인덱스 공용 도구
+
+- SQLite: FTS5 외부 콘텐츠 테이블 + trigram 토크나이저 (한글처럼 띄어쓰기로 단어를
+  나누기 어려운 텍스트도 부분 문자열로 검색 가능), 원본 테이블 트리거로 자동 동기화
+- PostgreSQL: pg_trgm GIN 인덱스
+
+trigram 인덱스는 3글자 미만 검색어를 찾지 못한다. 한글 검색어는 2글자(반전, 소름, 결말)가
+대부분이라 2글자 조각(bigram) 인덱스를 따로 둔다.
+
+- SQLite: 애플리케이션이 저장할 때 채우는 search_bigrams 컬럼(SearchBigramsModel)을 색인하는
+  FTS5 외부 콘텐츠 테이블. 트리거는 SQL 만 쓰므로 sqlite3 셸 / 백업 도구 등 Django 밖의 쓰기도
+  실패하지 않는다 (대신 그런 쓰기는 컬럼을 채우지 않으므로 refresh_search_bigrams() 로 다시 채움)
+- PostgreSQL: DB 안에 만든 SQL 함수 fts_bigrams() 배열 GIN 인덱스 (@> 조건, 어떤 연결에서 써도 동작)
+
+1글자 검색어만 LIKE 조건으로 따로 처리한다.
+"""
+import re
+
+from django.db import models, transaction
+
+MIN_TRIGRAM_LENGTH = 3
+BIGRAM_LENGTH = 2
+
+# bigram 조각을 저장하는 컬럼 / SQLite FTS5 토크나이저 (공백으로 나눈 조각을 그대로 토큰으로)
+BIGRAM_COLUMN = "search_bigrams"
+BIGRAM_TOKENIZER = "unicode61 remove_diacritics 0"
+# PostgreSQL bigram 배열 함수 이름 (마이그레이션에서 생성)
+BIGRAM_FUNCTION = "fts_bigrams"
+# refresh_search_bigrams() 한 번에 갱신할 행 수
+REFRESH_BATCH_SIZE = 1000
+
+# 글자/숫자가 이어진 구간 (FTS5 unicode61 토크나이저의 기본 토큰 문자와 같은 범위)
+_WORD = re.compile(r"[^\W_]+")
+
+
+def split_terms(query):
+    """
+    검색어를 찾는 방법별로 분리
+
+    반환값: (trigram 단어, bigram 단어, LIKE 로 찾을 단어)
+    - trigram: 3글자 이상
+    - bigram: 글자/숫자로만 된 2글자
+    - LIKE: 1글자, 또는 기호가 섞인 2글자
+    """
+    terms = [term for term in re.split(r"\s+", query.strip()) if term]
+    trigram_terms = [term for term in terms if len(term) >= MIN_TRIGRAM_LENGTH]
+    bigram_terms = [term for term in terms if is_bigram_term(term)]
+    like_terms = [term for term in terms if len(term) < MIN_TRIGRAM_LENGTH and not is_bigram_term(term)]
+    return trigram_terms, bigram_terms, like_terms
+
+
+def is_bigram_term(term):
+    return len(term) == BIGRAM_LENGTH and _WORD.fullmatch(term) is not None
+
+
+def bigrams(text):
+    """
+    텍스트 → 공백으로 구분한 2글자 조각 (소문자, 글자/숫자 구간 안에서만)
+
+    '반전이 대단!' → '반전 전이 대단'
+    """
+    if not text:
+        return ""
+    return " ".join(
+        word[i:i + BIGRAM_LENGTH]
+        for word in _WORD.findall(text.lower())
+        for i in range(len(word) - 1)
+    )
+
+
+def bigram_text(*values):
+    """검색 필드 값들 → search_bigrams 컬럼 값 (필드 경계를 넘는 조각은 만들지 않음)"""
+    return " ".join(filter(None, (bigrams(value) for value in values)))
+
+
+class SearchBigramsQuerySet(models.QuerySet):
+    """검색 필드를 바꾸는 queryset.update() 뒤에 search_bigrams 도 다시 채움"""
+
+    def update(self, **kwargs):
+        if not set(kwargs) & set(self.model.SEARCH_FIELDS):
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            # 조건이 바뀌는 필드를 쓸 수 있으므로 갱신 전에 대상 id 를 잡아 둠
+            ids = list(self.values_list("pk", flat=True))
+            updated = super().update(**kwargs)
+            for start in range(0, len(ids), REFRESH_BATCH_SIZE):
+                self.model._default_manager.filter(
+                    pk__in=ids[start:start + REFRESH_BATCH_SIZE]
+                ).refresh_search_bigrams()
+        return updated
+
+    update.alters_data = True
+
+    def refresh_search_bigrams(self, batch_size=None):
+        """
+        원본 필드로 search_bigrams 다시 채움
+
+        bulk_create / 원시 SQL / Django 밖에서 검색 필드를 바꾼 뒤 호출한다.
+        """
+        batch_size = batch_size or REFRESH_BATCH_SIZE
+        fields = self.model.SEARCH_FIELDS
+        batch = []
+        for obj in self.only("pk", *fields).iterator(chunk_size=batch_size):
+            obj.fill_search_bigrams()
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                self.model._default_manager.bulk_update(batch, [BIGRAM_COLUMN])
+                batch = []
+        if batch:
+            self.model._default_manager.bulk_update(batch, [BIGRAM_COLUMN])
+
+    refresh_search_bigrams.alters_data = True
+
+
+class SearchBigramsModel(models.Model):
+    """
+    2글자 검색용 search_bigrams 컬럼을 가진 모델 (SEARCH_FIELDS: 색인할 원본 필드)
+
+    pre_save 시그널(fill_search_bigrams, fixture 의 raw 저장 포함)에서 채우고, save(update_fields=...) 에
+    검색 필드가 있으면 search_bigrams 도 같이 저장한다. bulk_create 는 시그널을 거치지 않으므로
+    fill_search_bigrams() 를 직접 호출한다.
+    """
+    SEARCH_FIELDS = ()
+
+    search_bigrams = models.TextField(blank=True, default="", editable=False)
+
+    class Meta:
+        abstract = True
+
+    def fill_search_bigrams(self):
+        self.search_bigrams = bigram_text(*(getattr(self, field) for field in self.SEARCH_FIELDS))
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and set(update_fields) & set(self.SEARCH_FIELDS):
+            kwargs["update_fields"] = {*update_fields, BIGRAM_COLUMN}
+        super().save(*args, **kwargs)
+
+
+def fill_search_bigrams(sender, instance, update_fields=None, **kwargs):
+    """pre_save 수신: 저장 직전 search_bigrams 채우기 (검색 필드를 저장하지 않는 update_fields 저장은 건너뜀)"""
+    if update_fields is None or set(update_fields) & set(sender.SEARCH_FIELDS):
+        instance.fill_search_bigrams()
+
+
+def bigram_column_sql(table):
+    """
+    search_bigrams 컬럼 추가/삭제 SQL (마이그레이션용)
+
+    AddField 는 기본값이 있는 컬럼이라 SQLite 에서 테이블을 다시 만들면서 전문 검색 트리거를 지우므로
+    ALTER TABLE ADD COLUMN 으로 직접 추가하고 모델 상태만 따로 바꾼다.
+    """
+    forward = [f"ALTER TABLE {table} ADD COLUMN {BIGRAM_COLUMN} text NOT NULL DEFAULT ''"]
+    backward = [f"ALTER TABLE {table} DROP COLUMN {BIGRAM_COLUMN}"]
+    return forward, backward
+
+
+def backfill_search_bigrams(model, fields, batch_size=REFRESH_BATCH_SIZE):
+    """기존 행의 search_bigrams 채우기 (마이그레이션의 과거 모델용, 모델 메서드 없이 동작)"""
+    batch = []
+    for row in model.objects.values_list("pk", *fields).iterator(chunk_size=batch_size):
+        batch.append(model(pk=row[0], **{BIGRAM_COLUMN: bigram_text(*row[1:])}))
+        if len(batch) >= batch_size:
+            model.objects.bulk_update(batch, [BIGRAM_COLUMN])
+            batch = []
+    if batch:
+        model.objects.bulk_update(batch, [BIGRAM_COLUMN])
+
+
+def fts5_match_expression(terms):
+    """FTS5 MATCH 식 (각 단어를 문자열로 감싸 연산자/특수문자를 무력화, 모두 포함 = AND)"""
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in terms)
+
+
+def like_pattern(term):
+    """LIKE 부분 일치 패턴 (%, _ 이스케이프, ESCAPE '\\' 와 함께 사용)"""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def sqlite_fts5_sql(table, fts_table, columns, tokenize="trigram"):
+    """
+    외부 콘텐츠 FTS5 테이블과 동기화 트리거 생성/삭제 SQL
+
+    반환값: (생성 SQL 목록, 삭제 SQL 목록)
+    """
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{col}" for col in columns)
+    old_values = ", ".join(f"old.{col}" for col in columns)
+
+    forward = [
+        f"CREATE VIRTUAL TABLE {fts_table} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', tokenize='{tokenize}')",
+        sqlite_fts5_insert_trigger_sql(table, fts_table, columns),
+        f"CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER {fts_table}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_values}); END",
+        # 기존 데이터 색인
+        sqlite_fts5_rebuild_sql(fts_table),
+    ]
+    backward = [
+        f"DROP TRIGGER IF EXISTS {fts_table}_au",
+        f"DROP TRIGGER IF EXISTS {fts_table}_ad",
+        sqlite_fts5_drop_insert_trigger_sql(fts_table),
+        f"DROP TABLE IF EXISTS {fts_table}",
+    ]
+    return forward, backward
+
+
+def sqlite_bigram_sql(table, fts_table):
+    """search_bigrams 컬럼을 색인하는 bigram FTS5 테이블과 동기화 트리거 생성/삭제 SQL"""
+    return sqlite_fts5_sql(table, fts_table, [BIGRAM_COLUMN], tokenize=BIGRAM_TOKENIZER)
+
+
+def sqlite_fts5_insert_trigger_sql(table, fts_table, columns):
+    """INSERT 동기화 트리거 생성 SQL"""
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{col}" for col in columns)
+    return (
+        f"CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_values}); END"
+    )
+
+
+def sqlite_fts5_drop_insert_trigger_sql(fts_table):
+    """
+    INSERT 동기화 트리거 삭제 SQL
+
+    대량 INSERT 때는 행마다 색인하는 트리거를 잠시 빼고,
+    끝난 뒤 트리거를 다시 만들고 전체를 한 번에 색인하는 편이 빠르다.
+    """
+    return f"DROP TRIGGER IF EXISTS {fts_table}_ai"
+
+
+def sqlite_fts5_rebuild_sql(fts_table):
+    """원본 테이블 기준으로 FTS 색인 전체 재생성 SQL"""
+    return f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"
+
+
+def postgres_trigram_sql(table, index_name, expression):
+    """pg_trgm GIN 인덱스 생성/삭제 SQL (expression 은 검색 쿼리와 똑같은 식이어야 인덱스를 탐)"""
+    forward = [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} USING gin (({expression}) gin_trgm_ops)",
+    ]
+    backward = [f"DROP INDEX IF EXISTS {index_name}"]
+    return forward, backward
+
+
+def postgres_bigram_sql(table, index_name, expression):
+    """
+    fts_bigrams(expression) 배열 GIN 인덱스 생성/삭제 SQL
+
+    검색은 fts_bigrams(expression) @> ARRAY['반전'] 처럼 같은 식으로 해야 인덱스를 탄다.
+    함수는 다른 인덱스와 함께 쓸 수 있으므로 삭제 SQL 에서는 인덱스만 지운다.
+    """
+    forward = [
+        f"CREATE OR REPLACE FUNCTION {BIGRAM_FUNCTION}(value text) RETURNS text[] "
+        f"LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$ "
+        f"SELECT coalesce(array_agg(DISTINCT substr(word, i, 2)), '{{}}') "
+        f"FROM regexp_split_to_table(lower(value), '[^[:alnum:]]+') AS word, "
+        f"generate_series(1, length(word) - 1) AS i $$",
+        f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} USING gin ({BIGRAM_FUNCTION}({expression}))",
+    ]
+    backward = [f"DROP INDEX IF EXISTS {index_name}"]
+    return forward, backward
@@ -0,0 +1,164 @@
+"""
+요청 단위 성능 지표 (Prometheus)
+
+- RequestMetricsMiddleware: 요청마다 지연 시간, DB 쿼리 수/시간, TMDB 호출 수, 캐시 적중/미스를 모아
+  라우트별 히스토그램으로 기록하고, 느린 요청은 WARNING 로그로 남긴다.
+- metrics_view: /metrics 에서 Prometheus 텍스트 형식으로 내보냄
+  (gunicorn 등 다중 프로세스면 PROMETHEUS_MULTIPROC_DIR 환경 변수 필요)
+
+prometheus_client 가 없으면 지표 기록은 건너뛰고 요청 로그와 Server-Timing 헤더만 남는다.
+"""
+import logging
+import os
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse, JsonResponse
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest,
+    )
+    from prometheus_client import multiprocess
+except ImportError:
+    Histogram = None
+
+logger = logging.getLogger(__name__)
+
+# 404 등 URL 패턴에 걸리지 않은 요청 (경로를 그대로 라벨로 쓰면 라벨 수가 무한히 늘어남)
+UNMATCHED_ROUTE = "<unmatched>"
+
+if Histogram is not None:
+    REQUEST_SECONDS = Histogram(
+        "http_request_duration_seconds", "요청 처리 시간", ["method", "route", "status"],
+    )
+    REQUEST_DB_QUERIES = Histogram(
+        "http_request_db_queries", "요청당 DB 쿼리 수", ["route"],
+        buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200),
+    )
+    REQUEST_DB_SECONDS = Histogram(
+        "http_request_db_seconds", "요청당 DB 쿼리 시간 합계", ["route"],
+    )
+    REQUEST_TMDB_CALLS = Histogram(
+        "http_request_tmdb_calls", "요청당 TMDB 호출 수", ["route"],
+        buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+    )
+    TMDB_SECONDS = Histogram(
+        "tmdb_request_duration_seconds", "TMDB 호출 시간", ["endpoint", "outcome"],
+    )
+    CACHE_REQUESTS = Counter(
+        "cache_requests", "캐시 조회 결과", ["cache", "scope", "result"],
+    )
+
+
+class RequestStats:
+    """요청 하나 동안 모은 수치 (TMDB 동시 호출 스레드에서도 같은 객체를 갱신)"""
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.tmdb_calls = 0
+        self.tmdb_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """connection.execute_wrapper 용 (쿼리 수/시간 측정)"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_queries += 1
+            self.db_seconds += time.perf_counter() - started
+
+
+_current = ContextVar("request_stats", default=None)
+
+
+def record_tmdb_call(endpoint, outcome, seconds):
+    """TMDB 호출 1건 기록 (outcome: ok / error / rejected)"""
+    stats = _current.get()
+    if stats is not None and outcome != "rejected":
+        stats.tmdb_calls += 1
+        stats.tmdb_seconds += seconds
+    if Histogram is not None:
+        TMDB_SECONDS.labels(endpoint, outcome).observe(seconds)
+
+
+def record_cache(cache_name, scope, result):
+    """캐시 조회 1건 기록 (result: hit / miss / stale)"""
+    stats = _current.get()
+    if stats is not None:
+        if result == "miss":
+            stats.cache_misses += 1
+        else:
+            stats.cache_hits += 1
+    if Histogram is not None:
+        CACHE_REQUESTS.labels(cache_name, scope, result).inc()
+
+
+def _route(request):
+    match = getattr(request, "resolver_match", None)
+    return match.route if match is not None and match.route else UNMATCHED_ROUTE
+
+
+class RequestMetricsMiddleware:
+    """요청별 지연 시간 / DB / TMDB / 캐시 수치 기록"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(stats.db_wrapper):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        elapsed = time.perf_counter() - started
+
+        route = _route(request)
+        if Histogram is not None:
+            REQUEST_SECONDS.labels(request.method, route, response.status_code).observe(elapsed)
+            REQUEST_DB_QUERIES.labels(route).observe(stats.db_queries)
+            REQUEST_DB_SECONDS.labels(route).observe(stats.db_seconds)
+            REQUEST_TMDB_CALLS.labels(route).observe(stats.tmdb_calls)
+
+        # 브라우저 개발자 도구 Network 탭에서 바로 확인 가능
+        response["Server-Timing"] = (
+            f'app;dur={elapsed * 1000:.1f}, '
+            f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.db_queries} queries", '
+            f'tmdb;dur={stats.tmdb_seconds * 1000:.1f};desc="{stats.tmdb_calls} calls"'
+        )
+
+        level = logging.WARNING if elapsed >= settings.SLOW_REQUEST_SECONDS else logging.DEBUG
+        logger.log(
+            level,
+            "요청 method=%s route=%s status=%s duration_ms=%.1f db_queries=%d db_ms=%.1f "
+            "tmdb_calls=%d tmdb_ms=%.1f cache_hits=%d cache_misses=%d",
+            request.method, route, response.status_code, elapsed * 1000,
+            stats.db_queries, stats.db_seconds * 1000, stats.tmdb_calls, stats.tmdb_seconds * 1000,
+            stats.cache_hits, stats.cache_misses,
+        )
+        return response
+
+
+def metrics_view(request):
+    """Prometheus 수집 엔드포인트 (METRICS_TOKEN 설정 시 Bearer 토큰 필요)"""
+    if Histogram is None:
+        return JsonResponse({"error": "prometheus_client 가 설치되어 있지 않습니다."}, status=501)
+
+    if settings.METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {settings.METRICS_TOKEN}":
+        return JsonResponse({"error": "인증이 필요합니다."}, status=401)
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        # 워커 프로세스별 지표 파일을 합쳐서 내보냄
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,53 @@
+"""
+목록 API 공용 커서(keyset) 페이지네이션
+
+OFFSET / 전체 COUNT 없이 정렬 키 위치를 담은 불투명 커서로 다음 페이지를 조회하므로
+깊은 페이지도 첫 페이지와 같은 비용으로 조회된다.
+응답 형식: {"next": URL | null, "previous": URL | null, "results": [...]}
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class NewestFirstCursorPagination(CursorPagination):
+    """최신순 목록 (리뷰, 내 리뷰, 내 댓글)"""
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class OldestFirstCursorPagination(CursorPagination):
+    """작성순 목록 (리뷰의 댓글)"""
+    ordering = ('created_at', 'id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class PopularityCursorPagination(CursorPagination):
+    """인기순 영화 목록 (기존 limit 파라미터 유지)"""
+    ordering = ('-popularity', 'id')
+    page_size = 20
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+
+class RatingCursorPagination(PopularityCursorPagination):
+    """평점순 영화 목록"""
+    ordering = ('-vote_average', 'id')
+
+
+class ReleaseDateCursorPagination(PopularityCursorPagination):
+    """최신 개봉순 영화 목록 (개봉일이 없는 영화는 호출하는 쪽에서 제외)"""
+    ordering = ('-release_date', 'id')
+
+
+def paginate(request, queryset, pagination_class, serialize):
+    """
+    함수형 뷰에서 커서 페이지네이션 적용
+
+    serialize: 현재 페이지 객체 리스트를 받아 직렬화된 데이터를 반환하는 함수
+    """
+    paginator = pagination_class()
+    page = paginator.paginate_queryset(queryset, request)
+    return paginator.get_paginated_response(serialize(page))
@@ -0,0 +1,45 @@
+"""
+공유 응답 캐시
+
+사용자와 무관한 직렬화 결과만 Django 캐시에 저장한다.
+키에 버전 번호(cache_versions)를 넣어 두었으므로 쓰기가 일어나면 해당 영화/리뷰의
+항목만 새 키로 바뀌고, 이전 항목은 TIMEOUT 이 지나면 밀려난다.
+로그인 사용자별 값(is_liked 등)은 캐시에 넣지 않고 뷰에서 덧씌운다.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .metrics import record_cache
+
+
+def response_cache_key(scope, key, version, request=None, language=None):
+    """resp:<scope>:<key>:<version>[:<language>][:<쿼리스트링 해시>]"""
+    parts = ["resp", scope, str(key), str(version)]
+    if language:
+        parts.append(language)
+    if request is not None and request.GET:
+        # 커서/limit 등 쿼리 파라미터 순서와 무관하게 같은 키
+        query = "&".join(f"{k}={v}" for k, values in sorted(request.GET.lists()) for v in values)
+        parts.append(hashlib.md5(query.encode("utf-8")).hexdigest())
+    return ":".join(parts)
+
+
+def get_or_build(key, build, shared=None):
+    """
+    캐시된 데이터를 반환하고, 없으면 build() 결과를 캐시에 저장
+
+    shared: build() 결과에서 사용자별 값을 걷어낸 공유용 데이터를 만드는 함수
+    반환값: (데이터, 캐시 적중 여부)
+    """
+    data = cache.get(key)
+    scope = key.split(":", 2)[1]
+    if data is not None:
+        record_cache("response", scope, "hit")
+        return data, True
+
+    record_cache("response", scope, "miss")
+    data = build()
+    cache.set(key, shared(data) if shared else data, settings.RESPONSE_CACHE_TIMEOUT)
+    return data, False
@@ -26,6 +26,25 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 DEBUG = os.getenv("DEBUG") == "True"
 TMDB_API_KEY = os.getenv("TMDB_API_KEY")
 
+# TMDB 클라이언트 설정 (movies/tmdb.py)
+TMDB_BASE_URL = os.getenv("TMDB_BASE_URL", "https://api.themoviedb.org/3")
+TMDB_TIMEOUT = float(os.getenv("TMDB_TIMEOUT", 5))
+TMDB_CONNECT_TIMEOUT = float(os.getenv("TMDB_CONNECT_TIMEOUT", 2))
+TMDB_POOL_SIZE = int(os.getenv("TMDB_POOL_SIZE", 20))
+TMDB_CACHE_MAXSIZE = int(os.getenv("TMDB_CACHE_MAXSIZE", 2048))
+TMDB_MAX_WORKERS = int(os.getenv("TMDB_MAX_WORKERS", 8))
+TMDB_BATCH_DEADLINE = float(os.getenv("TMDB_BATCH_DEADLINE", 3))
+
+# TMDB 서킷 브레이커 / stale-if-error (movies/tmdb.py)
+TMDB_BREAKER_FAILURE_RATE = float(os.getenv("TMDB_BREAKER_FAILURE_RATE", 0.5))
+TMDB_BREAKER_MIN_CALLS = int(os.getenv("TMDB_BREAKER_MIN_CALLS", 10))
+TMDB_BREAKER_SLOW_CALL = float(os.getenv("TMDB_BREAKER_SLOW_CALL", 2))
+TMDB_BREAKER_OPEN_SECONDS = float(os.getenv("TMDB_BREAKER_OPEN_SECONDS", 30))
+TMDB_STALE_TTL = int(os.getenv("TMDB_STALE_TTL", 24 * 60 * 60))
+
+# 감정별 추천 미리 계산 (movies/recommendations.py)
+RECOMMENDATION_LIMIT = int(os.getenv("RECOMMENDATION_LIMIT", 100))
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/6.0/howto/deployment/checklist/
@@ -54,6 +73,9 @@ INSTALLED_APPS = [
     "movies",
     "accounts",
     "community",
+
+    # 부하 테스트 (python manage.py benchmark)
+    "benchmarks",
 ]
 
 # Django REST Framework 설정
@@ -78,6 +100,9 @@ SIMPLE_JWT = {
 }
 
 MIDDLEWARE = [
+    # 요청별 지연 시간 / DB / TMDB / 캐시 지표 (가장 바깥에서 측정)
+    'final_project.metrics.RequestMetricsMiddleware',
+
     #CORS 설정 (vue연동 용도)
     'corsheaders.middleware.CorsMiddleware',
 
@@ -119,10 +144,56 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            # 동시 쓰기 시 바로 실패하지 않고 잠금 해제를 기다림
+            "timeout": 20,
+            # 트랜잭션 시작 시 쓰기 잠금을 잡음 (읽기 → 쓰기 승격 중 충돌하면 대기 없이 바로
+            # "database is locked" 가 나므로, 동시 리뷰 작성/수정에서 500 이 나던 문제)
+            "transaction_mode": "IMMEDIATE",
+        },
     }
 }
 
 
+# Cache
+# CACHE_BACKEND: file(기본) / redis / locmem
+# 캐시 버전 카운터(final_project/cache_versions.py)와 응답 캐시는 모든 프로세스가 공유해야 한다.
+# (관리 명령의 무효화가 웹 워커에 닿고, 워커마다 다른 ETag 를 내지 않도록)
+# - file: 같은 서버의 프로세스끼리 공유
+# - redis: 여러 서버가 공유 + 워커 사이 잠금(final_project/singleflight.py cache_lock)이 원자적
+#   DB에 없는 영화를 여러 워커가 동시에 요청할 때 TMDB 호출을 하나로 합치려면 redis 필요
+#   (file 캐시는 add 가 원자적이지 않아 잠금을 쓰지 않고, 프로세스 안에서만 합침)
+# - locmem: 프로세스별 캐시라 DEBUG 에서만 허용 (final_project/checks.py)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "file")
+
+if CACHE_BACKEND == "redis":
+    # Django 내장 RedisCache (redis 패키지 필요, Redis 호환 서버면 사용 가능)
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("CACHE_LOCATION", "redis://127.0.0.1:6379/1"),
+        }
+    }
+elif CACHE_BACKEND == "locmem":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": 5000},
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.getenv("CACHE_LOCATION", str(BASE_DIR / ".django_cache")),
+            "OPTIONS": {"MAX_ENTRIES": 20000},
+        }
+    }
+
+# 응답 캐시 항목 유지 시간 (초) - 무효화는 버전 키로 하므로 메모리 회수용
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", 60 * 60))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -154,6 +225,35 @@ USE_TZ = True
 STATIC_URL = "static/"
 
 
+# 로깅 (key=value 형식 한 줄 로그, LOG_LEVEL 로 앱 로그 수준 조정)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "kv": {
+            "format": "%(asctime)s level=%(levelname)s logger=%(name)s %(message)s",
+        },
+    },
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": "kv",
+        },
+    },
+    "loggers": {
+        name: {"handlers": ["console"], "level": LOG_LEVEL, "propagate": False}
+        for name in ("final_project", "accounts", "movies", "community")
+    },
+}
+
+# 이 시간(초) 이상 걸린 요청은 WARNING 로그 (final_project/metrics.py)
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", 1))
+# /metrics 접근 토큰 (비워 두면 인증 없이 공개)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+
 AUTH_USER_MODEL = 'accounts.User'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
@@ -0,0 +1,87 @@
+"""
+같은 키에 대한 동시 작업을 하나로 합치기 (single-flight)
+
+- 프로세스 안: SingleFlight.do() 로 같은 키의 첫 호출만 실행하고, 나머지 스레드는 그 결과를 기다림
+- 프로세스 사이: cache_lock() 으로 공유 캐시에 잠금 키를 두고 한 워커만 작업
+  cache.add 가 원자적인 백엔드(redis 등)에서만 잠금을 잡는다. file 캐시의 add 는
+  확인 후 쓰기라 두 워커가 동시에 성공할 수 있으므로 잠금 없이 진행한다 (settings.CACHE_BACKEND 참고).
+"""
+import threading
+import uuid
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+# cache.add 가 "없을 때만 쓰기"를 원자적으로 하는 백엔드
+# (locmem 은 한 프로세스 안에서만 원자적이지만 DEBUG 단일 프로세스 전용이라 포함)
+ATOMIC_ADD_CACHES = {
+    "django.core.cache.backends.redis.RedisCache",
+    "django.core.cache.backends.memcached.PyMemcacheCache",
+    "django.core.cache.backends.memcached.PyLibMCCache",
+    "django.core.cache.backends.db.DatabaseCache",
+    "django.core.cache.backends.locmem.LocMemCache",
+}
+
+
+def supports_cache_lock():
+    """현재 캐시 백엔드로 워커 사이 잠금을 잡을 수 있는지"""
+    return settings.CACHES["default"]["BACKEND"] in ATOMIC_ADD_CACHES
+
+
+class SingleFlight:
+    """키별 진행 중인 호출을 공유"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, timeout=None):
+        """
+        같은 key 로 진행 중인 호출이 있으면 그 결과(또는 예외)를 기다려 반환하고,
+        없으면 fn() 을 직접 실행한다. 기다리다 timeout 이 지나면 TimeoutError.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result(timeout=timeout)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+@contextmanager
+def cache_lock(key, timeout):
+    """
+    공유 캐시 기반 잠금 (cache.add 는 키가 없을 때만 성공)
+
+    with cache_lock(key, 10) as acquired: 형태로 쓰고, acquired 가 False 면 다른 워커가 작업 중.
+    작업이 timeout 초보다 오래 걸리거나 프로세스가 죽어도 잠금은 자동으로 풀린다.
+    원자적인 add 가 없는 백엔드(file)에서는 항상 acquired=True (워커 사이 중복 제거 없음)
+    """
+    if not supports_cache_lock():
+        yield True
+        return
+
+    token = uuid.uuid4().hex
+    acquired = cache.add(key, token, timeout)
+    try:
+        yield acquired
+    finally:
+        # 만료 후 다른 워커가 다시 잡은 잠금은 지우지 않음
+        if acquired and cache.get(key) == token:
+            cache.delete(key)
@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class MoviesConfig(AppConfig):
     name = "movies"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        # 공유 캐시 설정 검사 (final_project/checks.py)
+        from final_project import checks  # noqa: F401
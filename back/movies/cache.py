@@ -0,0 +1,27 @@
+"""
+영화 응답 캐시 무효화
+
+- ('movie', tmdb_id): 영화 상세 응답
+- ('movies', 'catalog'): 인기 목록 등 카탈로그 전체 목록 응답 + 모든 사용자의 홈 피드
+  fetch_movies 같은 일괄 갱신 때만 올린다. 영화 한 편 저장(상세 미스 저장, admin 수정)마다 올리면
+  모든 목록/홈 피드 캐시가 버려지므로, 그런 변경은 다음 일괄 갱신이나 RESPONSE_CACHE_TIMEOUT 뒤에 반영된다.
+- ('movies', 'similar'): 비슷한 영화 응답 (build_similar_movies 실행 시)
+- ('movies', 'for-you'): 개인 추천 응답 (train_recommendations 실행 시)
+"""
+from final_project.cache_versions import bump_version, bump_version_on_commit
+
+CATALOG_SCOPE = ('movies', 'catalog')
+SIMILAR_SCOPE = ('movies', 'similar')
+FOR_YOU_SCOPE = ('movies', 'for-you')
+
+
+def invalidate_movies(tmdb_ids):
+    """바뀐 영화의 상세 캐시와 카탈로그 목록 캐시 무효화"""
+    for tmdb_id in tmdb_ids:
+        bump_version('movie', tmdb_id)
+    bump_version(*CATALOG_SCOPE)
+
+
+def invalidate_movie_on_commit(tmdb_id):
+    """영화 한 편의 상세 캐시만 무효화 (커밋 후)"""
+    bump_version_on_commit('movie', tmdb_id)
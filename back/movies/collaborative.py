@@ -0,0 +1,135 @@
+"""
+협업 필터링 추천 (train_recommendations 명령에서 사용)
+
+사용자 × 영화 암묵적 선호 행렬 (scipy.sparse)
+- 찜: 1.0
+- 리뷰 작성: 0.2 ~ 1.0 (평점 2.5 이하는 0.2, 5점은 1.0)
+- 다른 사람 리뷰에 좋아요: 0.3 (그 영화에 관심이 있다는 신호)
+
+영화-영화 코사인 유사도를 영화별 상위 k 개만 남긴 희소 행렬로 만들고,
+사용자 배치마다 (배치 × 영화) 점수를 행렬곱 한 번으로 계산해 상위 N 개를 뽑는다.
+"""
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+from accounts.models import FavoriteMovie
+from community.models import Review
+
+FAVORITE_WEIGHT = 1.0
+REVIEW_BASE_WEIGHT = 0.2
+REVIEW_RATING_WEIGHT = 0.8
+LIKE_WEIGHT = 0.3
+
+CHUNK_SIZE = 10000
+
+
+def _review_weight(rating):
+    return REVIEW_BASE_WEIGHT + REVIEW_RATING_WEIGHT * min(max((rating - 2.5) / 2.5, 0.0), 1.0)
+
+
+def load_interactions():
+    """(user_id 배열, tmdb movie_id 배열, 가중치 배열) - 같은 쌍은 행렬을 만들 때 합산됨"""
+    users, movies, weights = [], [], []
+
+    for user_id, movie_id in FavoriteMovie.objects.values_list('user_id', 'movie_id').iterator(chunk_size=CHUNK_SIZE):
+        users.append(user_id)
+        movies.append(movie_id)
+        weights.append(FAVORITE_WEIGHT)
+
+    for user_id, movie_id, rating in Review.objects.values_list('user_id', 'movie_id', 'rating').iterator(chunk_size=CHUNK_SIZE):
+        users.append(user_id)
+        movies.append(movie_id)
+        weights.append(_review_weight(rating))
+
+    likes = Review.likes.through.objects.values_list('user_id', 'review__movie_id')
+    for user_id, movie_id in likes.iterator(chunk_size=CHUNK_SIZE):
+        users.append(user_id)
+        movies.append(movie_id)
+        weights.append(LIKE_WEIGHT)
+
+    return (
+        np.asarray(users, dtype=np.int64),
+        np.asarray(movies, dtype=np.int64),
+        np.asarray(weights, dtype=np.float32),
+    )
+
+
+def build_matrix(users, movies, weights):
+    """
+    사용자 × 영화 CSR 행렬
+
+    반환값: (행렬, 행 → user_id 배열, 열 → tmdb movie_id 배열)
+    """
+    user_ids, rows = np.unique(users, return_inverse=True)
+    movie_ids, cols = np.unique(movies, return_inverse=True)
+    matrix = sparse.coo_matrix(
+        (weights, (rows, cols)), shape=(len(user_ids), len(movie_ids)), dtype=np.float32
+    ).tocsr()
+    matrix.sum_duplicates()
+    return matrix, user_ids, movie_ids
+
+
+def _keep_top_k_per_row(block, k):
+    """CSR 각 행에서 값이 큰 k 개만 남김"""
+    for row in range(block.shape[0]):
+        start, stop = block.indptr[row], block.indptr[row + 1]
+        if stop - start > k:
+            data = block.data[start:stop]
+            data[np.argpartition(data, stop - start - k)[:stop - start - k]] = 0
+    block.eliminate_zeros()
+    return block
+
+
+def item_similarity(matrix, neighbors=50, block_size=1000):
+    """
+    영화 × 영화 코사인 유사도 (영화별 상위 neighbors 개만 남긴 희소 행렬)
+
+    block_size 개 영화씩 유사도를 계산하고 바로 가지치기하므로
+    전체 영화² 행렬을 한 번에 만들지 않는다.
+    """
+    columns = normalize(matrix, axis=0).tocsc()
+    transposed = columns.T.tocsr()
+    n_items = matrix.shape[1]
+
+    blocks = []
+    for start in range(0, n_items, block_size):
+        stop = min(start + block_size, n_items)
+        block = (transposed[start:stop] @ columns).tocoo()
+        # 자기 자신 제외
+        keep = block.row + start != block.col
+        block = sparse.csr_matrix(
+            (block.data[keep], (block.row[keep], block.col[keep])), shape=block.shape
+        )
+        blocks.append(_keep_top_k_per_row(block, neighbors))
+    return sparse.vstack(blocks, format='csr', dtype=np.float32)
+
+
+def recommend_batches(matrix, similarity, top_n, batch_size=1000, eligible=None):
+    """
+    사용자 배치별 상위 top_n 추천
+
+    eligible: 추천 가능한 영화(열) bool 마스크 (예: Movie 테이블에 있는 영화)
+    yield: (행 번호 배열, 열 번호 [b, top_n], 점수 [b, top_n]) - 점수 0 이하는 추천 아님
+    """
+    n_users, n_items = matrix.shape
+    top_n = min(top_n, n_items)
+    for start in range(0, n_users, batch_size):
+        stop = min(start + batch_size, n_users)
+        seen = matrix[start:stop]
+        scores = (seen @ similarity).toarray()
+
+        # 이미 본 영화와 추천할 수 없는 영화 제외
+        rows, cols = seen.nonzero()
+        scores[rows, cols] = 0
+        if eligible is not None:
+            scores[:, ~eligible] = 0
+
+        top = np.argpartition(-scores, top_n - 1, axis=1)[:, :top_n]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        yield (
+            np.arange(start, stop),
+            np.take_along_axis(top, order, axis=1),
+            np.take_along_axis(top_scores, order, axis=1),
+        )
@@ -0,0 +1,65 @@
+"""
+Movie.genres (TMDB JSON) → Genre / MovieGenre 정규화 테이블 동기화
+
+fetch_movies 의 bulk upsert 뒤, 그리고 영화를 개별 저장할 때(시그널) 호출된다.
+"""
+from django.db import transaction
+
+from .models import Genre, Movie, MovieGenre
+
+
+def parse_genres(genres):
+    """TMDB [{id, name}] (또는 id 리스트) → {장르 ID: 이름}"""
+    parsed = {}
+    for genre in genres or []:
+        if isinstance(genre, dict):
+            if genre.get('id') is not None:
+                parsed[genre['id']] = genre.get('name', '')
+        else:
+            parsed[genre] = ''
+    return parsed
+
+
+def sync_movie_genres(genres_by_movie):
+    """
+    영화별 장르 연결을 genres JSON 과 같게 맞춤
+
+    genres_by_movie: {Movie.pk: TMDB genres JSON}
+    """
+    if not genres_by_movie:
+        return
+
+    parsed = {movie_id: parse_genres(genres) for movie_id, genres in genres_by_movie.items()}
+    names = {}
+    for movie_genres in parsed.values():
+        for genre_id, name in movie_genres.items():
+            if name or genre_id not in names:
+                names[genre_id] = name
+
+    with transaction.atomic():
+        # 이름이 비어 있는 항목(id 리스트)으로 기존 이름을 덮어쓰지 않도록 이름 있는 것만 갱신
+        Genre.objects.bulk_create(
+            [Genre(id=genre_id, name=name) for genre_id, name in names.items() if name],
+            update_conflicts=True, unique_fields=['id'], update_fields=['name'],
+        )
+        Genre.objects.bulk_create(
+            [Genre(id=genre_id, name='') for genre_id, name in names.items() if not name],
+            ignore_conflicts=True,
+        )
+        MovieGenre.objects.filter(movie_id__in=parsed.keys()).delete()
+        MovieGenre.objects.bulk_create(
+            [
+                MovieGenre(movie_id=movie_id, genre_id=genre_id)
+                for movie_id, movie_genres in parsed.items()
+                for genre_id in movie_genres
+            ],
+            batch_size=500,
+        )
+
+
+def sync_genres_for_tmdb_ids(tmdb_ids):
+    """tmdb_id 목록의 영화 장르 연결 동기화 (bulk upsert 뒤 호출)"""
+    tmdb_ids = list(tmdb_ids)
+    for start in range(0, len(tmdb_ids), 500):
+        rows = Movie.objects.filter(tmdb_id__in=tmdb_ids[start:start + 500]).values_list('id', 'genres')
+        sync_movie_genres(dict(rows))
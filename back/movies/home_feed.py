@@ -0,0 +1,127 @@
+"""
+프로필 취향 기반 홈 피드
+
+User.favorite_genres / preferred_countries 로 로컬 Movie 테이블에서 후보를 골라 점수순으로 정렬한다.
+후보는 선호 장르별 / 선호 원어 영화를 SQL 로 걸러 각각 인기순 상위를 뽑고, 전체 인기순 상위와 합친다.
+계산 결과는 사용자별로 캐시하고, 키에 (사용자 버전, 카탈로그 버전)을 넣어서
+프로필의 취향 필드가 바뀌거나, 찜/리뷰로 제외할 영화가 바뀌거나,
+fetch_movies 로 카탈로그가 갱신될 때만 다시 계산한다.
+favorite_actors 는 Movie 에 출연진 정보가 없어 아직 사용하지 않는다.
+"""
+import math
+
+from final_project.cache_versions import get_version, bump_version_on_commit
+from final_project.response_cache import response_cache_key, get_or_build
+from accounts.models import FavoriteMovie
+from community.models import Review
+from .cache import CATALOG_SCOPE
+from .models import Movie
+from .serializers import MovieListSerializer
+from .recommendations import genre_ids as movie_genre_ids
+
+# 프로필 장르 이름 → TMDB 장르 ID (UserProfileUpdateSerializer 허용 목록과 같음)
+GENRE_IDS = {
+    '액션': 28,
+    '코미디': 35,
+    '드라마': 18,
+    '스릴러': 53,
+    '공포': 27,
+    'SF': 878,
+    '판타지': 14,
+    '로맨스': 10749,
+    '애니메이션': 16,
+    '다큐멘터리': 99,
+}
+
+# 프로필 국가 이름 → 원어 (Movie.original_language)
+COUNTRY_LANGUAGES = {
+    '한국': 'ko',
+    '미국': 'en',
+    '일본': 'ja',
+    '중국': 'zh',
+    '프랑스': 'fr',
+    '영국': 'en',
+}
+
+# 피드 계산에 영향을 주는 프로필 필드 (이 필드가 바뀔 때만 캐시 무효화)
+PREFERENCE_FIELDS = ('favorite_genres', 'preferred_countries', 'favorite_actors')
+
+# 사용자별 캐시 버전 scope (키는 user.id)
+VERSION_SCOPE = 'home'
+
+FEED_SIZE = 20
+# 너무 알려지지 않은 영화 제외
+MIN_VOTE_COUNT = 20
+# 점수 계산 후보 수: 선호 장르별 / 선호 원어 인기순 상위 + 전체 인기순 상위
+# (전체 인기순 상위에서만 고르면 다큐멘터리 같은 장르 팬은 상위권 밖 영화를 영영 못 봄)
+PREFERENCE_CANDIDATES = 500
+POPULAR_CANDIDATES = 500
+
+GENRE_WEIGHT = 0.5
+LANGUAGE_WEIGHT = 0.2
+RATING_WEIGHT = 0.2
+POPULARITY_WEIGHT = 0.1
+
+
+def _preferences(user):
+    genre_ids = {GENRE_IDS[name] for name in user.favorite_genres or [] if name in GENRE_IDS}
+    languages = {COUNTRY_LANGUAGES[name] for name in user.preferred_countries or [] if name in COUNTRY_LANGUAGES}
+    return genre_ids, languages
+
+
+def compute_home_feed(user, size=FEED_SIZE):
+    """
+    취향 점수순 영화 목록 (이미 찜했거나 리뷰를 쓴 영화 제외)
+
+    반환값: {"source": "profile" | "popular", "results": MovieListSerializer 데이터}
+    취향을 하나도 설정하지 않은 사용자는 인기순 (source: popular)
+    """
+    genre_ids, languages = _preferences(user)
+    seen = set(FavoriteMovie.objects.filter(user=user).values_list('movie_id', flat=True))
+    seen.update(Review.objects.filter(user=user).values_list('movie_id', flat=True))
+
+    movies = (
+        Movie.objects.filter(vote_count__gte=MIN_VOTE_COUNT).exclude(tmdb_id__in=seen)
+        .only('id', 'tmdb_id', 'title', 'poster_path', 'release_date', 'vote_average', 'popularity', 'genres', 'original_language')
+        .order_by('-popularity', 'id')
+    )
+    # 취향별로 SQL 에서 걸러 인기순 상위를 따로 뽑아 합침 (장르는 MovieGenre 인덱스 사용)
+    pools = [movies.filter(genre_links__genre_id=genre_id)[:PREFERENCE_CANDIDATES] for genre_id in sorted(genre_ids)]
+    if languages:
+        pools.append(movies.filter(original_language__in=languages)[:PREFERENCE_CANDIDATES])
+    pools.append(movies[:POPULAR_CANDIDATES])
+    candidates = sorted(
+        {movie.id: movie for pool in pools for movie in pool}.values(),
+        key=lambda movie: (-movie.popularity, movie.id),
+    )
+    source = 'profile' if genre_ids or languages else 'popular'
+    if not candidates:
+        return {'source': source, 'results': []}
+
+    max_popularity = math.log1p(max(movie.popularity for movie in candidates)) or 1.0
+
+    def score(movie):
+        genre_score = len(movie_genre_ids(movie) & genre_ids) / len(genre_ids) if genre_ids else 0
+        language_score = 1.0 if movie.original_language in languages else 0
+        return (
+            GENRE_WEIGHT * genre_score
+            + LANGUAGE_WEIGHT * language_score
+            + RATING_WEIGHT * movie.vote_average / 10
+            + POPULARITY_WEIGHT * math.log1p(movie.popularity) / max_popularity
+        )
+
+    ranked = sorted(candidates, key=score, reverse=True)[:size]
+    return {'source': source, 'results': MovieListSerializer(ranked, many=True).data}
+
+
+def get_home_feed(user):
+    """캐시된 홈 피드 (취향/카탈로그 버전이 바뀌었을 때만 다시 계산)"""
+    version = f"{get_version(VERSION_SCOPE, user.id)}.{get_version(*CATALOG_SCOPE)}"
+    key = response_cache_key(VERSION_SCOPE, user.id, version)
+    feed, _ = get_or_build(key, lambda: compute_home_feed(user))
+    return feed
+
+
+def invalidate_home_feed(user_id):
+    """취향 또는 찜/리뷰 목록이 바뀐 사용자의 피드 캐시 무효화 (커밋 후)"""
+    bump_version_on_commit(VERSION_SCOPE, user_id)
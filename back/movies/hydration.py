@@ -0,0 +1,75 @@
+"""
+DB에 없는 영화를 TMDB에서 가져와 저장 (movie_detail_db 의 미스 처리)
+
+같은 영화를 동시에 요청해도 TMDB 호출은 한 번만 일어나도록
+프로세스 안에서는 SingleFlight, 워커 프로세스 사이에서는 캐시 잠금으로 합친다.
+(캐시 잠금은 redis 처럼 add 가 원자적인 캐시에서만 동작, file 캐시면 워커마다 한 번씩 호출)
+잠금을 못 잡은 워커는 잠금을 가진 워커가 저장할 때까지 DB를 잠시 확인하고,
+그래도 없으면 직접 가져온다.
+"""
+import time
+
+from django.conf import settings
+
+from final_project.singleflight import SingleFlight, cache_lock
+from .models import Movie
+from .tmdb import get_client, movie_fields, payload_hash
+
+# 잠금 유지 시간 상한 (TMDB 조회 + 저장이 이보다 오래 걸리면 잠금이 풀림)
+LOCK_TIMEOUT = 30
+# 다른 워커가 저장하기를 기다리는 최대 시간 / 확인 간격 (초)
+POLL_INTERVAL = 0.05
+
+_flight = SingleFlight()
+
+
+def _lock_key(tmdb_id):
+    return f"lock:movie-hydrate:{tmdb_id}"
+
+
+def _find(tmdb_id):
+    return Movie.objects.filter(tmdb_id=tmdb_id).first()
+
+
+def _wait_for_movie(tmdb_id, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        movie = _find(tmdb_id)
+        if movie is not None:
+            return movie
+    return None
+
+
+def save_movie(tmdb_id, detail):
+    """TMDB 상세 응답을 fetch_movies 와 같은 필드 매핑으로 저장"""
+    fields = movie_fields(detail)
+    movie, _ = Movie.objects.update_or_create(
+        tmdb_id=tmdb_id,
+        defaults={**fields, 'payload_hash': payload_hash(fields)},
+    )
+    return movie
+
+
+def _fetch_and_save(tmdb_id):
+    with cache_lock(_lock_key(tmdb_id), LOCK_TIMEOUT) as acquired:
+        if not acquired:
+            # 다른 워커가 가져오는 중 → 저장될 때까지 대기
+            movie = _wait_for_movie(tmdb_id, settings.TMDB_TIMEOUT)
+            if movie is not None:
+                return movie
+
+        # 잠금을 잡기 직전에 다른 워커가 저장을 끝냈을 수 있음
+        movie = _find(tmdb_id)
+        if movie is not None:
+            return movie
+        return save_movie(tmdb_id, get_client().get(f"/movie/{tmdb_id}", use_cache=False))
+
+
+def hydrate_movie(tmdb_id):
+    """
+    DB에 없는 영화를 TMDB에서 가져와 저장 후 반환
+
+    TMDB 실패 시 requests.exceptions.RequestException 을 그대로 올린다.
+    """
+    return _flight.do(tmdb_id, lambda: _fetch_and_save(tmdb_id))
@@ -0,0 +1,73 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from final_project.cache_versions import bump_version
+from movies.cache import SIMILAR_SCOPE
+from movies.models import Movie, MovieNeighbor
+from movies.similarity import build_feature_matrix, top_k_neighbors
+
+
+class Command(BaseCommand):
+    help = '영화별 콘텐츠 기반 비슷한 영화 top-k 를 계산해 MovieNeighbor 테이블에 저장'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--k',
+            type=int,
+            default=20,
+            help='영화별 저장할 이웃 수 (기본 20)'
+        )
+        parser.add_argument(
+            '--block-size',
+            type=int,
+            default=256,
+            help='한 번에 유사도를 계산할 행 수 (메모리 ≈ block-size × 영화 수 × 4바이트, 기본 256)'
+        )
+        parser.add_argument(
+            '--min-score',
+            type=float,
+            default=0.05,
+            help='이 값 미만의 유사도는 저장하지 않음 (기본 0.05)'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        movies = list(
+            Movie.objects.order_by('id').values(
+                'id', 'overview', 'genres', 'original_language', 'release_date'
+            )
+        )
+        self.stdout.write(self.style.SUCCESS(f"\n🎬 영화 {len(movies)}편 특징 벡터 생성..."))
+        if not movies:
+            return
+
+        features = build_feature_matrix(movies)
+        self.stdout.write(f"📐 특징 행렬 {features.shape[0]} x {features.shape[1]}")
+
+        indices, scores = top_k_neighbors(features, options['k'], options['block_size'])
+        computed = time.perf_counter()
+        self.stdout.write(f"🧮 top-{indices.shape[1]} 이웃 계산 {computed - started:.1f}초")
+
+        movie_ids = [movie['id'] for movie in movies]
+        rows = []
+        for row, movie_id in enumerate(movie_ids):
+            rank = 0
+            for column, score in zip(indices[row], scores[row]):
+                if column < 0 or score < options['min_score']:
+                    break
+                rank += 1
+                rows.append(MovieNeighbor(
+                    movie_id=movie_id, neighbor_id=movie_ids[column], rank=rank, score=float(score)
+                ))
+
+        # 읽는 쪽이 반쯤 바뀐 목록을 보지 않도록 한 트랜잭션에서 교체
+        with transaction.atomic():
+            MovieNeighbor.objects.all().delete()
+            MovieNeighbor.objects.bulk_create(rows, batch_size=2000)
+        bump_version(*SIMILAR_SCOPE)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ 이웃 {len(rows)}건 저장 (총 {time.perf_counter() - started:.1f}초)\n"
+        ))
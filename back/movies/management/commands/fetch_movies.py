@@ -1,9 +1,28 @@
-from django.core.management.base import BaseCommand
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 import requests
-from movies.models import Movie
-from datetime import datetime
-import time
+from movies.cache import invalidate_movies
+from movies.genres import sync_genres_for_tmdb_ids
+from movies.models import Movie, SyncState
+from movies.tmdb import TMDBClient, RateLimiter, movie_fields, payload_hash, parse_date
+
+# bulk_create(update_conflicts=True) 시 갱신할 필드
+UPDATE_FIELDS = [
+    'title', 'original_title', 'overview', 'poster_path', 'backdrop_path',
+    'release_date', 'runtime', 'vote_average', 'vote_count', 'popularity',
+    'genres', 'original_language', 'payload_hash', 'search_bigrams', 'updated_at',
+]
+
+# TMDB /movie/changes 는 한 번에 최대 14일 구간까지 조회 가능
+CHANGES_WINDOW_DAYS = 14
+CHANGES_SYNC_NAME = 'tmdb_movie_changes'
 
 class Command(BaseCommand):
     help = 'TMDB API에서 인기 영화를 가져와 DB에 저장'
@@ -15,99 +34,151 @@ class Command(BaseCommand):
             default=3,
             help='가져올 페이지 수 (1페이지=20편, 기본 3페이지=60편)'
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='동시에 처리할 페이지 수 (기본 4)'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=40,
+            help='초당 최대 TMDB 요청 수 (토큰 버킷, 기본 40)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='한 번에 DB에 쓸 영화 수 (기본 200)'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='체크포인트 파일에 기록된 완료 페이지는 건너뛰고 이어서 진행 (같은 날, 같은 --pages 실행만)'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default=str(settings.BASE_DIR / '.fetch_movies_checkpoint.json'),
+            help='체크포인트 파일 경로'
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='TMDB 변경 피드(/movie/changes)로 DB에 있는 영화 중 바뀐 것만 갱신'
+        )
+        parser.add_argument(
+            '--since',
+            help='증분 동기화 시작 날짜 (YYYY-MM-DD, 지정하면 --incremental 로 동작, 기본: 마지막 동기화 시각)'
+        )
 
     def handle(self, *args, **options):
+        if options['rate'] <= 0:
+            raise CommandError("--rate 는 0보다 커야 합니다.")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size 는 1 이상이어야 합니다.")
+
         pages = options['pages']
-        total_saved = 0
-        total_updated = 0
-        
-        TMDB_URL = "https://api.themoviedb.org/3"
-        API_KEY = settings.TMDB_API_KEY
-        
+        workers = max(1, options['workers'])
+        batch_size = options['batch_size']
+        self.checkpoint_path = options['checkpoint']
+        self.total_saved = 0
+        self.total_updated = 0
+        self.total_unchanged = 0
+
+        self.client = TMDBClient(
+            base_url=settings.TMDB_BASE_URL,
+            api_key=settings.TMDB_API_KEY,
+            timeout=10,
+            pool_size=workers,
+            rate_limiter=RateLimiter(options['rate']),
+        )
+
+        if options['incremental'] or options['since']:
+            self.handle_incremental(options['since'], workers, batch_size)
+            return
+
+        # 인기 목록은 날마다 바뀌므로 체크포인트는 (페이지 수, 날짜)가 같은 실행에서만 이어 씀
+        self.checkpoint_run = {'pages': pages, 'date': timezone.localdate().isoformat()}
+        done_pages = self.load_checkpoint() if options['resume'] else set()
+        todo_pages = [page for page in range(1, pages + 1) if page not in done_pages]
+
         self.stdout.write(self.style.SUCCESS(f"\n🎬 TMDB에서 영화 데이터 가져오기 시작...\n"))
-        
-        for page in range(1, pages + 1):
-            self.stdout.write(f"📄 페이지 {page}/{pages} 처리 중...")
-            
-            url = f"{TMDB_URL}/movie/popular"
-            params = {
-                "api_key": API_KEY,
-                "language": "ko-KR",
-                "page": page,
-                "region": "KR"
-            }
-            
-            try:
-                response = requests.get(url, params=params, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                
-                for movie_data in data.get('results', []):
-                    tmdb_id = movie_data['id']
-                    
-                    # 영화 상세 정보 가져오기
-                    detail_url = f"{TMDB_URL}/movie/{tmdb_id}"
-                    detail_params = {
-                        "api_key": API_KEY,
-                        "language": "ko-KR"
-                    }
-                    
-                    try:
-                        detail_response = requests.get(detail_url, params=detail_params, timeout=10)
-                        
-                        if detail_response.status_code == 200:
-                            detail_data = detail_response.json()
-                            
-                            # DB에 저장/업데이트
-                            movie, created = Movie.objects.update_or_create(
-                                tmdb_id=tmdb_id,
-                                defaults={
-                                    'title': movie_data.get('title', ''),
-                                    'original_title': movie_data.get('original_title', ''),
-                                    'overview': movie_data.get('overview', ''),
-                                    'poster_path': movie_data.get('poster_path', ''),
-                                    'backdrop_path': movie_data.get('backdrop_path', ''),
-                                    'release_date': self.parse_date(movie_data.get('release_date')),
-                                    'runtime': detail_data.get('runtime'),
-                                    'vote_average': movie_data.get('vote_average', 0),
-                                    'vote_count': movie_data.get('vote_count', 0),
-                                    'popularity': movie_data.get('popularity', 0),
-                                    'genres': detail_data.get('genres', []),
-                                    'original_language': movie_data.get('original_language', ''),
-                                }
+        if done_pages:
+            self.stdout.write(f"⏩ 체크포인트에서 이어서 진행 (완료 {len(done_pages)}페이지 건너뜀)")
+
+        pending_rows = {}
+        pending_pages = []
+        failed_pages = []
+        # 페이지별 남은 상세 조회 수 / 상세 조회에 실패한 영화 ID
+        remaining = {}
+        failed_ids = {}
+
+        def page_done(page):
+            # 상세 조회가 하나라도 실패한 페이지는 체크포인트에 넣지 않음 → --resume 때 다시 조회
+            if failed_ids[page]:
+                failed_pages.append(page)
+                self.stdout.write(self.style.ERROR(
+                    f"⚠️  페이지 {page}: 상세정보 {len(failed_ids[page])}편 실패 ({', '.join(map(str, failed_ids[page]))})"
+                ))
+            else:
+                pending_pages.append(page)
+                self.stdout.write(f"📄 페이지 {page}/{pages} 조회 완료")
+
+        # 페이지 목록과 영화 상세 조회를 모두 같은 풀에 넣어 --workers / --rate 로 동시 요청 수를 제한하고,
+        # DB 쓰기는 메인 스레드에서 배치로 처리
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # {future: (페이지, 상세 조회면 인기 목록의 영화 요약 / 목록 조회면 None)}
+            futures = {executor.submit(self.fetch_page, page): (page, None) for page in todo_pages}
+
+            while futures:
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    page, summary = futures.pop(future)
+
+                    if summary is None:
+                        try:
+                            results = future.result()
+                        except requests.exceptions.RequestException as e:
+                            failed_pages.append(page)
+                            self.stdout.write(
+                                self.style.ERROR(f"❌ 페이지 {page} 실패: {str(e)}")
                             )
-                            
-                            if created:
-                                total_saved += 1
-                                self.stdout.write(
-                                    self.style.SUCCESS(f"  ✅ {movie.title} - 새로 저장")
-                                )
-                            else:
-                                total_updated += 1
-                                self.stdout.write(
-                                    self.style.WARNING(f"  ⚠️  {movie.title} - 업데이트")
-                                )
-                            
-                            time.sleep(0.25)
-                        
+                            continue
+                        remaining[page] = len(results)
+                        failed_ids[page] = []
+                        for movie_data in results:
+                            futures[executor.submit(self.fetch_detail, movie_data['id'])] = (page, movie_data)
+                        if not results:
+                            page_done(page)
+                        continue
+
+                    tmdb_id = summary['id']
+                    try:
+                        pending_rows[tmdb_id] = movie_fields(future.result(), summary=summary)
                     except requests.exceptions.RequestException as e:
+                        failed_ids[page].append(tmdb_id)
                         self.stdout.write(
                             self.style.ERROR(f"  ❌ 영화 {tmdb_id} 상세정보 실패: {str(e)}")
                         )
-                        continue
-                
-            except requests.exceptions.RequestException as e:
-                self.stdout.write(
-                    self.style.ERROR(f"❌ 페이지 {page} 실패: {str(e)}")
-                )
-                continue
-        
-        self.stdout.write("\n" + "="*50)
-        self.stdout.write(self.style.SUCCESS(f"✅ 새로 저장: {total_saved}편"))
-        self.stdout.write(self.style.WARNING(f"⚠️  업데이트: {total_updated}편"))
-        self.stdout.write(self.style.SUCCESS(f"📊 DB 총 영화: {Movie.objects.count()}편"))
-        self.stdout.write("="*50 + "\n")
-        
+                    remaining[page] -= 1
+                    if remaining[page] == 0:
+                        page_done(page)
+
+                if len(pending_rows) >= batch_size:
+                    self.flush(pending_rows, pending_pages, done_pages)
+
+        self.flush(pending_rows, pending_pages, done_pages)
+        self.write_summary()
+
+        if failed_pages:
+            self.stdout.write(self.style.ERROR(
+                f"⚠️  실패한 페이지 {sorted(failed_pages)} → --resume 으로 다시 실행하면 이 페이지만 다시 조회"
+            ))
+        else:
+            # 모든 페이지를 마쳤으면 체크포인트 삭제 (다음 --resume 이 지난 실행의 페이지를 건너뛰지 않도록)
+            self.remove_checkpoint()
+
         if Movie.objects.count() >= 50:
             self.stdout.write(
                 self.style.SUCCESS(
@@ -115,11 +186,185 @@ class Command(BaseCommand):
                     "python manage.py dumpdata movies.Movie --indent 2 > fixtures/movies.json\n"
                 )
             )
-    
-    def parse_date(self, date_string):
-        if not date_string:
-            return None
+
+    def write_summary(self):
+        self.stdout.write("\n" + "="*50)
+        self.stdout.write(self.style.SUCCESS(f"✅ 새로 저장: {self.total_saved}편"))
+        self.stdout.write(self.style.WARNING(f"⚠️  업데이트: {self.total_updated}편"))
+        self.stdout.write(f"💤 변경 없음: {self.total_unchanged}편")
+        self.stdout.write(self.style.SUCCESS(f"📊 DB 총 영화: {Movie.objects.count()}편"))
+        self.stdout.write("="*50 + "\n")
+
+    def handle_incremental(self, since, workers, batch_size):
+        """
+        변경 피드에서 바뀐 영화 ID 를 받아 DB에 이미 있는 영화만 다시 가져오기
+
+        상세 조회가 하나라도 실패하면 동기화 시각(SyncState)을 옮기지 않는다.
+        다음 실행이 같은 시점부터 다시 훑으므로 실패한 영화도 다시 시도되고,
+        이미 반영된 영화는 내용 해시가 같아 DB 쓰기 없이 넘어간다.
+        """
+        started_at = timezone.now()
+
+        if since:
+            start = parse_date(since)
+            if start is None:
+                raise CommandError("--since 는 YYYY-MM-DD 형식이어야 합니다.")
+            since_at = timezone.make_aware(datetime.combine(start, time.min))
+        else:
+            state = SyncState.objects.filter(name=CHANGES_SYNC_NAME).first()
+            since_at = state.synced_at if state else started_at - timedelta(days=1)
+            start = since_at.date()
+
+        self.stdout.write(self.style.SUCCESS(f"\n🔄 {start} 이후 변경된 영화 동기화 시작...\n"))
+
+        try:
+            changed_ids = self.fetch_changed_ids(start, started_at.date())
+        except requests.exceptions.RequestException as e:
+            raise CommandError(f"변경 피드 조회 실패 (동기화 시각은 그대로 유지): {e}")
+
+        known_ids = set()
+        id_list = list(changed_ids)
+        for i in range(0, len(id_list), 500):
+            known_ids.update(
+                Movie.objects.filter(tmdb_id__in=id_list[i:i + 500]).values_list('tmdb_id', flat=True)
+            )
+        self.stdout.write(f"📋 변경된 영화 {len(changed_ids)}편 중 DB에 있는 영화 {len(known_ids)}편")
+
+        pending_rows = {}
+        failed_ids = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.client.get, f"/movie/{tmdb_id}", use_cache=False): tmdb_id
+                for tmdb_id in known_ids
+            }
+            for future in as_completed(futures):
+                tmdb_id = futures[future]
+                try:
+                    pending_rows[tmdb_id] = movie_fields(future.result())
+                except requests.exceptions.RequestException as e:
+                    failed_ids.append(tmdb_id)
+                    self.stdout.write(
+                        self.style.ERROR(f"  ❌ 영화 {tmdb_id} 상세정보 실패: {str(e)}")
+                    )
+                    continue
+                if len(pending_rows) >= batch_size:
+                    self.write_movies(pending_rows)
+                    pending_rows.clear()
+        self.write_movies(pending_rows)
+
+        if failed_ids:
+            # 기존 동기화 시각은 그대로, 처음 실행이면 이번 시작 시점을 기록해서 다음 실행이 여기서부터 다시 훑음
+            SyncState.objects.get_or_create(name=CHANGES_SYNC_NAME, defaults={'synced_at': since_at})
+            self.stdout.write(self.style.ERROR(
+                f"⚠️  {len(failed_ids)}편 실패 → 동기화 시각을 {start} 에 두고 다음 실행에서 다시 시도"
+            ))
+        else:
+            SyncState.objects.update_or_create(
+                name=CHANGES_SYNC_NAME,
+                defaults={'synced_at': started_at},
+            )
+        self.write_summary()
+
+    def fetch_changed_ids(self, start, end):
+        """start~end 기간의 변경 영화 ID (14일 구간 단위, 페이지 순회)"""
+        changed_ids = set()
+        window_start = start
+        while window_start <= end:
+            window_end = min(window_start + timedelta(days=CHANGES_WINDOW_DAYS - 1), end)
+            page, total_pages = 1, 1
+            while page <= total_pages:
+                data = self.client.get(
+                    "/movie/changes",
+                    params={
+                        "start_date": window_start.isoformat(),
+                        "end_date": window_end.isoformat(),
+                        "page": page,
+                    },
+                    use_cache=False,
+                )
+                changed_ids.update(item['id'] for item in data.get('results', []))
+                total_pages = data.get('total_pages', 1)
+                page += 1
+            window_start = window_end + timedelta(days=1)
+        return changed_ids
+
+    def fetch_page(self, page):
+        """인기 영화 한 페이지의 영화 요약 목록 (상세 조회는 handle 에서 같은 풀로 따로 제출)"""
+        data = self.client.get(
+            "/movie/popular",
+            params={"page": page, "region": "KR"},
+            use_cache=False,
+        )
+        return data.get('results', [])
+
+    def fetch_detail(self, tmdb_id):
+        return self.client.get(f"/movie/{tmdb_id}", use_cache=False)
+
+    def flush(self, pending_rows, pending_pages, done_pages):
+        """모아둔 영화를 bulk upsert 하고 해당 페이지를 체크포인트에 기록"""
+        self.write_movies(pending_rows)
+        done_pages.update(pending_pages)
+        self.save_checkpoint(done_pages)
+        pending_rows.clear()
+        pending_pages.clear()
+
+    def write_movies(self, rows):
+        """내용 해시가 바뀐 영화만 bulk upsert ({tmdb_id: 필드 dict})"""
+        if not rows:
+            return
+
+        existing = dict(
+            Movie.objects.filter(tmdb_id__in=rows.keys()).values_list('tmdb_id', 'payload_hash')
+        )
+        movies = []
+        for tmdb_id, fields in rows.items():
+            digest = payload_hash(fields)
+            if existing.get(tmdb_id) == digest:
+                self.total_unchanged += 1
+                continue
+            movie = Movie(tmdb_id=tmdb_id, payload_hash=digest, **fields)
+            # bulk_create 는 pre_save 시그널을 거치지 않으므로 2글자 검색 색인 컬럼을 직접 채움
+            movie.fill_search_bigrams()
+            movies.append(movie)
+
+        if not movies:
+            return
+
+        with transaction.atomic():
+            Movie.objects.bulk_create(
+                movies,
+                update_conflicts=True,
+                unique_fields=['tmdb_id'],
+                update_fields=UPDATE_FIELDS,
+            )
+            sync_genres_for_tmdb_ids(movie.tmdb_id for movie in movies)
+        invalidate_movies(movie.tmdb_id for movie in movies)
+
+        created = sum(1 for movie in movies if movie.tmdb_id not in existing)
+        self.total_saved += created
+        self.total_updated += len(movies) - created
+        self.stdout.write(
+            self.style.SUCCESS(f"  ✅ {len(movies)}편 저장 (신규 {created}편)")
+        )
+
+    def load_checkpoint(self):
+        """이번 실행과 같은 (페이지 수, 날짜)로 기록된 완료 페이지 (다른 실행의 체크포인트는 무시)"""
+        try:
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return set()
+        if not isinstance(data, dict) or data.get('run') != self.checkpoint_run:
+            self.stdout.write("⏩ 다른 실행의 체크포인트라 처음부터 진행")
+            return set()
+        return set(data.get('done_pages', []))
+
+    def save_checkpoint(self, done_pages):
+        with open(self.checkpoint_path, 'w', encoding='utf-8') as f:
+            json.dump({'run': self.checkpoint_run, 'done_pages': sorted(done_pages)}, f)
+
+    def remove_checkpoint(self):
         try:
-            return datetime.strptime(date_string, '%Y-%m-%d').date()
-        except (ValueError, TypeError):
-            return None
\ No newline at end of file
+            os.remove(self.checkpoint_path)
+        except FileNotFoundError:
+            pass
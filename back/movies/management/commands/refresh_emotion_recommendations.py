@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from movies.recommendations import refresh_emotion_recommendations
+
+
+class Command(BaseCommand):
+    help = '감정별 추천 영화 목록 다시 계산 (cron 등으로 주기 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='감정별 저장할 영화 수 (기본: settings.RECOMMENDATION_LIMIT)'
+        )
+
+    def handle(self, *args, **options):
+        summary = refresh_emotion_recommendations(limit=options['limit'])
+        for emotion, count in summary.items():
+            self.stdout.write(f"  {emotion}: {count}편")
+        self.stdout.write(self.style.SUCCESS("✅ 감정별 추천 갱신 완료"))
@@ -0,0 +1,120 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from final_project.cache_versions import bump_version
+from movies.cache import FOR_YOU_SCOPE
+from movies.collaborative import load_interactions, build_matrix, item_similarity, recommend_batches
+from movies.models import Movie, UserRecommendation
+
+# 최대 메모리 사용량 (Unix 전용)
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def peak_memory_mb():
+    if resource is None:
+        return None
+    # Linux 는 KB 단위
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Command(BaseCommand):
+    help = '찜/리뷰/좋아요로 영화-영화 협업 필터링을 학습해 사용자별 추천 top-N 을 UserRecommendation 에 저장'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-n',
+            type=int,
+            default=50,
+            help='사용자별 저장할 추천 수 (기본 50)'
+        )
+        parser.add_argument(
+            '--neighbors',
+            type=int,
+            default=50,
+            help='영화별로 남길 유사 영화 수 (기본 50)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='한 번에 점수를 계산할 사용자 수 (메모리 ≈ batch-size × 영화 수 × 4바이트, 기본 1000)'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        timings = {}
+
+        users, movies, weights = load_interactions()
+        timings['load'] = time.perf_counter() - started
+        if not len(users):
+            self.stdout.write(self.style.WARNING("⚠️  학습할 데이터가 없습니다."))
+            return
+
+        matrix, user_ids, movie_ids = build_matrix(users, movies, weights)
+        self.stdout.write(self.style.SUCCESS(
+            f"\n📊 사용자 {matrix.shape[0]}명 x 영화 {matrix.shape[1]}편 (상호작용 {matrix.nnz}건)"
+        ))
+
+        phase = time.perf_counter()
+        similarity = item_similarity(matrix, neighbors=options['neighbors'])
+        timings['similarity'] = time.perf_counter() - phase
+        self.stdout.write(f"🧮 영화 유사도 {similarity.nnz}건")
+
+        # 추천은 Movie 테이블에 있는 영화만 (FK + 화면 표시용)
+        movie_pks = dict(Movie.objects.filter(tmdb_id__in=movie_ids.tolist()).values_list('tmdb_id', 'id'))
+        eligible = np.fromiter((tmdb_id in movie_pks for tmdb_id in movie_ids), dtype=bool, count=len(movie_ids))
+
+        phase = time.perf_counter()
+        batches = recommend_batches(matrix, similarity, options['top_n'], options['batch_size'], eligible)
+        written, write_seconds = self.write_recommendations(batches, user_ids, movie_ids, movie_pks)
+        timings['recommend'] = time.perf_counter() - phase - write_seconds
+        timings['write'] = write_seconds
+        bump_version(*FOR_YOU_SCOPE)
+
+        self.stdout.write("\n" + "=" * 50)
+        for name, seconds in timings.items():
+            self.stdout.write(f"⏱️  {name}: {seconds:.2f}초")
+        peak = peak_memory_mb()
+        if peak is not None:
+            self.stdout.write(f"💾 최대 메모리: {peak:.0f}MB")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ 추천 {written}건 저장 (총 {time.perf_counter() - started:.2f}초)"
+        ))
+        self.stdout.write("=" * 50 + "\n")
+
+    def write_recommendations(self, batches, user_ids, movie_ids, movie_pks):
+        """
+        사용자 배치별 추천을 계산되는 대로 저장 (모든 배치의 결과를 메모리에 모으지 않음)
+
+        읽는 쪽이 반쯤 바뀐 추천을 보지 않도록 삭제와 모든 배치 저장을 한 트랜잭션에서 처리한다.
+        반환값: (저장한 추천 수, 저장에 걸린 시간)
+        """
+        written = 0
+        write_seconds = 0.0
+        with transaction.atomic():
+            UserRecommendation.objects.all().delete()
+            for rows, columns, scores in batches:
+                phase = time.perf_counter()
+                objs = []
+                for row, row_columns, row_scores in zip(rows, columns, scores):
+                    rank = 0
+                    for column, score in zip(row_columns, row_scores):
+                        if score <= 0:
+                            break
+                        rank += 1
+                        objs.append(UserRecommendation(
+                            user_id=int(user_ids[row]),
+                            movie_id=movie_pks[int(movie_ids[column])],
+                            rank=rank,
+                            score=float(score),
+                        ))
+                UserRecommendation.objects.bulk_create(objs, batch_size=2000)
+                written += len(objs)
+                write_seconds += time.perf_counter() - phase
+        return written, write_seconds
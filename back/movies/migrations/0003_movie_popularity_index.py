@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0002_movie_payload_hash_syncstate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['-popularity', 'id'], name='movie_popularity_id'),
+        ),
+    ]
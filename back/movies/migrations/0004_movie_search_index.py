@@ -0,0 +1,38 @@
+from django.db import migrations
+
+from final_project.fulltext import sqlite_fts5_sql, postgres_trigram_sql
+
+SEARCH_COLUMNS = ['title', 'original_title', 'overview']
+
+
+def _statements(vendor):
+    if vendor == 'sqlite':
+        return sqlite_fts5_sql('movies_movie', 'movies_movie_fts', SEARCH_COLUMNS)
+    if vendor == 'postgresql':
+        return postgres_trigram_sql(
+            'movies_movie', 'movie_title_trgm', "(title || ' ' || original_title)"
+        )
+    return [], []
+
+
+def create_search_index(apps, schema_editor):
+    forward, _ = _statements(schema_editor.connection.vendor)
+    for sql in forward:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    _, backward = _statements(schema_editor.connection.vendor)
+    for sql in backward:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0003_movie_popularity_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0004_movie_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmotionRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('emotion', models.CharField(max_length=20)),
+                ('rank', models.PositiveIntegerField()),
+                ('score', models.FloatField()),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='movies.movie')),
+            ],
+            options={
+                'ordering': ['emotion', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('emotion', 'rank'), name='unique_emotion_rank')],
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_genres(apps, schema_editor):
+    """기존 Movie.genres JSON 으로 Genre / MovieGenre 채우기"""
+    Genre = apps.get_model('movies', 'Genre')
+    Movie = apps.get_model('movies', 'Movie')
+    MovieGenre = apps.get_model('movies', 'MovieGenre')
+
+    names = {}
+    links = []
+    for movie_id, genres in Movie.objects.values_list('id', 'genres').iterator(chunk_size=2000):
+        for genre in genres or []:
+            genre_id = genre.get('id') if isinstance(genre, dict) else genre
+            if genre_id is None:
+                continue
+            name = genre.get('name', '') if isinstance(genre, dict) else ''
+            if name or genre_id not in names:
+                names[genre_id] = name
+            links.append(MovieGenre(movie_id=movie_id, genre_id=genre_id))
+
+    Genre.objects.bulk_create([Genre(id=genre_id, name=name) for genre_id, name in names.items()])
+    MovieGenre.objects.bulk_create(links, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0007_userrecommendation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Genre',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=50)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MovieGenre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('genre', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='movie_links', to='movies.genre')),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='genre_links', to='movies.movie')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['genre', 'movie'], name='moviegenre_genre_movie')],
+                'constraints': [models.UniqueConstraint(fields=('movie', 'genre'), name='unique_movie_genre')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['-vote_average', 'id'], name='movie_rating_id'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['-release_date', 'id'], name='movie_release_id'),
+        ),
+        migrations.RunPython(backfill_genres, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+from django.db import migrations, models
+
+from final_project.fulltext import (
+    backfill_search_bigrams, bigram_column_sql, postgres_trigram_sql, sqlite_bigram_sql,
+)
+
+SEARCH_COLUMNS = ['title', 'original_title', 'overview']
+
+
+def _statements(vendor):
+    if vendor == 'sqlite':
+        # 2글자 검색어용 bigram 인덱스 (3글자 이상은 0004 의 trigram 인덱스)
+        # 색인 대상은 저장할 때 애플리케이션이 채우는 search_bigrams 컬럼 (트리거는 SQL 만 사용)
+        return sqlite_bigram_sql('movies_movie', 'movies_movie_bigram')
+    if vendor == 'postgresql':
+        # SQLite 와 같은 컬럼을 색인하도록 줄거리까지 포함한 식으로 교체
+        old_forward, old_backward = postgres_trigram_sql(
+            'movies_movie', 'movie_title_trgm', "(title || ' ' || original_title)"
+        )
+        new_forward, new_backward = postgres_trigram_sql(
+            'movies_movie', 'movie_text_trgm', "(title || ' ' || original_title || ' ' || overview)"
+        )
+        return old_backward + new_forward, new_backward + old_forward
+    return [], []
+
+
+def create_search_index(apps, schema_editor):
+    forward, _ = _statements(schema_editor.connection.vendor)
+    for sql in forward:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    _, backward = _statements(schema_editor.connection.vendor)
+    for sql in backward:
+        schema_editor.execute(sql)
+
+
+def fill_search_bigrams(apps, schema_editor):
+    backfill_search_bigrams(apps.get_model('movies', 'Movie'), SEARCH_COLUMNS)
+
+
+ADD_COLUMN, DROP_COLUMN = bigram_column_sql('movies_movie')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0008_genre_moviegenre'),
+    ]
+
+    operations = [
+        # AddField 는 SQLite 에서 테이블을 다시 만들어 0004 의 trigram 트리거를 지우므로 컬럼은 직접 추가
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(
+                    model_name='movie',
+                    name='search_bigrams',
+                    field=models.TextField(blank=True, default='', editable=False),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(ADD_COLUMN, DROP_COLUMN),
+            ],
+        ),
+        migrations.RunPython(fill_search_bigrams, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.9 on 2026-10-18 19:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0009_movie_search_bigram_index'),
+    ]
+
+    operations = [
+        # through M2M 은 컬럼/테이블이 새로 생기지 않는다 (연결 테이블은 0008 의 MovieGenre).
+        # 그냥 AddField 하면 SQLite 스키마 에디터가 movies_movie 를 다시 만들면서
+        # 전문 검색 트리거(0004, 0009)가 사라지므로 상태만 바꾼다.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(
+                    model_name='movie',
+                    name='genre_set',
+                    field=models.ManyToManyField(blank=True, related_name='movies', through='movies.MovieGenre', to='movies.genre'),
+                ),
+            ],
+        ),
+    ]
@@ -1,7 +1,25 @@
+from django.conf import settings
 from django.db import models
 
-class Movie(models.Model):
-    
+from final_project.fulltext import SearchBigramsModel, SearchBigramsQuerySet
+
+
+class Genre(models.Model):
+    """TMDB 장르 (id 는 TMDB 장르 ID 그대로 사용)"""
+    id = models.IntegerField(primary_key=True)
+    name = models.CharField(max_length=50)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return self.name
+
+
+class Movie(SearchBigramsModel):
+    # 2글자 검색 색인 대상 (search_bigrams, migrations/0009)
+    SEARCH_FIELDS = ('title', 'original_title', 'overview')
+
     # TMDB 고유 ID
     tmdb_id = models.IntegerField(unique=True, db_index=True)
     
@@ -23,18 +41,32 @@ class Movie(models.Model):
     vote_count = models.IntegerField(default=0)
     popularity = models.FloatField(default=0)
     
-    # 장르 (JSON)
+    # 장르 (JSON, TMDB 응답 그대로 - 응답 형식 호환용)
+    # 필터/집계는 정규화된 MovieGenre (genre_links / genre_set) 사용, movies/genres.py 가 동기화
     genres = models.JSONField(default=list, blank=True)
+    genre_set = models.ManyToManyField(Genre, through='MovieGenre', related_name='movies', blank=True)
     
     # 언어
     original_language = models.CharField(max_length=10, blank=True)
     
+    # TMDB 응답 내용 해시 (변경이 없으면 DB 쓰기 생략 → updated_at 이 실제 변경 시각이 됨)
+    payload_hash = models.CharField(max_length=64, blank=True)
+    
     # 타임스탬프
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = SearchBigramsQuerySet.as_manager()
     
     class Meta:
         ordering = ['-popularity']
+        indexes = [
+            # 인기순 커서 페이지네이션 (final_project/pagination.py)
+            models.Index(fields=['-popularity', 'id'], name='movie_popularity_id'),
+            # 평점순 / 최신순 커서 페이지네이션 (/api/movies/db/?sort=)
+            models.Index(fields=['-vote_average', 'id'], name='movie_rating_id'),
+            models.Index(fields=['-release_date', 'id'], name='movie_release_id'),
+        ]
         
     def __str__(self):
         return f"{self.title} ({self.release_date.year if self.release_date else 'N/A'})"
@@ -49,4 +81,108 @@ class Movie(models.Model):
     def backdrop_url(self):
         if self.backdrop_path:
             return f"https://image.tmdb.org/t/p/original{self.backdrop_path}"
-        return None
\ No newline at end of file
+        return None
+
+    def to_tmdb_dict(self):
+        """TMDB 영화 상세 응답과 같은 형태의 dict (TMDB 응답 대신 내려줄 때 사용)"""
+        return {
+            'id': self.tmdb_id,
+            'title': self.title,
+            'original_title': self.original_title,
+            'overview': self.overview,
+            'poster_path': self.poster_path,
+            'backdrop_path': self.backdrop_path,
+            'release_date': self.release_date.isoformat() if self.release_date else None,
+            'runtime': self.runtime,
+            'vote_average': self.vote_average,
+            'vote_count': self.vote_count,
+            'popularity': self.popularity,
+            'genres': self.genres,
+            'original_language': self.original_language,
+        }
+
+
+
+class MovieGenre(models.Model):
+    """
+    영화-장르 연결 (Movie.genre_set 의 through 모델)
+
+    유일 제약 / (genre, movie) 인덱스를 직접 정하려고 through 모델로 둔다.
+    """
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='genre_links')
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE, related_name='movie_links')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['movie', 'genre'], name='unique_movie_genre'),
+        ]
+        indexes = [
+            # 장르별 영화 조회 / 장르별 개수 집계
+            models.Index(fields=['genre', 'movie'], name='moviegenre_genre_movie'),
+        ]
+
+    def __str__(self):
+        return f"{self.movie_id} - {self.genre_id}"
+
+
+class SyncState(models.Model):
+    """외부 데이터 동기화 워터마크 (예: TMDB 변경 피드 마지막 동기화 시각)"""
+    name = models.CharField(max_length=50, unique=True)
+    synced_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} @ {self.synced_at}"
+
+
+class EmotionRecommendation(models.Model):
+    """감정별 추천 영화 (movies/recommendations.py 가 미리 계산해서 통째로 교체)"""
+    emotion = models.CharField(max_length=20)
+    rank = models.PositiveIntegerField()
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['emotion', 'rank']
+        constraints = [
+            # 감정별 상위 N 개 조회 인덱스 겸용
+            models.UniqueConstraint(fields=['emotion', 'rank'], name='unique_emotion_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.emotion} #{self.rank}: {self.movie_id}"
+
+
+class MovieNeighbor(models.Model):
+    """콘텐츠 기반 비슷한 영화 top-k (build_similar_movies 명령이 미리 계산)"""
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='neighbors')
+    neighbor = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['movie', 'rank']
+        constraints = [
+            # 영화별 이웃 조회 인덱스 겸용
+            models.UniqueConstraint(fields=['movie', 'rank'], name='unique_movie_neighbor_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.movie_id} → {self.neighbor_id} ({self.score:.3f})"
+
+
+class UserRecommendation(models.Model):
+    """사용자별 협업 필터링 추천 top-N (train_recommendations 명령이 미리 계산)"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='recommendations')
+    movie = models.ForeignKey(Movie, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['user', 'rank']
+        constraints = [
+            # 사용자별 추천 조회 인덱스 겸용
+            models.UniqueConstraint(fields=['user', 'rank'], name='unique_user_recommendation_rank'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} #{self.rank}: {self.movie_id}"
@@ -0,0 +1,140 @@
+"""
+감정별 영화 추천
+
+점수 = 장르 일치 + 평점(투표 수로 보정) + 커뮤니티 감정 리뷰 수
+감정별 상위 N 편을 EmotionRecommendation 테이블에 미리 계산해 두고,
+추천 요청은 그 테이블(또는 응답 캐시)만 읽는다.
+갱신은 refresh_emotion_recommendations 명령(cron 등으로 주기 실행)에서만 하고,
+한 번도 계산하지 않은 동안 요청은 장르 일치 인기 영화(fallback_recommendations)를 받는다.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from community.models import MovieEmotionStats
+from final_project.cache_versions import bump_version
+from .models import Movie, EmotionRecommendation, SyncState
+
+# 감정별 TMDB 장르 ID (이전 프론트엔드 utils/emotionGenreMap.js 에서 이동)
+EMOTION_GENRES = {
+    'joy': [35, 10749, 10751, 16],        # 코미디, 로맨스, 가족, 애니메이션
+    'sadness': [18, 10749, 10402, 99],    # 드라마, 로맨스, 음악, 다큐멘터리
+    'anger': [28, 53, 80],                # 액션, 스릴러, 범죄
+    'fear': [27, 53, 9648],               # 공포, 스릴러, 미스터리
+    'excitement': [28, 878, 12],          # 액션, SF, 어드벤처
+    'calm': [16, 10751, 14],              # 애니메이션, 가족, 판타지
+    'depression': [18, 80, 36],           # 드라마, 범죄, 역사
+}
+
+# 프론트엔드 감정 ID → 리뷰 감정 코드
+EMOTION_ALIASES = {
+    'melancholy': 'depression',
+}
+
+# 후보 최소 조건 (기존 TMDB discover 요청과 같은 기준)
+MIN_VOTE_AVERAGE = 5.0
+MIN_VOTE_COUNT = 50
+
+GENRE_WEIGHT = 0.5
+RATING_WEIGHT = 0.3
+COMMUNITY_WEIGHT = 0.2
+# 장르가 이 개수 이상 겹치면 장르 점수 만점
+GENRE_FULL_MATCH = 2
+
+SYNC_NAME = 'emotion_recommendations'
+VERSION_SCOPE = ('recommendations', 'emotion')
+
+
+def normalize_emotion(emotion):
+    """프론트엔드 별칭을 리뷰 감정 코드로 변환 (지원하지 않는 감정이면 None)"""
+    emotion = EMOTION_ALIASES.get(emotion, emotion)
+    return emotion if emotion in EMOTION_GENRES else None
+
+
+def genre_ids(movie):
+    """Movie.genres (TMDB [{id, name}] 또는 id 리스트) → 장르 ID 집합"""
+    return {genre['id'] if isinstance(genre, dict) else genre for genre in movie.genres or []}
+
+
+def score_movies(movies, emotion, emotion_counts, mean_vote):
+    """
+    한 감정에 대한 (movie, 점수) 목록
+
+    emotion_counts: {tmdb_id: 해당 감정 리뷰 수}
+    mean_vote: 후보 전체 평균 평점 (투표 수가 적은 영화의 평점을 평균 쪽으로 당김)
+    """
+    targets = set(EMOTION_GENRES[emotion])
+    max_count = max(emotion_counts.values(), default=0) or 1
+
+    scored = []
+    for movie in movies:
+        matched = len(genre_ids(movie) & targets)
+        community = emotion_counts.get(movie.tmdb_id, 0)
+        if not matched and not community:
+            continue
+
+        weighted_vote = (
+            (movie.vote_count * movie.vote_average + MIN_VOTE_COUNT * mean_vote)
+            / (movie.vote_count + MIN_VOTE_COUNT)
+        )
+        score = (
+            GENRE_WEIGHT * min(matched / GENRE_FULL_MATCH, 1.0)
+            + RATING_WEIGHT * weighted_vote / 10
+            + COMMUNITY_WEIGHT * community / max_count
+        )
+        scored.append((movie, score))
+
+    scored.sort(key=lambda item: (-item[1], -item[0].popularity))
+    return scored
+
+
+def refresh_emotion_recommendations(limit=None):
+    """모든 감정의 추천 목록을 다시 계산해서 교체, {감정: 편수} 반환"""
+    limit = limit or settings.RECOMMENDATION_LIMIT
+    movies = list(
+        Movie.objects.filter(vote_average__gte=MIN_VOTE_AVERAGE, vote_count__gte=MIN_VOTE_COUNT)
+        .only('id', 'tmdb_id', 'genres', 'vote_average', 'vote_count', 'popularity')
+    )
+    mean_vote = sum(movie.vote_average for movie in movies) / len(movies) if movies else 0
+
+    count_fields = [MovieEmotionStats.count_field(emotion) for emotion in EMOTION_GENRES]
+    stats = list(MovieEmotionStats.objects.values('movie_id', *count_fields))
+
+    summary = {}
+    for emotion in EMOTION_GENRES:
+        field = MovieEmotionStats.count_field(emotion)
+        emotion_counts = {row['movie_id']: row[field] for row in stats if row[field] > 0}
+        top = score_movies(movies, emotion, emotion_counts, mean_vote)[:limit]
+        rows = [
+            EmotionRecommendation(emotion=emotion, rank=rank, movie=movie, score=score)
+            for rank, (movie, score) in enumerate(top, start=1)
+        ]
+        # 감정 하나씩 짧은 트랜잭션으로 교체 (전체를 한 트랜잭션에 묶으면 교체하는 동안 쓰기 잠금이 길어짐)
+        # 읽는 쪽은 감정 하나의 목록만 보므로 감정 단위로만 일관되면 됨
+        with transaction.atomic():
+            EmotionRecommendation.objects.filter(emotion=emotion).delete()
+            EmotionRecommendation.objects.bulk_create(rows, batch_size=500)
+        summary[emotion] = len(top)
+
+    SyncState.objects.update_or_create(name=SYNC_NAME, defaults={'synced_at': timezone.now()})
+    bump_version(*VERSION_SCOPE)
+    return summary
+
+
+def has_been_built():
+    return SyncState.objects.filter(name=SYNC_NAME).exists()
+
+
+def fallback_recommendations(emotion, limit):
+    """
+    미리 계산한 목록이 아직 없을 때의 대체 추천: 감정 장르가 하나라도 맞는 인기 영화
+
+    요청 안에서 전체 점수를 계산하지 않도록 장르 색인(MovieGenre)과 인기도 순 조회만 쓴다.
+    """
+    return list(
+        Movie.objects.filter(
+            genre_links__genre_id__in=EMOTION_GENRES[emotion],
+            vote_average__gte=MIN_VOTE_AVERAGE,
+            vote_count__gte=MIN_VOTE_COUNT,
+        ).distinct().order_by('-popularity')[:limit]
+    )
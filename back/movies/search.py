@@ -0,0 +1,155 @@
+"""
+DB 영화 검색
+
+제목/원제/줄거리 전문 검색 인덱스(migrations/0004, 0009)에서 후보를 뽑고,
+텍스트 관련도와 인기도를 섞은 점수로 다시 정렬한다.
+"""
+import math
+
+from django.db import connection
+from django.db.models import Q
+
+from final_project.fulltext import split_terms, fts5_match_expression, like_pattern
+from .models import Movie
+
+FTS_TABLE = "movies_movie_fts"
+# 2글자 검색어용 bigram 인덱스 (migrations/0009)
+BIGRAM_TABLE = "movies_movie_bigram"
+# trigram 인덱스 bm25 컬럼 가중치 (title, original_title, overview)
+FTS_WEIGHTS = (10.0, 5.0, 1.0)
+# bigram 인덱스는 search_bigrams 한 컬럼이라 컬럼 가중치 대신 제목/원제에 나온 영화의 관련도를 곱함
+BIGRAM_TITLE_BOOST = FTS_WEIGHTS[0] / FTS_WEIGHTS[2]
+# PostgreSQL trigram 인덱스 식 (migrations/0009 와 같아야 함)
+PG_SEARCH_EXPRESSION = "(title || ' ' || original_title || ' ' || overview)"
+# 제목 일치 가산점용 (후보 행에만 계산하므로 인덱스 불필요)
+PG_TITLE_EXPRESSION = "(title || ' ' || original_title)"
+
+# 관련도 후보를 넉넉히 뽑은 뒤 인기도를 섞어 재정렬
+CANDIDATE_LIMIT = 200
+POPULARITY_WEIGHT = 0.3
+
+
+def search_movies(query, limit=20):
+    """검색어에 맞는 Movie 목록 (관련도 + 인기도 순)"""
+    trigram_terms, bigram_terms, like_terms = split_terms(query)
+    if not trigram_terms and not bigram_terms and not like_terms:
+        return []
+
+    if connection.vendor == "sqlite" and (trigram_terms or bigram_terms):
+        scored = _sqlite_candidates(trigram_terms, bigram_terms, like_terms)
+    elif connection.vendor == "postgresql":
+        scored = _postgres_candidates(query)
+    else:
+        scored = _like_candidates(trigram_terms + bigram_terms + like_terms)
+
+    # 재정렬은 (id, 관련도, 인기도) 만으로 하고, 최종 limit 개만 Movie 로 불러옴
+    movie_ids = _rerank(scored)[:limit]
+    movies = Movie.objects.in_bulk(movie_ids)
+    return [movies[movie_id] for movie_id in movie_ids if movie_id in movies]
+
+
+def _sqlite_candidates(trigram_terms, bigram_terms, like_terms):
+    """
+    FTS5 인덱스 조회 → [(movie.id, 관련도, 인기도)]
+
+    3글자 이상 단어가 있으면 trigram 인덱스 bm25 로, 2글자 단어만 있으면 bigram 인덱스 bm25 로 순위를 매기고
+    나머지 인덱스 조건은 후보를 거르는 데만 쓴다.
+    """
+    if trigram_terms:
+        rank_table, rank_terms, rank_expression = FTS_TABLE, trigram_terms, (
+            f"bm25({FTS_TABLE}, {', '.join(map(str, FTS_WEIGHTS))})"
+        )
+        title_terms = []
+    else:
+        rank_table, rank_terms, rank_expression = BIGRAM_TABLE, bigram_terms, f"bm25({BIGRAM_TABLE})"
+        title_terms, bigram_terms = [term.lower() for term in bigram_terms], []
+
+    sql = [
+        f"SELECT m.id, m.popularity, m.title, m.original_title, {rank_expression} AS rank",
+        f"FROM {rank_table} JOIN movies_movie m ON m.id = {rank_table}.rowid",
+        f"WHERE {rank_table} MATCH %s",
+    ]
+    params = [fts5_match_expression(rank_terms)]
+    if bigram_terms:
+        sql.append(f"AND m.id IN (SELECT rowid FROM {BIGRAM_TABLE} WHERE {BIGRAM_TABLE} MATCH %s)")
+        params.append(fts5_match_expression(bigram_terms))
+    # 1글자 단어는 인덱스로 좁힌 후보 안에서만 LIKE 로 확인
+    for term in like_terms:
+        sql.append(
+            "AND (m.title LIKE %s ESCAPE '\\' OR m.original_title LIKE %s ESCAPE '\\' "
+            "OR m.overview LIKE %s ESCAPE '\\')"
+        )
+        params += [like_pattern(term)] * 3
+    sql.append("ORDER BY rank LIMIT %s")
+    params.append(CANDIDATE_LIMIT)
+
+    with connection.cursor() as cursor:
+        cursor.execute(" ".join(sql), params)
+        rows = cursor.fetchall()
+
+    def relevance(title, original_title, rank):
+        # bm25 는 작을수록 관련도가 높음 (음수)
+        titles = f"{title} {original_title}".lower()
+        if title_terms and any(term in titles for term in title_terms):
+            return -rank * BIGRAM_TITLE_BOOST
+        return -rank
+
+    return [
+        (movie_id, relevance(title, original_title, rank), popularity)
+        for movie_id, popularity, title, original_title, rank in rows
+    ]
+
+
+def _postgres_candidates(query):
+    """
+    pg_trgm 단어 유사도 (<% 연산자가 GIN 인덱스를 사용)
+
+    pg_trgm 은 단어 앞뒤를 공백으로 채워 trigram 을 만들기 때문에 2글자 이하 검색어도 인덱스로 찾는다.
+    제목/원제 유사도를 더해 줄거리에만 나온 영화보다 위로 올린다.
+    """
+    sql = (
+        f"SELECT id, word_similarity(%s, {PG_SEARCH_EXPRESSION}) + word_similarity(%s, {PG_TITLE_EXPRESSION}) "
+        f"AS rank, popularity "
+        f"FROM movies_movie WHERE %s <%% {PG_SEARCH_EXPRESSION} "
+        f"ORDER BY rank DESC LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [query, query, query, CANDIDATE_LIMIT])
+        return cursor.fetchall()
+
+
+def _like_candidates(terms):
+    """
+    1글자 검색어만 있을 때 (또는 전문 검색 인덱스가 없는 DB) 제목 부분 일치
+
+    1글자는 줄거리까지 보면 거의 모든 영화가 걸리므로 제목/원제만 본다.
+    """
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(original_title__icontains=term)
+    rows = (
+        Movie.objects.filter(condition).order_by('-popularity')
+        .values_list('id', 'title', 'popularity')[:CANDIDATE_LIMIT]
+    )
+    # 제목이 검색어로 시작하면 조금 더 높게
+    return [
+        (movie_id, 2.0 if title.startswith(terms[0]) else 1.0, popularity)
+        for movie_id, title, popularity in rows
+    ]
+
+
+def _rerank(candidates):
+    """관련도와 인기도를 각각 최댓값으로 정규화해 섞은 점수 순 movie.id 목록"""
+    if not candidates:
+        return []
+    max_relevance = max(relevance for _, relevance, _ in candidates) or 1.0
+    max_popularity = math.log1p(max(popularity for _, _, popularity in candidates)) or 1.0
+
+    def score(item):
+        _, relevance, popularity = item
+        return (
+            relevance / max_relevance
+            + POPULARITY_WEIGHT * math.log1p(popularity) / max_popularity
+        )
+
+    return [movie_id for movie_id, _, _ in sorted(candidates, key=score, reverse=True)]
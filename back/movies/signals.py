@@ -0,0 +1,27 @@
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from final_project.fulltext import fill_search_bigrams
+
+from .cache import invalidate_movie_on_commit
+from .genres import sync_movie_genres
+from .models import Movie
+
+
+# 2글자 검색 색인 컬럼 채우기 (fixture 의 raw 저장 포함, bulk upsert 는 fetch_movies 에서 직접)
+pre_save.connect(fill_search_bigrams, sender=Movie, dispatch_uid='movie_search_bigrams')
+
+
+# admin 등에서 영화를 직접 수정/삭제한 경우 상세 응답 캐시 무효화
+# (fetch_movies 의 bulk upsert 는 시그널이 없으므로 명령에서 카탈로그까지 직접 무효화)
+@receiver(post_save, sender=Movie)
+@receiver(post_delete, sender=Movie)
+def invalidate_movie_cache(sender, instance, **kwargs):
+    invalidate_movie_on_commit(instance.tmdb_id)
+
+
+# 개별 저장된 영화의 정규화 장르 동기화 (fetch_movies 는 명령에서 일괄 처리)
+@receiver(post_save, sender=Movie)
+def sync_genre_tags(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'genres' in update_fields:
+        sync_movie_genres({instance.pk: instance.genres})
@@ -0,0 +1,113 @@
+"""
+콘텐츠 기반 비슷한 영화 (build_similar_movies 명령에서 사용)
+
+특징 벡터 = 줄거리 TF-IDF + 장르 one-hot + 원어 one-hot + 개봉 연대 one-hot
+각 블록을 L2 정규화 후 가중치를 곱해 이어 붙이고, 행을 다시 정규화하면
+내적이 곧 코사인 유사도가 된다.
+차원이 크면 TruncatedSVD 로 줄인 밀집 행렬을 써서 유사도 계산을 BLAS 행렬곱으로 처리한다.
+"""
+import numpy as np
+from scipy import sparse
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+# 특징 블록 가중치
+OVERVIEW_WEIGHT = 1.0
+GENRE_WEIGHT = 0.8
+LANGUAGE_WEIGHT = 0.3
+YEAR_WEIGHT = 0.3
+
+# 이 차원보다 크면 SVD 로 축소 (메모리 ≈ 영화 수 × 차원 × 4바이트)
+DENSE_DIMENSIONS = 256
+
+# 개봉 연도 구간 (10년 단위)
+YEAR_BUCKET_SIZE = 10
+
+# 한국어는 띄어쓰기 단위 단어가 조사 때문에 잘 안 겹치므로 글자 2~3-gram 사용
+TFIDF_OPTIONS = {
+    'analyzer': 'char_wb',
+    'ngram_range': (2, 3),
+    'max_features': 50000,
+    'sublinear_tf': True,
+    'dtype': np.float32,
+}
+
+
+def _one_hot(labels):
+    """라벨 목록(영화마다 라벨 리스트) → CSR one-hot 행렬"""
+    vocabulary = {}
+    rows, cols = [], []
+    for row, movie_labels in enumerate(labels):
+        for label in movie_labels:
+            rows.append(row)
+            cols.append(vocabulary.setdefault(label, len(vocabulary)))
+    data = np.ones(len(rows), dtype=np.float32)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(labels), max(len(vocabulary), 1)))
+
+
+def _genre_ids(genres):
+    return [genre['id'] if isinstance(genre, dict) else genre for genre in genres or []]
+
+
+def build_feature_matrix(movies):
+    """
+    movies: id, overview, genres, original_language, release_date 를 가진 dict 목록
+    반환값: 행이 L2 정규화된 float32 밀집 행렬 (movies 순서와 같음)
+    """
+    overviews = [movie['overview'] or '' for movie in movies]
+    if any(overviews):
+        overview_matrix = TfidfVectorizer(
+            min_df=2 if len(movies) >= 100 else 1, **TFIDF_OPTIONS
+        ).fit_transform(overviews)
+    else:
+        overview_matrix = sparse.csr_matrix((len(movies), 1), dtype=np.float32)
+
+    blocks = [
+        (overview_matrix, OVERVIEW_WEIGHT),
+        (_one_hot([_genre_ids(movie['genres']) for movie in movies]), GENRE_WEIGHT),
+        (_one_hot([[movie['original_language']] if movie['original_language'] else [] for movie in movies]), LANGUAGE_WEIGHT),
+        (_one_hot([
+            [movie['release_date'].year // YEAR_BUCKET_SIZE] if movie['release_date'] else []
+            for movie in movies
+        ]), YEAR_WEIGHT),
+    ]
+    features = sparse.hstack(
+        [normalize(block) * weight for block, weight in blocks], format='csr', dtype=np.float32
+    )
+    if features.shape[1] > DENSE_DIMENSIONS and features.shape[0] > DENSE_DIMENSIONS:
+        dense = TruncatedSVD(n_components=DENSE_DIMENSIONS, random_state=0).fit_transform(features)
+    else:
+        dense = features.toarray()
+    return normalize(dense).astype(np.float32)
+
+
+def top_k_neighbors(features, k, block_size=256):
+    """
+    행마다 코사인 유사도 상위 k 개 (자기 자신 제외, features 는 행 정규화된 밀집 행렬)
+
+    block_size 행씩 (block_size × 전체) 유사도만 계산하므로 메모리는 O(block_size × n).
+    반환값: (이웃 인덱스 int32 [n, k], 유사도 float32 [n, k]) - 이웃이 부족하면 -1 / 0
+    """
+    n = features.shape[0]
+    k = min(k, max(n - 1, 0))
+    indices = np.full((n, k), -1, dtype=np.int32)
+    scores = np.zeros((n, k), dtype=np.float32)
+    if k == 0:
+        return indices, scores
+
+    transposed = np.ascontiguousarray(features.T)
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        similarity = features[start:stop] @ transposed
+        # 자기 자신 제외
+        similarity[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+
+        # 전체 정렬 대신 상위 k 개만 뽑은 뒤 그 안에서 정렬
+        top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(similarity, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        indices[start:stop] = np.take_along_axis(top, order, axis=1)
+        scores[start:stop] = np.take_along_axis(top_scores, order, axis=1)
+
+    return indices, scores
@@ -1,3 +1,1061 @@
-from django.test import TestCase
+from datetime import date, timedelta
+import json
+import os
+import tempfile
+import threading
+import time
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core import serializers
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.core.management import call_command
+from django.core.management.base import CommandError
+import requests
+from rest_framework.test import APITestCase
+
+from accounts.models import FavoriteMovie
+from community.models import MovieEmotionStats, Review
+from final_project.checks import check_shared_cache
+from final_project.singleflight import SingleFlight, cache_lock
+from .cache import invalidate_movies
+from .hydration import hydrate_movie
+from .models import Movie, EmotionRecommendation, SyncState
+from .recommendations import refresh_emotion_recommendations
+from .search import search_movies
+from .tmdb import CircuitBreaker, CircuitOpenError, RateLimiter, TMDBClient, fetch_movie_details
+from .similarity import build_feature_matrix, top_k_neighbors
+
+User = get_user_model()
+
+
+class MovieDetailConditionalGetTest(APITestCase):
+    """DB 영화 상세 ETag / Last-Modified → 304"""
+
+    def setUp(self):
+        cache.clear()
+        self.movie = Movie.objects.create(tmdb_id=550, title='파이트 클럽', original_title='Fight Club')
+
+    def test_not_modified_until_movie_changes(self):
+        url = f'/api/movies/db/{self.movie.tmdb_id}/'
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.movie.title = '파이트 클럽 (재개봉)'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.movie.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['title'], '파이트 클럽 (재개봉)')
+
+
+class MovieListConditionalGetTest(APITestCase):
+    """DB 영화 목록은 Last-Modified 없이 ETag 로만 검증 (삭제해도 새 ETag)"""
+
+    def setUp(self):
+        cache.clear()
+        Movie.objects.create(tmdb_id=1, title='오래된 영화', original_title='', popularity=10)
+        self.newest = Movie.objects.create(tmdb_id=2, title='새 영화', original_title='', popularity=20)
+
+    def test_delete_changes_etag(self):
+        response = self.client.get('/api/movies/db/popular/')
+        self.assertNotIn('Last-Modified', response)
+        etag = response['ETag']
+        self.assertEqual(self.client.get('/api/movies/db/popular/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        Movie.objects.filter(tmdb_id=1).delete()
+        self.assertEqual(self.client.get('/api/movies/db/popular/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class SharedCacheCheckTest(SimpleTestCase):
+    """DEBUG 가 아니면 프로세스별 캐시(locmem) 금지"""
+
+    LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+    def test_locmem_rejected_outside_debug(self):
+        with override_settings(DEBUG=False, CACHES=self.LOCMEM):
+            self.assertEqual([error.id for error in check_shared_cache(None)], ['final_project.E001'])
+        with override_settings(DEBUG=True, CACHES=self.LOCMEM):
+            self.assertEqual(check_shared_cache(None), [])
+        self.assertEqual(check_shared_cache(None), [])
+
+
+class FakeCatalogTMDB:
+    """fetch_movies 용 가짜 TMDB (인기 목록 페이지 / 영화 상세 / 변경 피드)"""
+
+    def __init__(self, titles, per_page=2):
+        self.titles = titles
+        self.per_page = per_page
+        # {tmdb_id: 변경 날짜}
+        self.changes = {}
+        self.failing_pages = set()
+        self.failing_ids = set()
+        self.requests = []
+
+    def get(self, path, params=None, use_cache=True, **kwargs):
+        params = params or {}
+        self.requests.append((path, params))
+        if path == '/movie/popular':
+            if params['page'] in self.failing_pages:
+                raise requests.exceptions.ConnectionError(f'page {params["page"]}')
+            start = (params['page'] - 1) * self.per_page
+            ids = sorted(self.titles)[start:start + self.per_page]
+            return {'results': [{'id': tmdb_id, 'title': self.titles[tmdb_id]} for tmdb_id in ids]}
+        if path == '/movie/changes':
+            window = (date.fromisoformat(params['start_date']), date.fromisoformat(params['end_date']))
+            ids = sorted(tmdb_id for tmdb_id, day in self.changes.items() if window[0] <= day <= window[1])
+            start = (params['page'] - 1) * self.per_page
+            return {
+                'results': [{'id': tmdb_id} for tmdb_id in ids[start:start + self.per_page]],
+                'total_pages': max(1, -(-len(ids) // self.per_page)),
+            }
+        tmdb_id = int(path.split('/')[2])
+        if tmdb_id in self.failing_ids:
+            raise requests.exceptions.ReadTimeout(f'movie {tmdb_id}')
+        return {'id': tmdb_id, 'title': self.titles[tmdb_id], 'genres': [{'id': 18, 'name': '드라마'}]}
+
+    def paths(self, path):
+        return [params for requested, params in self.requests if requested == path]
+
+    def detail_ids(self):
+        return [int(path.split('/')[2]) for path, _ in self.requests if path.split('/')[2].isdigit()]
+
+
+class FetchMoviesCommandTest(APITestCase):
+    """fetch_movies: 페이지 병렬 조회 → bulk upsert, 내용 해시로 변경 없는 영화 건너뜀, 체크포인트 재개"""
+
+    def setUp(self):
+        cache.clear()
+        self.tmdb = FakeCatalogTMDB({1: '하나', 2: '둘', 3: '셋', 4: '넷'})
+        patcher = mock.patch('movies.management.commands.fetch_movies.TMDBClient', return_value=self.tmdb)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.checkpoint = os.path.join(tmpdir.name, 'checkpoint.json')
+
+    def fetch(self, **options):
+        out = StringIO()
+        call_command('fetch_movies', checkpoint=self.checkpoint, workers=2, stdout=out, **options)
+        return out.getvalue()
+
+    def test_bulk_upsert_and_payload_hash_skip(self):
+        out = self.fetch(pages=2)
+        self.assertIn('새로 저장: 4편', out)
+        self.assertEqual(dict(Movie.objects.values_list('tmdb_id', 'title')), self.tmdb.titles)
+        self.assertEqual(list(Movie.objects.get(tmdb_id=1).genre_links.values_list('genre_id', flat=True)), [18])
+
+        untouched = Movie.objects.get(tmdb_id=2).updated_at
+        self.tmdb.titles[1] = '하나 (감독판)'
+        out = self.fetch(pages=2, batch_size=1)
+        self.assertIn('업데이트: 1편', out)
+        self.assertIn('변경 없음: 3편', out)
+        self.assertEqual(Movie.objects.count(), 4)
+        self.assertEqual(Movie.objects.get(tmdb_id=1).title, '하나 (감독판)')
+        self.assertEqual(Movie.objects.get(tmdb_id=2).updated_at, untouched)
+
+    def done_pages(self):
+        with open(self.checkpoint, encoding='utf-8') as f:
+            return json.load(f)['done_pages']
+
+    def test_resume_skips_checkpointed_pages(self):
+        self.tmdb.failing_pages = {2}
+        self.fetch(pages=2)
+        self.assertEqual(self.done_pages(), [1])
+
+        self.tmdb.failing_pages = set()
+        self.tmdb.requests.clear()
+        self.fetch(pages=2, resume=True)
+        self.assertEqual([params['page'] for params in self.tmdb.paths('/movie/popular')], [2])
+        self.assertEqual(Movie.objects.count(), 4)
+        # 모든 페이지를 마친 실행은 체크포인트를 지움 → 다음 --resume 은 처음부터
+        self.assertFalse(os.path.exists(self.checkpoint))
+        self.tmdb.requests.clear()
+        self.fetch(pages=2, resume=True)
+        self.assertEqual(sorted(params['page'] for params in self.tmdb.paths('/movie/popular')), [1, 2])
+
+    def test_failed_detail_keeps_page_out_of_checkpoint(self):
+        self.tmdb.failing_ids = {3}
+        out = self.fetch(pages=2)
+        self.assertIn('상세정보 1편 실패', out)
+        self.assertEqual(self.done_pages(), [1])
+        self.assertFalse(Movie.objects.filter(tmdb_id=3).exists())
+
+        self.tmdb.failing_ids = set()
+        self.tmdb.requests.clear()
+        self.fetch(pages=2, resume=True)
+        self.assertEqual(sorted(self.tmdb.detail_ids()), [3, 4])
+        self.assertTrue(Movie.objects.filter(tmdb_id=3).exists())
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_checkpoint_from_other_run_is_ignored(self):
+        self.tmdb.failing_pages = {2}
+        self.fetch(pages=2)
+        self.assertEqual(self.done_pages(), [1])
+
+        # 페이지 수가 다른 실행의 체크포인트는 쓰지 않음
+        self.tmdb.requests.clear()
+        self.fetch(pages=1, resume=True)
+        self.assertEqual([params['page'] for params in self.tmdb.paths('/movie/popular')], [1])
+
+    def test_rate_must_be_positive(self):
+        with self.assertRaises(CommandError):
+            self.fetch(rate=0)
+        with self.assertRaises(ValueError):
+            RateLimiter(0)
+
+
+class FetchMoviesIncrementalTest(APITestCase):
+    """fetch_movies --incremental: 14일 구간 변경 피드 페이지 순회, 실패 시 동기화 시각 유지"""
+
+    def setUp(self):
+        cache.clear()
+        self.tmdb = FakeCatalogTMDB({1: '하나', 2: '둘', 3: '셋', 4: '넷', 5: 'DB에 없음'})
+        patcher = mock.patch('movies.management.commands.fetch_movies.TMDBClient', return_value=self.tmdb)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for tmdb_id in range(1, 5):
+            Movie.objects.create(tmdb_id=tmdb_id, title='예전 제목', original_title='')
+        self.today = timezone.now().date()
+        self.watermark = timezone.now() - timedelta(days=20)
+        SyncState.objects.create(name='tmdb_movie_changes', synced_at=self.watermark)
+
+    def sync(self, **options):
+        out = StringIO()
+        call_command('fetch_movies', incremental=True, workers=2, stdout=out, **options)
+        return out.getvalue()
+
+    def synced_at(self):
+        return SyncState.objects.get(name='tmdb_movie_changes').synced_at
+
+    def test_pages_through_windows_and_skips_unknown_movies(self):
+        start = self.watermark.date()
+        self.tmdb.changes = {1: start, 2: start + timedelta(days=1), 3: start + timedelta(days=2), 5: self.today}
+
+        self.sync()
+
+        windows = {(p['start_date'], p['end_date']) for p in self.tmdb.paths('/movie/changes')}
+        self.assertEqual(windows, {
+            (start.isoformat(), (start + timedelta(days=13)).isoformat()),
+            ((start + timedelta(days=14)).isoformat(), self.today.isoformat()),
+        })
+        # 첫 구간은 3편 → 2페이지
+        self.assertEqual(len(self.tmdb.paths('/movie/changes')), 3)
+        self.assertEqual(sorted(self.tmdb.detail_ids()), [1, 2, 3])
+        self.assertEqual(
+            dict(Movie.objects.values_list('tmdb_id', 'title')),
+            {1: '하나', 2: '둘', 3: '셋', 4: '예전 제목'},
+        )
+        self.assertGreater(self.synced_at(), self.watermark)
+
+    def test_unchanged_payload_is_not_written(self):
+        self.tmdb.changes = {1: self.today}
+        self.sync()
+        updated_at = Movie.objects.get(tmdb_id=1).updated_at
+
+        SyncState.objects.filter(name='tmdb_movie_changes').update(synced_at=self.watermark)
+        out = self.sync()
+        self.assertIn('변경 없음: 1편', out)
+        self.assertEqual(Movie.objects.get(tmdb_id=1).updated_at, updated_at)
+
+    def test_failed_detail_keeps_watermark_and_is_retried(self):
+        self.tmdb.changes = {1: self.today, 2: self.today}
+        self.tmdb.failing_ids = {2}
+
+        self.sync()
+        self.assertEqual(self.synced_at(), self.watermark)
+        self.assertEqual(Movie.objects.get(tmdb_id=1).title, '하나')
+
+        self.tmdb.failing_ids = set()
+        self.sync()
+        self.assertEqual(Movie.objects.get(tmdb_id=2).title, '둘')
+        self.assertGreater(self.synced_at(), self.watermark)
+
+    def test_first_run_failure_records_start(self):
+        SyncState.objects.all().delete()
+        self.tmdb.changes = {1: self.today}
+        self.tmdb.failing_ids = {1}
+
+        self.sync(since=(self.today - timedelta(days=3)).isoformat())
+        self.assertEqual(self.synced_at().date(), self.today - timedelta(days=3))
+
+    def test_changes_feed_error_keeps_watermark(self):
+        with mock.patch.object(self.tmdb, 'get', side_effect=requests.exceptions.ConnectionError('down')):
+            with self.assertRaises(CommandError):
+                self.sync()
+        self.assertEqual(self.synced_at(), self.watermark)
+
+
+class MovieSearchTest(APITestCase):
+    """FTS5 trigram 검색 + 인기도 재정렬"""
+
+    def setUp(self):
+        Movie.objects.create(tmdb_id=1, title='기생충', original_title='Parasite', overview='반지하 가족 이야기', popularity=80)
+        Movie.objects.create(tmdb_id=2, title='괴물', original_title='The Host', overview='한강에 나타난 괴물과 기생충 같은 존재', popularity=90)
+        Movie.objects.create(tmdb_id=3, title='살인의 추억', original_title='Memories of Murder', overview='연쇄 살인 사건', popularity=50)
+        Movie.objects.create(tmdb_id=4, title='기생충 다큐멘터리', original_title='Parasite Documentary', overview='', popularity=1)
+
+    def search(self, q):
+        return [movie.tmdb_id for movie in search_movies(q)]
+
+    def test_title_match_ranks_above_overview_match(self):
+        self.assertEqual(self.search('기생충'), [1, 4, 2])
+
+    def test_korean_substring_and_original_title(self):
+        self.assertEqual(self.search('살인의'), [3])
+        self.assertEqual(self.search('memories'), [3])
+
+    def test_index_follows_updates_and_deletes(self):
+        Movie.objects.filter(tmdb_id=3).update(title='추억')
+        self.assertEqual(self.search('살인의'), [])
+        Movie.objects.filter(tmdb_id=1).delete()
+        self.assertEqual(self.search('parasite'), [4])
+
+    def test_two_letter_query_uses_bigram_index(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.search('괴물'), [2])
+        self.assertIn('movies_movie_bigram', queries[0]['sql'])
+        self.assertNotIn('LIKE', queries[0]['sql'])
+
+        # 단어 중간의 2글자, 줄거리, 대소문자 무시
+        self.assertEqual(self.search('생충'), [1, 4, 2])
+        self.assertEqual(self.search('반지'), [1])
+        self.assertEqual(self.search('HO'), [2])
+
+    def test_bigram_index_follows_updates_and_deletes(self):
+        Movie.objects.filter(tmdb_id=2).update(title='호스트', overview='')
+        self.assertEqual(self.search('괴물'), [])
+        self.assertEqual(self.search('스트'), [2])
+        Movie.objects.filter(tmdb_id=2).delete()
+        self.assertEqual(self.search('스트'), [])
+
+    def test_raw_sql_writes_succeed_and_refresh_reindexes(self):
+        # 트리거는 SQL 만 쓰므로 Django 밖(원시 SQL, sqlite3 셸)의 쓰기도 실패하지 않음
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE movies_movie SET title = '마더', overview = '' WHERE tmdb_id = 3")
+        self.assertEqual(self.search('살인의'), [])
+        # search_bigrams 는 그대로라 2글자 색인은 다시 채울 때까지 예전 값
+        self.assertEqual(self.search('마더'), [])
+        Movie.objects.filter(tmdb_id=3).refresh_search_bigrams()
+        self.assertEqual(self.search('마더'), [3])
+        self.assertEqual(self.search('연쇄'), [])
+
+    def test_fixture_fills_bigram_column(self):
+        now = timezone.now().isoformat()
+        for obj in serializers.deserialize('json', json.dumps([{
+            'model': 'movies.movie', 'pk': 50,
+            'fields': {'tmdb_id': 50, 'title': '올드보이', 'original_title': 'Oldboy', 'overview': '15년 감금',
+                       'created_at': now, 'updated_at': now},
+        }])):
+            obj.save()
+        self.assertEqual(self.search('감금'), [50])
+
+    def test_mixed_length_terms(self):
+        self.assertEqual(self.search('기생충 반지'), [1])
+        self.assertEqual(self.search('살인의 추억'), [3])
+        self.assertEqual(self.search('연쇄 살'), [3])
+        # 1글자만 있으면 제목 부분 일치
+        self.assertEqual(self.search('괴'), [2])
+
+    def test_endpoint_skips_tmdb_when_local_results_are_enough(self):
+        for i in range(5):
+            Movie.objects.create(tmdb_id=100 + i, title=f'기생충 {i}', original_title='', popularity=i)
+        response = self.client.get('/api/movies/search/', {'q': '기생충'})
+        self.assertEqual(response.data['source'], 'db')
+        self.assertEqual(response.data['results'][0]['id'], 1)
+
+
+class EmotionRecommendationTest(APITestCase):
+    """감정별 추천 점수 계산 + 미리 계산된 테이블 읽기"""
+
+    def setUp(self):
+        cache.clear()
+        comedy = [{'id': 35, 'name': '코미디'}, {'id': 10749, 'name': '로맨스'}]
+        self.romcom = Movie.objects.create(
+            tmdb_id=1, title='로맨틱 코미디', original_title='', genres=comedy,
+            vote_average=7.5, vote_count=1000, popularity=10,
+        )
+        self.comedy = Movie.objects.create(
+            tmdb_id=2, title='코미디', original_title='', genres=[comedy[0]],
+            vote_average=7.5, vote_count=1000, popularity=50,
+        )
+        self.horror = Movie.objects.create(
+            tmdb_id=3, title='공포', original_title='', genres=[{'id': 27, 'name': '공포'}],
+            vote_average=8.0, vote_count=1000, popularity=90,
+        )
+        Movie.objects.create(
+            tmdb_id=4, title='평점 낮음', original_title='', genres=comedy,
+            vote_average=3.0, vote_count=1000, popularity=99,
+        )
+
+    def recommend(self, emotion):
+        response = self.client.post('/api/movies/recommend/', {'emotion': emotion}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return [movie['id'] for movie in response.data['results']]
+
+    def test_genre_match_and_vote_threshold(self):
+        refresh_emotion_recommendations()
+        self.assertEqual(self.recommend('joy'), [1, 2])
+        self.assertEqual(self.recommend('fear'), [3])
+
+    def test_community_emotion_counts_add_and_boost_candidates(self):
+        refresh_emotion_recommendations()
+        before = EmotionRecommendation.objects.get(emotion='joy', movie=self.comedy).score
+
+        # 장르가 맞지 않아도 '기쁨' 리뷰가 있으면 후보가 됨
+        MovieEmotionStats.objects.create(movie_id=3, joy_count=5)
+        MovieEmotionStats.objects.create(movie_id=2, joy_count=10)
+        refresh_emotion_recommendations()
+
+        self.assertEqual(self.recommend('joy'), [1, 2, 3])
+        self.assertGreater(EmotionRecommendation.objects.get(emotion='joy', movie=self.comedy).score, before)
+
+    def test_falls_back_to_genre_popularity_until_built(self):
+        # 요청은 추천을 계산하지 않고 장르가 맞는 인기 영화로 대신함
+        self.assertEqual(self.recommend('joy'), [2, 1])
+        self.assertFalse(EmotionRecommendation.objects.exists())
+
+        # 명령으로 계산하면 버전이 올라가 다음 요청부터 계산된 목록
+        call_command('refresh_emotion_recommendations', stdout=StringIO())
+        self.assertEqual(self.recommend('joy'), [1, 2])
+
+    def test_request_reads_precomputed_rows(self):
+        refresh_emotion_recommendations()
+        self.recommend('joy')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.recommend('joy'), [1, 2])
+        self.assertEqual(self.recommend('melancholy'), [])
+        self.assertEqual(
+            self.client.post('/api/movies/recommend/', {'emotion': 'unknown'}, format='json').status_code, 400
+        )
+
+
+class SimilarMoviesTest(APITestCase):
+    """콘텐츠 기반 이웃 계산 + 미리 계산된 이웃 조회"""
+
+    def setUp(self):
+        cache.clear()
+        space = [{'id': 878, 'name': 'SF'}, {'id': 12, 'name': '모험'}]
+        romance = [{'id': 10749, 'name': '로맨스'}, {'id': 18, 'name': '드라마'}]
+        self.movies = [
+            Movie.objects.create(tmdb_id=1, title='인터스텔라', original_title='Interstellar', genres=space,
+                                 overview='우주 탐사대가 웜홀을 지나 새로운 행성을 찾는다', original_language='en',
+                                 release_date=date(2014, 11, 6)),
+            Movie.objects.create(tmdb_id=2, title='마션', original_title='The Martian', genres=space,
+                                 overview='화성 탐사대원이 홀로 남겨져 새로운 생존을 시작한다', original_language='en',
+                                 release_date=date(2015, 10, 8)),
+            Movie.objects.create(tmdb_id=3, title='노트북', original_title='The Notebook', genres=romance,
+                                 overview='여름날 시작된 두 사람의 사랑 이야기', original_language='en',
+                                 release_date=date(2004, 6, 25)),
+            Movie.objects.create(tmdb_id=4, title='건축학개론', original_title='Architecture 101', genres=romance,
+                                 overview='첫사랑의 기억과 다시 시작된 두 사람의 이야기', original_language='ko',
+                                 release_date=date(2012, 3, 22)),
+        ]
+
+    def test_top_k_neighbors_in_blocks(self):
+        rows = list(Movie.objects.order_by('id').values('id', 'overview', 'genres', 'original_language', 'release_date'))
+        features = build_feature_matrix(rows)
+        indices, scores = top_k_neighbors(features, k=2, block_size=3)
+
+        self.assertEqual(indices.shape, (4, 2))
+        self.assertEqual(list(indices[:, 0]), [1, 0, 3, 2])
+        self.assertTrue((scores[:, 0] >= scores[:, 1]).all())
+        # 블록 크기와 무관하게 같은 결과
+        same, _ = top_k_neighbors(features, k=2, block_size=100)
+        self.assertEqual(indices.tolist(), same.tolist())
+
+    def test_endpoint_reads_precomputed_neighbors(self):
+        call_command('build_similar_movies', k=2, min_score=0, stdout=StringIO())
+
+        response = self.client.get('/api/movies/db/1/similar/')
+        self.assertEqual([movie['tmdb_id'] for movie in response.data['results']], [2, 3])
+        with self.assertNumQueries(0):
+            self.client.get('/api/movies/db/1/similar/')
+        self.assertEqual(self.client.get('/api/movies/db/999/similar/').data['results'], [])
+
+
+class CollaborativeRecommendationTest(APITestCase):
+    """찜/리뷰/좋아요 기반 영화-영화 협업 필터링"""
+
+    def setUp(self):
+        cache.clear()
+        for tmdb_id in range(1, 5):
+            Movie.objects.create(tmdb_id=tmdb_id, title=f'영화 {tmdb_id}', original_title='', popularity=tmdb_id)
+        self.users = [User.objects.create_user(username=f'user{i}', password='password123') for i in range(4)]
+        a, b, c, self.newcomer = self.users
+
+        # a, b 는 1·2 를 함께 좋아함 → 1 만 본 c 에게 2 추천
+        for user in (a, b):
+            FavoriteMovie.objects.create(user=user, movie_id=1)
+            Review.objects.create(user=user, movie_id=2, title='좋음', content='내용', rating=5.0)
+        FavoriteMovie.objects.create(user=a, movie_id=3)
+        FavoriteMovie.objects.create(user=c, movie_id=1)
+        # DB에 없는 영화는 추천 대상에서 제외
+        FavoriteMovie.objects.create(user=a, movie_id=999)
+
+    def test_item_similarity_recommendations(self):
+        call_command('train_recommendations', top_n=5, stdout=StringIO())
+
+        self.client.force_authenticate(self.users[2])
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/movies/for-you/')
+        self.assertEqual(response.data['source'], 'personalized')
+        self.assertEqual([movie['tmdb_id'] for movie in response.data['results']], [2, 3])
+        with self.assertNumQueries(0):
+            self.client.get('/api/movies/for-you/')
+
+        # 다시 학습하면 FOR_YOU_SCOPE 버전이 올라 새 결과를 읽음
+        FavoriteMovie.objects.create(user=self.users[2], movie_id=2)
+        call_command('train_recommendations', top_n=5, stdout=StringIO())
+        response = self.client.get('/api/movies/for-you/')
+        self.assertEqual([movie['tmdb_id'] for movie in response.data['results']], [3])
+
+    def test_cold_start_falls_back_to_popular(self):
+        call_command('train_recommendations', stdout=StringIO())
+
+        self.client.force_authenticate(self.newcomer)
+        response = self.client.get('/api/movies/for-you/', {'limit': 2})
+        self.assertEqual(response.data['source'], 'popular')
+        self.assertEqual([movie['tmdb_id'] for movie in response.data['results']], [4, 3])
+
+
+class HomeFeedTest(APITestCase):
+    """프로필 취향 기반 홈 피드와 사용자별 캐시 무효화"""
+
+    def setUp(self):
+        cache.clear()
+        Movie.objects.create(tmdb_id=1, title='액션', original_title='', popularity=50, vote_average=7, vote_count=100,
+                             genres=[{'id': 28, 'name': '액션'}], original_language='en')
+        Movie.objects.create(tmdb_id=2, title='한국 드라마', original_title='', popularity=10, vote_average=7, vote_count=100,
+                             genres=[{'id': 18, 'name': '드라마'}], original_language='ko')
+        Movie.objects.create(tmdb_id=3, title='인기 코미디', original_title='', popularity=90, vote_average=7, vote_count=100,
+                             genres=[{'id': 35, 'name': '코미디'}], original_language='en')
+        self.user = User.objects.create_user(username='viewer', password='password123', favorite_genres=['액션'])
+        self.client.force_authenticate(self.user)
+
+    def test_ranks_by_preferences_and_caches(self):
+        FavoriteMovie.objects.create(user=self.user, movie_id=3)
+
+        response = self.client.get('/api/movies/home/')
+        self.assertEqual(response.data['source'], 'profile')
+        # 찜한 영화는 제외, 선호 장르가 인기도보다 우선
+        self.assertEqual([movie['tmdb_id'] for movie in response.data['results']], [1, 2])
+
+        # 두 번째 요청은 캐시만 읽음
+        with self.assertNumQueries(0):
+            self.client.get('/api/movies/home/')
+
+    def test_preference_change_invalidates_feed(self):
+        self.client.get('/api/movies/home/')
+
+        # 취향과 무관한 필드 수정은 캐시 유지
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch('/api/accounts/profile/', {'nickname': '관객'}, format='json')
+        with self.assertNumQueries(0):
+            self.client.get('/api/movies/home/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch('/api/accounts/profile/', {'favorite_genres': ['드라마'], 'preferred_countries': ['한국']}, format='json')
+        response = self.client.get('/api/movies/home/')
+        self.assertEqual(response.data['results'][0]['tmdb_id'], 2)
+
+    def test_preferences_reach_beyond_popular_candidates(self):
+        # 전체 인기순 상위 밖의 선호 장르 / 선호 원어 영화도 후보
+        Movie.objects.create(tmdb_id=4, title='다큐', original_title='', popularity=1, vote_average=9, vote_count=100,
+                             genres=[{'id': 99, 'name': '다큐멘터리'}], original_language='fr')
+        self.user.favorite_genres = ['다큐멘터리']
+        self.user.preferred_countries = ['한국']
+        self.user.save()
+
+        with mock.patch('movies.home_feed.POPULAR_CANDIDATES', 1):
+            response = self.client.get('/api/movies/home/')
+        self.assertEqual([movie['tmdb_id'] for movie in response.data['results']], [4, 2, 3])
+
+    def feed_ids(self):
+        return [movie['tmdb_id'] for movie in self.client.get('/api/movies/home/').data['results']]
+
+    def test_favorite_toggle_invalidates_feed(self):
+        self.assertEqual(self.feed_ids(), [1, 3, 2])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/accounts/favorite-movies/toggle/', {'movie_id': 1}, format='json')
+        self.assertEqual(self.feed_ids(), [3, 2])
+
+        # 찜 취소하면 다시 후보
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/accounts/favorite-movies/toggle/', {'movie_id': 1}, format='json')
+        self.assertEqual(self.feed_ids(), [1, 3, 2])
+
+    def test_review_write_invalidates_feed(self):
+        self.assertEqual(self.feed_ids(), [1, 3, 2])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/community/reviews/3/create/', {
+                'title': '리뷰', 'content': '내용', 'rating': 4.0,
+            }, format='json')
+        self.assertEqual(self.feed_ids(), [1, 2])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f"/api/community/reviews/{response.data['id']}/delete/")
+        self.assertEqual(self.feed_ids(), [1, 3, 2])
+
+    def test_single_movie_save_keeps_catalog_caches(self):
+        self.feed_ids()
+
+        # 영화 한 편 저장은 상세 캐시만 무효화
+        with self.captureOnCommitCallbacks(execute=True):
+            Movie.objects.create(tmdb_id=4, title='새 액션', original_title='', popularity=99, vote_average=7,
+                                 vote_count=100, genres=[{'id': 28, 'name': '액션'}])
+        with self.assertNumQueries(0):
+            self.client.get('/api/movies/home/')
+
+        # 일괄 갱신(fetch_movies)은 카탈로그 버전을 올려 피드를 다시 계산
+        invalidate_movies([4])
+        self.assertEqual(self.feed_ids()[0], 4)
+
+
+class GenreFilterTest(APITestCase):
+    """정규화 장르 테이블 기반 장르 필터 / 정렬 / 장르별 개수"""
+
+    def setUp(self):
+        cache.clear()
+        action, drama = {'id': 28, 'name': '액션'}, {'id': 18, 'name': '드라마'}
+        Movie.objects.create(tmdb_id=1, title='A', original_title='', popularity=10, vote_average=9, genres=[action])
+        Movie.objects.create(tmdb_id=2, title='B', original_title='', popularity=30, vote_average=6, genres=[action, drama])
+        Movie.objects.create(tmdb_id=3, title='C', original_title='', popularity=20, vote_average=7, genres=[drama])
+
+    def test_filter_sort_and_facets(self):
+        response = self.client.get('/api/movies/db/', {'genre': 28})
+        self.assertEqual([movie['tmdb_id'] for movie in response.data['results']], [2, 1])
+        self.assertEqual(
+            response.data['genres'],
+            [{'id': 18, 'name': '드라마', 'count': 2}, {'id': 28, 'name': '액션', 'count': 2}],
+        )
+
+        response = self.client.get('/api/movies/db/', {'genre': 18, 'sort': 'rating'})
+        self.assertEqual([movie['tmdb_id'] for movie in response.data['results']], [3, 2])
+
+    def test_genre_links_follow_json(self):
+        movie = Movie.objects.get(tmdb_id=2)
+        movie.genres = [{'id': 35, 'name': '코미디'}]
+        movie.save()
+
+        self.assertEqual(list(movie.genre_links.values_list('genre_id', flat=True)), [35])
+        self.assertEqual([genre.name for genre in movie.genre_set.all()], ['코미디'])
+
+    def test_genre_set_keeps_search_triggers(self):
+        # genre_set 마이그레이션(0010)이 movies_movie 를 다시 만들지 않아 검색 색인 트리거가 남아 있음
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'movies_movie'")
+            triggers = {row[0] for row in cursor.fetchall()}
+        self.assertTrue({'movies_movie_fts_ai', 'movies_movie_bigram_ai'} <= triggers)
+        self.assertEqual(list(Movie.objects.filter(genre_set__name='드라마').order_by('tmdb_id').values_list('tmdb_id', flat=True)), [2, 3])
+
+    def test_invalid_params(self):
+        self.assertEqual(self.client.get('/api/movies/db/', {'sort': 'title'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/movies/db/', {'genre': 'action'}).status_code, 400)
+
+
+class MovieBatchTest(APITestCase):
+    """여러 영화 한 번에 조회 (DB 조회 1번 + 없는 영화만 TMDB)"""
+
+    def setUp(self):
+        Movie.objects.create(tmdb_id=1, title='A', original_title='')
+        Movie.objects.create(tmdb_id=2, title='B', original_title='')
+
+    def test_preserves_order_and_fills_misses(self):
+        tmdb = {3: {'id': 3, 'title': 'C', 'release_date': '2020-01-01', 'vote_average': 7.5}}
+        with mock.patch('movies.views.fetch_movie_details', return_value=tmdb) as fetch:
+            with self.assertNumQueries(1):
+                response = self.client.get('/api/movies/db/batch/', {'ids': '3,1,4,2,1'})
+
+        fetch.assert_called_once_with([3, 4])
+        results = response.data['results']
+        self.assertEqual([movie['tmdb_id'] for movie in results], [3, 1, 4, 2])
+        self.assertEqual((results[0]['id'], results[0]['title'], results[0]['year']), (None, 'C', 2020))
+        self.assertTrue(results[2]['partial'])
+
+    def test_invalid_ids(self):
+        self.assertEqual(self.client.get('/api/movies/db/batch/', {'ids': '1,a'}).status_code, 400)
+        ids = ','.join(str(i) for i in range(101))
+        self.assertEqual(self.client.get('/api/movies/db/batch/', {'ids': ids}).status_code, 400)
+
+
+class MovieHydrationTest(APITestCase):
+    """DB에 없는 영화 상세 → TMDB 조회 후 저장, 동시 요청은 한 번만 조회"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_miss_is_written_back(self):
+        detail = {'id': 7, 'title': '새 영화', 'genres': [{'id': 18, 'name': '드라마'}], 'release_date': '2024-05-01'}
+        client = mock.Mock()
+        client.get.return_value = detail
+        with mock.patch('movies.hydration.get_client', return_value=client):
+            response = self.client.get('/api/movies/db/7/')
+            self.client.get('/api/movies/db/7/')
+
+        client.get.assert_called_once()
+        self.assertEqual((response.data['tmdb_id'], response.data['title'], response.data['year']), (7, '새 영화', 2024))
+        movie = Movie.objects.get(tmdb_id=7)
+        self.assertEqual(list(movie.genre_links.values_list('genre_id', flat=True)), [18])
+
+    # 원자적인 add 가 있는 캐시에서만 워커 사이 잠금 사용
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_waits_for_other_worker_holding_lock(self):
+        client = mock.Mock()
+        with cache_lock('lock:movie-hydrate:8', 30), mock.patch('movies.hydration.get_client', return_value=client):
+            # 다른 워커가 잠금을 잡고 저장을 끝낸 상황
+            Movie.objects.create(tmdb_id=8, title='저장됨', original_title='')
+            self.assertEqual(hydrate_movie(8).title, '저장됨')
+        client.get.assert_not_called()
+
+    def test_file_cache_does_not_claim_locks(self):
+        # file 캐시의 add 는 확인 후 쓰기라 잠금으로 쓰지 않음 (둘 다 잡은 것으로 진행)
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': tmpdir.name,
+        }}):
+            with cache_lock('lock:test', 30) as first, cache_lock('lock:test', 30) as second:
+                self.assertEqual((first, second), (True, True))
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            with cache_lock('lock:test', 30) as first, cache_lock('lock:test', 30) as second:
+                self.assertEqual((first, second), (True, False))
+
+    def test_single_flight_coalesces_threads(self):
+        flight = SingleFlight()
+        calls = []
+
+        def work():
+            calls.append(1)
+            time.sleep(0.2)
+            return 'result'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(flight.do('key', work))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['result'] * 5)
+
+
+class StubTMDBClient:
+    """영화 id 별 응답 지연 / 실패를 흉내 내는 TMDB 클라이언트 (동시 호출 수 기록)"""
+
+    def __init__(self, delays=None, failures=()):
+        self.delays = delays or {}
+        self.failures = set(failures)
+        self.calls = []
+        self.max_active = 0
+        self._active = 0
+        self._lock = threading.Lock()
+        # 테스트가 끝나면 set() 해서 아직 대기 중인 작업 스레드를 바로 풀어줌
+        self.release = threading.Event()
+
+    def get(self, path):
+        movie_id = int(path.strip('/').split('/')[1])
+        with self._lock:
+            self.calls.append(movie_id)
+            self._active += 1
+            self.max_active = max(self.max_active, self._active)
+        try:
+            self.release.wait(self.delays.get(movie_id, 0))
+            if movie_id in self.failures:
+                raise requests.exceptions.HTTPError('500 Server Error')
+            return {'id': movie_id, 'title': f'TMDB {movie_id}'}
+        finally:
+            with self._lock:
+                self._active -= 1
+
+
+class FetchMovieDetailsTest(APITestCase):
+    """DB에 없는 영화만 TMDB 동시 조회, 전체 마감 시간 초과분은 부분 정보로 응답"""
+
+    def setUp(self):
+        cache.clear()
+
+    def use_client(self, client):
+        self.addCleanup(client.release.set)
+        patcher = mock.patch('movies.tmdb.get_client', return_value=client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return client
+
+    def test_fetches_concurrently(self):
+        client = self.use_client(StubTMDBClient(delays={movie_id: 0.2 for movie_id in range(1, 7)}))
+        started = time.monotonic()
+        results = fetch_movie_details(list(range(1, 7)), deadline=2)
+
+        self.assertEqual(sorted(results), [1, 2, 3, 4, 5, 6])
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertGreater(client.max_active, 1)
+
+    def test_deadline_drops_slow_and_failed_fetches(self):
+        self.use_client(StubTMDBClient(delays={2: 5}, failures={3}))
+        started = time.monotonic()
+        results = fetch_movie_details([1, 2, 3], deadline=0.3)
+
+        self.assertEqual(results, {1: {'id': 1, 'title': 'TMDB 1'}})
+        self.assertLess(time.monotonic() - started, 2)
+
+    def test_endpoint_returns_partial_entries_in_count_order(self):
+        Movie.objects.create(tmdb_id=10, title='DB 영화', original_title='')
+        for movie_id, count in ((10, 3), (11, 2), (12, 1)):
+            MovieEmotionStats.objects.create(movie_id=movie_id, joy_count=count)
+        client = self.use_client(StubTMDBClient(delays={12: 5}))
+
+        with self.settings(TMDB_BATCH_DEADLINE=0.3):
+            response = self.client.get('/api/movies/emotion-sorted/', {'emotion': 'joy'})
+
+        self.assertEqual(sorted(client.calls), [11, 12])
+        results = response.data['results']
+        self.assertEqual([movie['id'] for movie in results], [10, 11, 12])
+        self.assertEqual([movie['emotion_count'] for movie in results], [3, 2, 1])
+        self.assertEqual((results[0]['title'], results[1]['title']), ('DB 영화', 'TMDB 11'))
+        self.assertTrue(results[2]['partial'])
+        self.assertNotIn('partial', results[1])
+
+
+class FakeClock:
+    """movies.tmdb 의 time 모듈 대신 쓰는 가짜 시계"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TMDBClientCacheTest(APITestCase):
+    """TMDB 응답 캐시: 엔드포인트별 TTL, LRU 제거, stale 응답, 적중/미스 카운터"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('movies.tmdb.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_client(self, **options):
+        client = TMDBClient(base_url='https://tmdb.test', api_key='key', **options)
+        client.session = mock.Mock()
+        client.session.get.side_effect = lambda url, **kwargs: self.ok({'url': url})
+        return client
+
+    def ok(self, data):
+        response = mock.Mock()
+        response.json.return_value = data
+        return response
+
+    def test_ttl_depends_on_endpoint(self):
+        client = self.make_client()
+        client.get('/movie/popular')
+        client.get('/movie/1')
+
+        # popular 5분, 상세 1시간
+        self.clock.sleep(301)
+        client.get('/movie/popular')
+        client.get('/movie/1')
+        self.assertEqual(client.session.get.call_count, 3)
+
+        self.clock.sleep(60 * 60)
+        client.get('/movie/1')
+        self.assertEqual(client.session.get.call_count, 4)
+
+    def test_params_and_language_are_part_of_key(self):
+        client = self.make_client()
+        client.get('/discover/movie', {'page': 1, 'with_genres': 28})
+        client.get('/discover/movie', {'with_genres': 28, 'page': 1})
+        client.get('/discover/movie', {'page': 2, 'with_genres': 28})
+        client.get('/discover/movie', {'page': 1, 'with_genres': 28}, language='en-US')
+        self.assertEqual(client.session.get.call_count, 3)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        client = self.make_client(cache_maxsize=2)
+        client.get('/movie/1')
+        client.get('/movie/2')
+        client.get('/movie/1')
+        client.get('/movie/3')
+
+        self.assertEqual(len(client.cache), 2)
+        client.get('/movie/1')
+        self.assertEqual(client.session.get.call_count, 3)
+        client.get('/movie/2')
+        self.assertEqual(client.session.get.call_count, 4)
+
+    def test_stale_entry_is_served_only_within_stale_ttl(self):
+        client = self.make_client(stale_ttl=600)
+        first = client.get('/movie/popular')
+        client.session.get.side_effect = requests.exceptions.ReadTimeout('slow')
+
+        self.clock.sleep(300 + 599)
+        self.assertEqual(client.get('/movie/popular'), first)
+
+        self.clock.sleep(2)
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            client.get('/movie/popular')
+        # stale 기간도 지난 항목은 캐시에서 삭제
+        self.assertEqual(len(client.cache), 0)
+
+    def test_errors_are_not_cached_and_use_cache_false_bypasses(self):
+        client = self.make_client()
+        client.session.get.side_effect = requests.exceptions.ConnectionError('down')
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            client.get('/movie/1')
+        self.assertEqual(len(client.cache), 0)
+
+        client.session.get.side_effect = lambda url, **kwargs: self.ok({'url': url})
+        client.get('/movie/1', use_cache=False)
+        self.assertEqual(len(client.cache), 0)
+
+    def test_stats_and_returned_copies(self):
+        client = self.make_client(stale_ttl=600)
+        data = client.get('/movie/1')
+        data['title'] = '수정'
+        self.assertNotIn('title', client.get('/movie/1'))
+
+        self.clock.sleep(60 * 60 + 1)
+        client.session.get.side_effect = requests.exceptions.ReadTimeout('slow')
+        client.get('/movie/1')
+
+        stats = client.stats()
+        self.assertEqual(
+            (stats['hits'], stats['misses'], stats['stale_hits'], stats['size'], stats['maxsize']),
+            (1, 2, 1, 1, 1024),
+        )
+        client.cache.clear()
+        stats = client.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['stale_hits'], stats['size']), (0, 0, 0, 0))
+
+
+class TMDBCircuitBreakerTest(APITestCase):
+    """TMDB 서킷 브레이커 + stale-if-error + DB 대체 응답"""
+
+    def make_client(self, **breaker_options):
+        client = TMDBClient(
+            base_url='https://tmdb.test', api_key='key',
+            breaker=CircuitBreaker(min_calls=2, window=4, open_seconds=60, **breaker_options),
+        )
+        client.session = mock.Mock()
+        return client
+
+    def ok(self, data):
+        response = mock.Mock()
+        response.json.return_value = data
+        return response
+
+    def test_trips_and_fails_fast(self):
+        client = self.make_client()
+        client.session.get.side_effect = requests.exceptions.ConnectTimeout('timeout')
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.ConnectTimeout):
+                client.get('/movie/1', use_cache=False)
+
+        with self.assertRaises(CircuitOpenError):
+            client.get('/movie/1', use_cache=False)
+        self.assertEqual(client.session.get.call_count, 2)
+        stats = client.stats()['circuit']
+        self.assertEqual((stats['state'], stats['trips'], stats['rejected']), ('open', 1, 1))
+
+    def test_half_open_probe_closes_circuit(self):
+        client = self.make_client()
+        client.session.get.side_effect = requests.exceptions.ConnectionError('down')
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                client.get('/movie/1', use_cache=False)
+
+        client.breaker.opened_at -= 61
+        client.session.get.side_effect = None
+        client.session.get.return_value = self.ok({'id': 1})
+        self.assertEqual(client.get('/movie/1', use_cache=False), {'id': 1})
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_probe_released_on_unexpected_error(self):
+        client = self.make_client()
+        client.session.get.side_effect = requests.exceptions.ConnectionError('down')
+        for _ in range(2):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                client.get('/movie/1', use_cache=False)
+
+        # 시험 호출이 요청 예외가 아닌 예외로 끝나도 다시 open → 다음 시험 호출 허용
+        client.breaker.opened_at -= 61
+        client.session.get.side_effect = KeyError('results')
+        with self.assertRaises(KeyError):
+            client.get('/movie/1', use_cache=False)
+        self.assertEqual(client.breaker.state, CircuitBreaker.OPEN)
+
+        client.breaker.opened_at -= 61
+        client.session.get.side_effect = None
+        client.session.get.return_value = self.ok({'id': 1})
+        self.assertEqual(client.get('/movie/1', use_cache=False), {'id': 1})
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_client_errors_do_not_trip(self):
+        client = self.make_client()
+        not_found = requests.exceptions.HTTPError(response=mock.Mock(status_code=404))
+        client.session.get.return_value.raise_for_status.side_effect = not_found
+        for _ in range(3):
+            with self.assertRaises(requests.exceptions.HTTPError):
+                client.get('/movie/0', use_cache=False)
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_serves_stale_payload_on_error(self):
+        client = self.make_client()
+        client.session.get.return_value = self.ok({'results': [1]})
+        client.get('/movie/popular')
+
+        # TTL 만료 후 TMDB 장애
+        key = client._cache_key('/movie/popular', None, 'ko-KR')
+        _, value = client.cache._data[key]
+        client.cache._data[key] = (time.monotonic() - 60, value)
+        client.session.get.side_effect = requests.exceptions.ReadTimeout('slow')
+
+        self.assertEqual(client.get('/movie/popular'), {'results': [1]})
+        self.assertEqual(client.stats()['stale_hits'], 1)
+
+    def test_popular_falls_back_to_db(self):
+        Movie.objects.create(tmdb_id=1, title='A', original_title='', popularity=5)
+        client = mock.Mock()
+        client.get.side_effect = CircuitOpenError('open')
+        with mock.patch('movies.views.get_client', return_value=client):
+            response = self.client.get('/api/movies/popular/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['source'], 'db')
+        self.assertEqual(response.data['results'][0]['id'], 1)
+
+
+class RequestMetricsTest(APITestCase):
+    """요청별 지표 미들웨어 + /metrics"""
+
+    def setUp(self):
+        cache.clear()
+        Movie.objects.create(tmdb_id=1, title='A', original_title='')
+
+    def test_records_route_metrics(self):
+        response = self.client.get('/api/movies/db/1/')
+        self.assertIn('db;dur=', response['Server-Timing'])
+
+        metrics = self.client.get('/metrics').content.decode()
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="api/movies/db/<int:movie_id>/",status="200"}', metrics)
+        self.assertIn('cache_requests_total{cache="response",result="miss",scope="movie"}', metrics)
+
+    def test_metrics_token(self):
+        with self.settings(METRICS_TOKEN='secret'):
+            self.assertEqual(self.client.get('/metrics').status_code, 401)
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret').status_code, 200)
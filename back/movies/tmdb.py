@@ -0,0 +1,442 @@
+"""
+TMDB API 공용 클라이언트
+
+- requests.Session 커넥션 풀을 재사용해서 요청마다 TCP/TLS 핸드셰이크를 반복하지 않음
+- 응답을 메모리에 캐시 (최대 개수 + 엔드포인트 종류별 TTL)
+- 캐시 적중/미스 카운터 제공
+- 서킷 브레이커: 최근 호출의 실패/지연 비율이 높으면 TMDB 호출을 잠시 막고 바로 실패 (워커가 TMDB 대기에 묶이지 않음)
+- stale-if-error: TMDB 실패 시 TTL 이 지난 캐시라도 STALE_TTL 안이면 마지막 정상 응답 반환
+"""
+import contextvars
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from final_project.metrics import record_cache, record_tmdb_call
+
+DEFAULT_LANGUAGE = "ko-KR"
+
+# 엔드포인트 종류별 캐시 TTL (초)
+CACHE_TTLS = {
+    "popular": 300,
+    "detail": 60 * 60,
+    "discover": 10 * 60,
+    "search": 5 * 60,
+    "changes": 60,
+    "default": 5 * 60,
+}
+
+# TTL 이 지난 캐시 항목도 TMDB 장애 시 응답으로 쓸 수 있는 기간 (초)
+STALE_TTL = 24 * 60 * 60
+
+_DETAIL_PATH = re.compile(r"^/movie/\d+/?$")
+
+
+def endpoint_type(path):
+    """요청 경로로 엔드포인트 종류(캐시 TTL 구분용)를 판별"""
+    if path.startswith("/movie/popular"):
+        return "popular"
+    if path.startswith("/movie/changes"):
+        return "changes"
+    if _DETAIL_PATH.match(path):
+        return "detail"
+    if path.startswith("/discover/"):
+        return "discover"
+    if path.startswith("/search/"):
+        return "search"
+    return "default"
+
+
+class TTLCache:
+    """
+    크기 제한이 있는 LRU + TTL 캐시 (스레드 안전)
+
+    TTL 이 지난 항목도 stale_ttl 동안은 지우지 않고 get_stale() 로 읽을 수 있다.
+    """
+
+    def __init__(self, maxsize=1024, stale_ttl=0):
+        self.maxsize = maxsize
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None and entry[0] + self.stale_ttl <= now:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def get_stale(self, key):
+        """TTL 이 지났어도 stale_ttl 안이면 반환 (TMDB 장애 시 대체 응답용)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] + self.stale_ttl <= now:
+                return None
+            self.stale_hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.stale_hits = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RateLimiter:
+    """토큰 버킷 방식 요청 속도 제한 (초당 rate 개, 최대 burst 개까지 몰아서 허용)"""
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate 는 0보다 커야 합니다.")
+        self.rate = rate
+        self.capacity = burst or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_seconds = (1 - self.tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """서킷이 열려 있어 TMDB 를 호출하지 않고 바로 실패 (기존 RequestException 처리에 그대로 걸림)"""
+
+
+class CircuitBreaker:
+    """
+    최근 window 개 호출 결과로 동작하는 서킷 브레이커 (스레드 안전, 프로세스별 상태)
+
+    - closed: 정상. 최근 호출이 min_calls 개 이상이고 실패율이 failure_rate 이상이면 open
+      (slow_call 초보다 오래 걸린 호출도 실패로 셈)
+    - open: open_seconds 동안 모든 호출을 바로 CircuitOpenError 로 거절
+    - half_open: 시험 호출 하나만 허용. 성공하면 closed, 실패하면 다시 open
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_rate=0.5, min_calls=10, window=20, slow_call=2.0, open_seconds=30):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.slow_call = slow_call
+        self.open_seconds = open_seconds
+        self.state = self.CLOSED
+        self.trips = 0
+        self.rejected = 0
+        self.opened_at = None
+        self.last_error = None
+        self._results = deque(maxlen=window)
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """호출해도 되면 True (half_open 이면 시험 호출 하나만 허용)"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.open_seconds:
+                    self.rejected += 1
+                    return False
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    self.rejected += 1
+                    return False
+                self._probing = True
+            return True
+
+    def record(self, ok, elapsed, error=None):
+        failed = not ok or elapsed > self.slow_call
+        with self._lock:
+            if failed:
+                self.last_error = error or f"slow call ({elapsed:.2f}s)"
+            if self.state == self.HALF_OPEN:
+                self._probing = False
+                if failed:
+                    self._open()
+                else:
+                    self.state = self.CLOSED
+                    self._results.clear()
+                return
+
+            self._results.append(failed)
+            if (
+                self.state == self.CLOSED
+                and len(self._results) >= self.min_calls
+                and sum(self._results) / len(self._results) >= self.failure_rate
+            ):
+                self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.trips += 1
+        self._results.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "trips": self.trips,
+                "rejected": self.rejected,
+                "recent_calls": len(self._results),
+                "recent_failures": sum(self._results),
+                "open_for": (
+                    max(0.0, round(self.open_seconds - (time.monotonic() - self.opened_at), 1))
+                    if self.state == self.OPEN else 0
+                ),
+                "last_error": self.last_error,
+            }
+
+
+def _is_upstream_failure(error):
+    """서킷 실패로 셀 예외 (404 같은 요청 오류는 TMDB 상태와 무관)"""
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return True
+
+
+class TMDBClient:
+    """커넥션 풀 + 응답 캐시를 가진 TMDB 클라이언트"""
+
+    def __init__(self, base_url, api_key, timeout=5, pool_size=20, cache_maxsize=1024, rate_limiter=None,
+                 breaker=None, stale_ttl=STALE_TTL):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self.cache = TTLCache(maxsize=cache_maxsize, stale_ttl=stale_ttl)
+        self.rate_limiter = rate_limiter
+        self.breaker = breaker
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _cache_key(self, path, params, language):
+        return (path, language, tuple(sorted((params or {}).items())))
+
+    def get(self, path, params=None, language=DEFAULT_LANGUAGE, use_cache=True, timeout=None):
+        """
+        TMDB GET 요청 후 JSON(dict) 반환
+
+        실패 시 requests.exceptions.RequestException 을 그대로 올린다.
+        (서킷이 열려 있으면 호출 없이 CircuitOpenError)
+        use_cache 인 요청은 실패 시 만료된 캐시라도 STALE_TTL 안이면 그 응답을 대신 반환한다.
+        캐시된 dict 는 여러 요청이 공유하므로 반환값은 얕은 복사본이다.
+        """
+        key = self._cache_key(path, params, language)
+        endpoint = endpoint_type(path)
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                record_cache("tmdb", endpoint, "hit")
+                return dict(cached)
+            record_cache("tmdb", endpoint, "miss")
+
+        try:
+            data = self._request(path, params, language, timeout)
+        except requests.exceptions.RequestException:
+            stale = self.cache.get_stale(key) if use_cache else None
+            if stale is None:
+                raise
+            record_cache("tmdb", endpoint, "stale")
+            return dict(stale)
+
+        if use_cache:
+            ttl = CACHE_TTLS.get(endpoint, CACHE_TTLS["default"])
+            self.cache.set(key, data, ttl)
+        return dict(data)
+
+    def _request(self, path, params, language, timeout):
+        endpoint = endpoint_type(path)
+        if self.breaker is not None and not self.breaker.allow():
+            record_tmdb_call(endpoint, "rejected", 0)
+            raise CircuitOpenError(f"TMDB 서킷 open - {path} 호출 생략")
+
+        query = {"api_key": self.api_key, "language": language}
+        query.update(params or {})
+
+        # 어떤 예외로 끝나든(요청 예외가 아닌 예외, 스레드 중단 포함) 결과를 브레이커에 남김
+        # (남기지 않으면 half_open 시험 호출 표시가 풀리지 않아 서킷이 계속 거절함)
+        ok, error = False, "요청 중단"
+        started = time.monotonic()
+        try:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            started = time.monotonic()
+            res = self.session.get(
+                f"{self.base_url}{path}",
+                params=query,
+                timeout=timeout or self.timeout,
+            )
+            res.raise_for_status()
+            data = res.json()
+            ok, error = True, None
+        except (requests.exceptions.RequestException, ValueError) as e:
+            ok, error = not _is_upstream_failure(e), str(e)
+            record_tmdb_call(endpoint, "error", time.monotonic() - started)
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            if self.breaker is not None:
+                self.breaker.record(ok, elapsed, error)
+        record_tmdb_call(endpoint, "ok", elapsed)
+        return data
+
+    def stats(self):
+        """캐시 적중/미스 카운터 + 서킷 상태"""
+        return {
+            "hits": self.cache.hits,
+            "misses": self.cache.misses,
+            "stale_hits": self.cache.stale_hits,
+            "size": len(self.cache),
+            "maxsize": self.cache.maxsize,
+            "circuit": self.breaker.stats() if self.breaker is not None else None,
+        }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """프로세스 전역에서 공유하는 TMDB 클라이언트"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = TMDBClient(
+                    base_url=settings.TMDB_BASE_URL,
+                    api_key=settings.TMDB_API_KEY,
+                    timeout=(settings.TMDB_CONNECT_TIMEOUT, settings.TMDB_TIMEOUT),
+                    pool_size=settings.TMDB_POOL_SIZE,
+                    cache_maxsize=settings.TMDB_CACHE_MAXSIZE,
+                    breaker=CircuitBreaker(
+                        failure_rate=settings.TMDB_BREAKER_FAILURE_RATE,
+                        min_calls=settings.TMDB_BREAKER_MIN_CALLS,
+                        slow_call=settings.TMDB_BREAKER_SLOW_CALL,
+                        open_seconds=settings.TMDB_BREAKER_OPEN_SECONDS,
+                    ),
+                    stale_ttl=settings.TMDB_STALE_TTL,
+                )
+    return _client
+
+
+_executor = None
+
+
+def get_executor():
+    """TMDB 동시 호출용 공유 스레드 풀 (동시 요청 수 상한)"""
+    global _executor
+    if _executor is None:
+        with _client_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.TMDB_MAX_WORKERS,
+                    thread_name_prefix="tmdb",
+                )
+    return _executor
+
+
+def fetch_movie_details(movie_ids, deadline=None):
+    """
+    여러 영화의 TMDB 상세 정보를 동시에 조회
+
+    전체 대기 시간은 deadline(초)로 제한하고, 그 안에 도착한 것만
+    {movie_id: data} 로 반환한다. 실패하거나 늦은 영화는 결과에서 빠진다.
+    """
+    if not movie_ids:
+        return {}
+
+    client = get_client()
+    executor = get_executor()
+    # 요청 단위 지표(final_project/metrics.py)가 작업 스레드에서도 집계되도록 컨텍스트 복사
+    futures = {
+        executor.submit(contextvars.copy_context().run, client.get, f"/movie/{movie_id}"): movie_id
+        for movie_id in movie_ids
+    }
+    done, not_done = wait(futures, timeout=deadline or settings.TMDB_BATCH_DEADLINE)
+
+    # 아직 시작 안 한 작업은 취소 (이미 실행 중인 건 끝나면 캐시에 남음)
+    for future in not_done:
+        future.cancel()
+
+    results = {}
+    for future in done:
+        if future.exception() is None:
+            results[futures[future]] = future.result()
+    return results
+
+
+def parse_date(date_string):
+    if not date_string:
+        return None
+    try:
+        return datetime.strptime(date_string, '%Y-%m-%d').date()
+    except (ValueError, TypeError):
+        return None
+
+
+def movie_fields(detail, summary=None):
+    """TMDB 영화 응답(상세, 목록 항목)을 Movie 모델 필드 dict 로 변환"""
+    data = {**(summary or {}), **detail}
+    return {
+        'title': data.get('title', ''),
+        'original_title': data.get('original_title', ''),
+        'overview': data.get('overview', ''),
+        'poster_path': data.get('poster_path', ''),
+        'backdrop_path': data.get('backdrop_path', ''),
+        'release_date': parse_date(data.get('release_date')),
+        'runtime': data.get('runtime'),
+        'vote_average': data.get('vote_average', 0),
+        'vote_count': data.get('vote_count', 0),
+        'popularity': data.get('popularity', 0),
+        'genres': data.get('genres', []),
+        'original_language': data.get('original_language', ''),
+    }
+
+
+def payload_hash(fields):
+    """movie_fields() 결과의 내용 해시 (변경 감지용)"""
+    raw = json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
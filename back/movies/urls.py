@@ -8,8 +8,23 @@ urlpatterns = [
     path('<int:movie_id>/', views.movie_detail),
 
     # 새로 추가: DB 사용 엔드포인트
+    path('db/', views.movies_db),
     path('db/popular/', views.popular_movies_db),
+    path('db/batch/', views.movies_batch_db),
     path('db/<int:movie_id>/', views.movie_detail_db),
+    path('db/<int:movie_id>/similar/', views.similar_movies_db),
+
+    # 개인 추천 (협업 필터링, 신규 사용자는 인기 영화)
+    path('for-you/', views.movies_for_you),
+
+    # 홈 피드 (프로필 취향 기반)
+    path('home/', views.home_feed),
+
+    # DB 영화 검색 (TMDB 는 결과가 적을 때만 보충)
+    path('search/', views.search_movies_db),
+
+    # TMDB 연동 상태 (서킷 브레이커)
+    path('tmdb/status/', views.tmdb_status),
 
     # 감정별 영화 정렬
     path('emotion-sorted/', views.movies_by_emotion_count),
@@ -1,49 +1,74 @@
+import logging
+
 import requests
-from django.conf import settings
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Count, Q
+from django.conf import settings
+from django.db.models import Count, Q, Max
 
 # Community 앱에서 Review 모델 import
 try:
-    from community.models import Review
+    from community.models import Review, MovieEmotionStats
 except ImportError:
     Review = None
+    MovieEmotionStats = None
 
 # Movies 앱 모델 및 시리얼라이저
 try:
-    from .models import Movie
+    from .models import Movie, Genre, EmotionRecommendation, MovieNeighbor, UserRecommendation
     from .serializers import MovieSerializer, MovieListSerializer
 except ImportError:
     Movie = None
+    Genre = None
+    EmotionRecommendation = None
+    MovieNeighbor = None
+    UserRecommendation = None
     MovieSerializer = None
     MovieListSerializer = None
 
-TMDB_URL = "https://api.themoviedb.org/3"
+from .cache import CATALOG_SCOPE, FOR_YOU_SCOPE, SIMILAR_SCOPE
+from .search import search_movies
+from .home_feed import get_home_feed
+from .hydration import hydrate_movie
+from .recommendations import (
+    EMOTION_GENRES, VERSION_SCOPE as RECOMMENDATION_VERSION,
+    fallback_recommendations, has_been_built, normalize_emotion,
+)
+from .tmdb import DEFAULT_LANGUAGE, get_client, fetch_movie_details, movie_fields
+from final_project.cache_versions import get_version
+from final_project.conditional import conditional_get
+from final_project.response_cache import response_cache_key, get_or_build
+from final_project.pagination import (
+    paginate, PopularityCursorPagination, RatingCursorPagination, ReleaseDateCursorPagination,
+)
+
+logger = logging.getLogger(__name__)
+
+# TMDB 장애 시 DB 카탈로그에서 대신 내려줄 인기 영화 수 (TMDB 인기 영화 한 페이지)
+TMDB_FALLBACK_SIZE = 20
 
 # 인기 영화
 @api_view(['GET'])
 @permission_classes([AllowAny])  # 👈 추가
 def popular_movies(request):
-    url = f"{TMDB_URL}/movie/popular"
-    params = {
-        "api_key": settings.TMDB_API_KEY,
-        "language": "ko-KR",
-    }
-
     try:
-        res = requests.get(url, params=params)
-        res.raise_for_status()
-        data = res.json()
+        data = get_client().get("/movie/popular")
 
         return Response({
             "results": data.get("results", [])
         })
 
     except requests.exceptions.RequestException as e:
-        print(f"❌ 인기 영화 오류: {str(e)}")
+        logger.warning("TMDB 인기 영화 조회 실패 error=%s", e)
+        # TMDB 장애 (캐시에도 없음) → DB 카탈로그로 대체
+        movies = list(Movie.objects.order_by('-popularity', 'id')[:TMDB_FALLBACK_SIZE])
+        if movies:
+            return Response({
+                "results": [movie.to_tmdb_dict() for movie in movies],
+                "source": "db",
+            })
         return Response(
             {"error": str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -53,69 +78,86 @@ def popular_movies(request):
 @api_view(['GET'])
 @permission_classes([AllowAny])  # 👈 추가
 def movie_detail(request, movie_id):
-    url = f"{TMDB_URL}/movie/{movie_id}"
-    params = {
-        "api_key": settings.TMDB_API_KEY,
-        "language": "ko-KR",
-    }
-
     try:
-        print(f"🎬 영화 ID {movie_id} 조회 중...")  # 👈 디버깅용
-        
-        res = requests.get(url, params=params)
-        res.raise_for_status()
-        
-        movie_data = res.json()
-        
-        print(f"// 디버깅용 성공: {movie_data.get('title', 'Unknown')}")  # 👈 디버깅용
-        
+        movie_data = get_client().get(f"/movie/{movie_id}")
         return Response(movie_data)
 
     except requests.exceptions.RequestException as e:
-        print(f"❌ TMDB API 오류: {str(e)}")  # 👈 디버깅용
+        logger.warning("TMDB 영화 상세 조회 실패 movie_id=%s error=%s", movie_id, e)
+        # TMDB 장애 (캐시에도 없음) → DB에 저장된 영화면 그 정보로 대체
+        movie = Movie.objects.filter(tmdb_id=movie_id).first()
+        if movie is not None:
+            return Response(movie.to_tmdb_dict())
         return Response(
             {"error": str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
     except Exception as e:
-        print(f"❌ 예상치 못한 오류: {str(e)}")  # 👈 디버깅용
-        import traceback
-        traceback.print_exc()
+        logger.exception("영화 상세 오류 movie_id=%s", movie_id)
         return Response(
             {"error": str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
-# 영화 추천 시스템
-@api_view(['POST'])
+# 영화 추천 시스템 (감정별 추천 목록은 movies/recommendations.py 에서 미리 계산)
+@api_view(['GET', 'POST'])
 @permission_classes([AllowAny])  # 👈 추가
 def recommend_movies(request):
-    emotion = request.data.get("emotion")
-
-    url = f"{TMDB_URL}/movie/popular"
-    params = {
-        "api_key": settings.TMDB_API_KEY,
-        "language": "ko-KR",
-    }
+    """
+    감정별 추천 영화 (미리 계산된 테이블/캐시만 읽고 TMDB 는 호출하지 않음)
 
+    - emotion: 감정 (joy, sadness, anger, fear, excitement, calm, depression / melancholy)
+    - limit: 반환할 영화 수 (기본 20)
+    """
+    emotion = normalize_emotion(request.data.get("emotion") or request.GET.get("emotion"))
+    if emotion is None:
+        return Response(
+            {"error": f"emotion 은 {', '.join(EMOTION_GENRES)} 중 하나여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     try:
-        res = requests.get(url, params=params)
-        res.raise_for_status()
-        data = res.json()
-
-        return Response({
-            "emotion": emotion,
-            "results": data.get("results", [])
-        })
-
-    except requests.exceptions.RequestException as e:
+        limit = int(request.data.get("limit") or request.GET.get("limit", 20))
+        limit = min(max(limit, 1), settings.RECOMMENDATION_LIMIT)
+    except (TypeError, ValueError):
         return Response(
-            {"error": str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            {"error": "limit 은 숫자여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST
         )
 
+    def build():
+        # 한 번도 계산한 적이 없으면 요청 안에서 계산하지 않고 장르 일치 인기 영화로 대신함
+        # (refresh_emotion_recommendations 명령이 끝나면 버전이 올라가 다음 요청부터 계산된 목록)
+        if not has_been_built():
+            return [
+                {**movie.to_tmdb_dict(), "score": None}
+                for movie in fallback_recommendations(emotion, limit)
+            ]
+        recommendations = (
+            EmotionRecommendation.objects.filter(emotion=emotion)
+            .select_related('movie').order_by('rank')[:limit]
+        )
+        return [
+            {**recommendation.movie.to_tmdb_dict(), "score": round(recommendation.score, 4)}
+            for recommendation in recommendations
+        ]
+
+    key = response_cache_key('recommend', f"{emotion}:{limit}", get_version(*RECOMMENDATION_VERSION))
+    results, _ = get_or_build(key, build)
+
+    return Response({
+        "emotion": emotion,
+        "results": results
+    })
+
 # 이 아래부터는 db로 영화 데이터를 불러온 이후 추가되는 부분 정상 작동하지 않으면 다시 이전으로 revert
 
+# TMDB 연동 상태 (모니터링용: 서킷 상태, 차단/트립 횟수, 캐시 적중률)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def tmdb_status(request):
+    return Response(get_client().stats())
+
+
 # 감정별 영화 정렬 API
 @api_view(['GET'])
 @permission_classes([AllowAny])
@@ -147,32 +189,24 @@ def movies_by_emotion_count(request):
             )
 
         # 유효한 감정인지 확인
-        valid_emotions = ['joy', 'sadness', 'anger', 'fear', 'excitement', 'calm', 'depression']
+        valid_emotions = [code for code, _ in Review.EMOTION_CHOICES]
         if emotion not in valid_emotions:
             return Response(
                 {"error": f"유효하지 않은 감정입니다. 가능한 값: {', '.join(valid_emotions)}"},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        print(f"🔍 감정별 정렬 요청: emotion={emotion}, order={order}, limit={limit}")
-
-        # 1. 해당 감정을 포함한 리뷰를 movie_id별로 집계
-        # SQLite와 PostgreSQL 모두 지원하는 방법 사용
-        from django.db.models import JSONField
-        from django.db.models.functions import Cast
-        from django.db.models import TextField
-
-        # 모든 리뷰 가져오기
-        all_reviews = Review.objects.all()
-
-        # Python에서 필터링 (JSONField contains가 SQLite에서 안 될 수 있음)
-        movie_emotion_counts = {}
-        for review in all_reviews:
-            if emotion in review.emotion_tags:
-                movie_id = review.movie_id
-                movie_emotion_counts[movie_id] = movie_emotion_counts.get(movie_id, 0) + 1
+        # 1. 영화별 감정 카운터(MovieEmotionStats)에서 인덱스 정렬로 상위 N편 조회
+        count_field = MovieEmotionStats.count_field(emotion)
+        count_order = f'-{count_field}' if order == 'desc' else count_field
+        sorted_movies = (
+            MovieEmotionStats.objects
+            .filter(**{f'{count_field}__gt': 0})
+            .order_by(count_order, 'movie_id')
+            .values_list('movie_id', count_field)[:limit]
+        )
 
-        if not movie_emotion_counts:
+        if not sorted_movies:
             return Response({
                 "results": [],
                 "emotion": emotion,
@@ -180,43 +214,26 @@ def movies_by_emotion_count(request):
                 "message": f"'{emotion}' 감정의 리뷰가 없습니다."
             })
 
-        # 정렬
-        sorted_movies = sorted(
-            movie_emotion_counts.items(),
-            key=lambda x: x[1],
-            reverse=(order == 'desc')
-        )[:limit]
-
         movie_emotion_data = dict(sorted_movies)
-        print(f"✅ 집계 완료: {len(movie_emotion_data)}개 영화")
 
-        # 2. TMDB API에서 영화 정보 가져오기
+        # 2. DB에 있는 영화는 한 번의 쿼리로 가져오기
+        movies_by_id = {
+            movie.tmdb_id: movie.to_tmdb_dict()
+            for movie in Movie.objects.filter(tmdb_id__in=movie_emotion_data.keys())
+        }
+
+        # 3. DB에 없는 영화만 TMDB에서 동시에 가져오기 (전체 마감 시간 안에서)
+        missing_ids = [movie_id for movie_id in movie_emotion_data if movie_id not in movies_by_id]
+        movies_by_id.update(fetch_movie_details(missing_ids))
+
+        # 4. 집계 순서대로 결과 구성, 마감 시간 안에 못 받은 영화는 부분 정보만 반환
         movies_data = []
         for movie_id, emotion_count in movie_emotion_data.items():
-            try:
-                # TMDB API 호출
-                url = f"{TMDB_URL}/movie/{movie_id}"
-                params = {
-                    "api_key": settings.TMDB_API_KEY,
-                    "language": "ko-KR",
-                }
-
-                res = requests.get(url, params=params, timeout=5)
-
-                if res.status_code == 200:
-                    movie_data = res.json()
-                    movie_data['emotion_count'] = emotion_count
-                    movies_data.append(movie_data)
-
-            except Exception as e:
-                print(f"영화 {movie_id} 정보 가져오기 실패: {str(e)}")
-                continue
-
-        # 4. emotion_count 기준으로 정렬 (API 호출 순서가 바뀔 수 있으므로)
-        movies_data.sort(
-            key=lambda x: x['emotion_count'],
-            reverse=(order == 'desc')
-        )
+            movie_data = movies_by_id.get(movie_id)
+            if movie_data is None:
+                movie_data = {"id": movie_id, "partial": True}
+            movie_data['emotion_count'] = emotion_count
+            movies_data.append(movie_data)
 
         return Response({
             "results": movies_data,
@@ -226,28 +243,51 @@ def movies_by_emotion_count(request):
         })
 
     except Exception as e:
-        print(f"❌ 감정별 영화 정렬 오류: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("감정별 영화 정렬 오류 emotion=%s", request.GET.get("emotion"))
         return Response(
             {"error": str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+# 조건부 GET 검증값
+# 목록은 영화 삭제로 Max(updated_at) 이 과거로 돌아갈 수 있어 Last-Modified 없이 ETag 로만 검증
+# (카탈로그 버전 + 최근 수정 시각 + 영화 수: 일괄 갱신 / 한 편 수정 / 삭제 모두 반영)
+def _popular_movies_validators(request):
+    latest = Movie.objects.aggregate(last_updated=Max('updated_at'), total=Count('id'))
+    etag_source = (
+        f"movies:{get_version(*CATALOG_SCOPE)}:{latest['last_updated']}:{latest['total']}"
+        f"|{request.get_full_path()}"
+    )
+    return etag_source, None
+
+
+def _movie_detail_validators(request, movie_id):
+    row = Movie.objects.filter(tmdb_id=movie_id).values_list('id', 'updated_at').first()
+    if row is None:
+        # DB에 없으면 TMDB 프록시 응답이므로 검증값 없음
+        return None, None
+    return f"movie:{row[0]}:{row[1].isoformat()}", row[1]
+
+
 # DB에서 인기 영화 조회
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_get(_popular_movies_validators)
 def popular_movies_db(request):
-    """DB에서 인기 영화 반환"""
+    """DB에서 인기 영화 반환 (인기순 커서 페이지네이션, limit = 페이지 크기)"""
     try:
-        limit = int(request.GET.get('limit', 20))
-        movies = Movie.objects.all()[:limit]
-        serializer = MovieListSerializer(movies, many=True)
-        
-        return Response({
-            "results": serializer.data,
-            "total": Movie.objects.count()
-        })
+        def build():
+            return paginate(
+                request, Movie.objects.all(), PopularityCursorPagination,
+                lambda page: MovieListSerializer(page, many=True).data,
+            ).data
+
+        # DB 카탈로그는 ko-KR 로 저장됨
+        key = response_cache_key(
+            'popular', 'db', get_version(*CATALOG_SCOPE), request, language=DEFAULT_LANGUAGE
+        )
+        data, _ = get_or_build(key, build)
+        return Response(data)
     
     except Exception as e:
         return Response(
@@ -255,31 +295,276 @@ def popular_movies_db(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+# DB 영화 목록 정렬 옵션 → 커서 페이지네이션 (각 정렬 키에 인덱스 있음)
+MOVIE_SORTS = {
+    'popularity': PopularityCursorPagination,
+    'rating': RatingCursorPagination,
+    'latest': ReleaseDateCursorPagination,
+}
+
+
+def genre_facets():
+    """장르별 영화 수 (MovieGenre 를 장르로 묶는 집계 쿼리 한 번)"""
+    return list(
+        Genre.objects.annotate(count=Count('movie_links'))
+        .filter(count__gt=0).order_by('-count', 'id').values('id', 'name', 'count')
+    )
+
+
+# DB 영화 목록 (장르 필터 + 정렬 + 장르별 개수)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@conditional_get(_popular_movies_validators)
+def movies_db(request):
+    """
+    DB 영화 목록
+
+    Query Parameters:
+    - genre: TMDB 장르 ID (선택)
+    - sort: popularity(기본) | rating | latest
+    - limit: 페이지 크기 (커서 페이지네이션)
+
+    응답의 genres 는 전체 카탈로그의 장르별 영화 수 (필터 UI 용)
+    """
+    sort = request.GET.get('sort', 'popularity')
+    if sort not in MOVIE_SORTS:
+        return Response(
+            {"error": f"sort 는 {', '.join(MOVIE_SORTS)} 중 하나여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    movies = Movie.objects.all()
+    genre = request.GET.get('genre')
+    if genre:
+        try:
+            movies = movies.filter(genre_links__genre_id=int(genre))
+        except ValueError:
+            return Response(
+                {"error": "genre 는 숫자(TMDB 장르 ID)여야 합니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    if sort == 'latest':
+        movies = movies.filter(release_date__isnull=False)
+
+    def build():
+        page = paginate(
+            request, movies, MOVIE_SORTS[sort],
+            lambda page: MovieListSerializer(page, many=True).data,
+        ).data
+        return {**page, "genres": genre_facets()}
+
+    key = response_cache_key(
+        'movies', 'db', get_version(*CATALOG_SCOPE), request, language=DEFAULT_LANGUAGE
+    )
+    data, _ = get_or_build(key, build)
+    return Response(data)
+
+
+# 여러 영화 상세 한 번에 조회 (찜 목록 등), 한 번에 받을 수 있는 최대 ID 수
+BATCH_MAX_IDS = 100
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def movies_batch_db(request):
+    """
+    여러 영화를 요청 순서대로 반환
+
+    Query Parameters:
+    - ids: 쉼표로 구분한 TMDB 영화 ID 목록 (최대 100개)
+
+    DB에 있는 영화는 쿼리 한 번으로, 없는 영화만 TMDB에서 동시에 가져온다 (전체 마감 시간 안에서).
+    TMDB 에서 가져온 영화는 DB에 저장되지 않았으므로 id 가 null,
+    마감 시간 안에 못 받은 영화는 {"tmdb_id": ..., "partial": true} 로 반환한다.
+    """
+    try:
+        movie_ids = [int(movie_id) for movie_id in request.GET.get('ids', '').split(',') if movie_id.strip()]
+    except ValueError:
+        return Response(
+            {"error": "ids 는 쉼표로 구분한 숫자여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    # 중복 제거 (처음 나온 순서 유지)
+    movie_ids = list(dict.fromkeys(movie_ids))
+
+    if len(movie_ids) > BATCH_MAX_IDS:
+        return Response(
+            {"error": f"한 번에 최대 {BATCH_MAX_IDS}개까지 조회할 수 있습니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    found = {
+        movie['tmdb_id']: movie
+        for movie in MovieListSerializer(Movie.objects.filter(tmdb_id__in=movie_ids), many=True).data
+    }
+
+    missing_ids = [movie_id for movie_id in movie_ids if movie_id not in found]
+    for movie_id, detail in fetch_movie_details(missing_ids).items():
+        # 저장하지 않은 Movie 로 직렬화해서 DB 결과와 같은 형태로 맞춤
+        found[movie_id] = MovieListSerializer(Movie(tmdb_id=movie_id, **movie_fields(detail))).data
+
+    return Response({
+        "results": [found.get(movie_id, {"tmdb_id": movie_id, "partial": True}) for movie_id in movie_ids],
+    })
+
+
 # DB 우선, 없으면 API
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_get(_movie_detail_validators)
 def movie_detail_db(request, movie_id):
-    """DB에서 찾고, 없으면 TMDB API 호출"""
+    """DB에서 찾고, 없으면 TMDB API 에서 가져와 DB에 저장"""
     try:
-        movie = Movie.objects.get(tmdb_id=movie_id)
-        serializer = MovieSerializer(movie)
-        return Response(serializer.data)
+        key = response_cache_key('movie', movie_id, get_version('movie', movie_id), language=DEFAULT_LANGUAGE)
+        data, _ = get_or_build(key, lambda: MovieSerializer(Movie.objects.get(tmdb_id=movie_id)).data)
+        return Response(data)
         
     except Movie.DoesNotExist:
-        # DB에 없으면 TMDB API 호출 (기존 방식)
-        url = f"{TMDB_URL}/movie/{movie_id}"
-        params = {
-            "api_key": settings.TMDB_API_KEY,
-            "language": "ko-KR",
-        }
-
+        # DB에 없으면 TMDB에서 가져와 저장 (같은 영화 동시 요청은 TMDB 호출 한 번으로 합침)
         try:
-            res = requests.get(url, params=params, timeout=10)
-            res.raise_for_status()
-            return Response(res.json())
+            return Response(MovieSerializer(hydrate_movie(movie_id)).data)
 
         except requests.exceptions.RequestException as e:
             return Response(
                 {"error": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+
+# 비슷한 영화 (build_similar_movies 명령으로 미리 계산된 이웃을 순서대로 읽기만 함)
+SIMILAR_MAX_LIMIT = 50
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def similar_movies_db(request, movie_id):
+    """
+    콘텐츠 기반 비슷한 영화
+
+    Query Parameters:
+    - limit: 반환할 영화 수 (기본 10, 최대 50)
+    """
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), SIMILAR_MAX_LIMIT)
+    except ValueError:
+        return Response(
+            {"error": "limit 은 숫자여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    def build():
+        neighbors = list(
+            MovieNeighbor.objects.filter(movie__tmdb_id=movie_id)
+            .select_related('neighbor').order_by('rank')[:limit]
+        )
+        movies = MovieListSerializer([neighbor.neighbor for neighbor in neighbors], many=True).data
+        return [
+            {**movie, "score": round(neighbor.score, 4)}
+            for movie, neighbor in zip(movies, neighbors)
+        ]
+
+    key = response_cache_key('similar', f"{movie_id}:{limit}", get_version(*SIMILAR_SCOPE))
+    results, _ = get_or_build(key, build)
+    return Response({"movie_id": movie_id, "results": results})
+
+
+# 개인 추천 (train_recommendations 명령으로 미리 계산된 협업 필터링 결과)
+FOR_YOU_MAX_LIMIT = 50
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def movies_for_you(request):
+    """
+    로그인 사용자 맞춤 추천 (추천 기록이 없는 신규 사용자는 인기 영화)
+
+    Query Parameters:
+    - limit: 반환할 영화 수 (기본 20, 최대 50)
+    """
+    try:
+        limit = min(max(int(request.GET.get('limit', 20)), 1), FOR_YOU_MAX_LIMIT)
+    except ValueError:
+        return Response(
+            {"error": "limit 은 숫자여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    def build():
+        recommendations = list(
+            UserRecommendation.objects.filter(user=request.user)
+            .select_related('movie').order_by('rank')[:limit]
+        )
+        movies = MovieListSerializer([recommendation.movie for recommendation in recommendations], many=True).data
+        return [
+            {**movie, "score": round(recommendation.score, 4)}
+            for movie, recommendation in zip(movies, recommendations)
+        ]
+
+    # train_recommendations 가 다시 계산하면 FOR_YOU_SCOPE 버전이 올라감 (빈 결과도 캐시)
+    key = response_cache_key('for-you', f"{request.user.id}:{limit}", get_version(*FOR_YOU_SCOPE))
+    results, _ = get_or_build(key, build)
+    if results:
+        return Response({"source": "personalized", "results": results})
+
+    # 콜드 스타트: 인기 영화 (사용자와 무관하므로 공유 캐시)
+    key = response_cache_key('popular', f"for-you:{limit}", get_version(*CATALOG_SCOPE))
+    results, _ = get_or_build(
+        key, lambda: MovieListSerializer(Movie.objects.order_by('-popularity', 'id')[:limit], many=True).data
+    )
+    return Response({"source": "popular", "results": results})
+
+
+# 홈 피드 (프로필 취향 기반, 사용자별 캐시)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def home_feed(request):
+    """
+    프로필의 선호 장르/국가로 고른 홈 화면 영화 목록
+
+    취향 필드를 수정하거나 영화 카탈로그가 갱신될 때만 다시 계산되고,
+    그 외에는 사용자별 캐시 한 건만 읽는다.
+    """
+    return Response(get_home_feed(request.user))
+
+
+# DB 영화 검색 (전문 검색 인덱스), 로컬 결과가 적을 때만 TMDB 검색으로 보충
+SEARCH_MIN_LOCAL_RESULTS = 5
+SEARCH_MAX_LIMIT = 50
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def search_movies_db(request):
+    """
+    제목/원제/줄거리 검색 (관련도 + 인기도 순)
+
+    Query Parameters:
+    - q: 검색어
+    - limit: 반환할 영화 수 (기본 20, 최대 50)
+    """
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return Response(
+            {"error": "q 파라미터가 필요합니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        limit = min(max(int(request.GET.get('limit', 20)), 1), SEARCH_MAX_LIMIT)
+    except ValueError:
+        return Response(
+            {"error": "limit 은 숫자여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # TMDB 검색 응답과 같은 형태 (id = tmdb_id)
+    results = [movie.to_tmdb_dict() for movie in search_movies(query, limit)]
+    source = "db"
+
+    if len(results) < min(SEARCH_MIN_LOCAL_RESULTS, limit):
+        try:
+            data = get_client().get("/search/movie", params={"query": query, "page": 1})
+        except requests.exceptions.RequestException:
+            # TMDB 장애 시에도 로컬 결과는 그대로 반환
+            pass
+        else:
+            seen = {movie['id'] for movie in results}
+            results += [movie for movie in data.get('results', []) if movie['id'] not in seen][:limit - len(results)]
+            source = "db+tmdb"
+
+    return Response({"query": query, "source": source, "results": results})
@@ -1,10 +1,26 @@
 import apiClient from './axios'
 
 /**
- * 영화별 리뷰 목록 조회
+ * 목록 응답의 next URL 에서 커서 값만 추출
  */
-export const getReviews = (movieId) => {
-  return apiClient.get(`/community/reviews/${movieId}/`)
+export const getNextCursor = (nextUrl) => {
+  return nextUrl ? new URL(nextUrl).searchParams.get('cursor') : null
+}
+
+/**
+ * 영화별 리뷰 목록 조회 (커서 페이지네이션)
+ */
+export const getReviews = (movieId, cursor = null) => {
+  return apiClient.get(`/community/reviews/${movieId}/`, {
+    params: cursor ? { cursor } : {}
+  })
+}
+
+/**
+ * 리뷰 검색 (q, emotion, min_rating, max_rating, movie_id, author, cursor)
+ */
+export const searchReviews = (params) => {
+  return apiClient.get('/community/reviews/search/', { params })
 }
 
 /**
@@ -1,5 +1,6 @@
 // src/api/movies.js
 import tmdb from "./tmdb";
+import apiClient from "./axios";
 
 /**
  * 인기 영화 목록
@@ -27,10 +28,61 @@ export const searchMovies = async (query) => {
 }
 
 /**
- * DB에서 영화 검색 (제목 기반)
+ * DB에서 영화 검색 (제목/원제/줄거리 전문 검색, 결과가 적으면 서버에서 TMDB 로 보충)
  */
 export const searchMoviesInDB = (query) => {
   return apiClient.get(`/movies/search/`, {
     params: { q: query }
   })
-}
\ No newline at end of file
+}
+
+/**
+ * 감정별 추천 영화 (서버에서 미리 계산된 목록)
+ */
+export const getEmotionRecommendations = (emotion) => {
+  return apiClient.post(`/movies/recommend/`, { emotion })
+}
+
+/**
+ * 비슷한 영화 (서버에서 미리 계산된 콘텐츠 기반 이웃)
+ */
+export const getSimilarMovies = (movieId, limit = 10) => {
+  return apiClient.get(`/movies/db/${movieId}/similar/`, {
+    params: { limit }
+  })
+}
+
+/**
+ * 개인 맞춤 추천 (협업 필터링, 신규 사용자는 인기 영화)
+ */
+export const getForYouMovies = (limit = 20) => {
+  return apiClient.get(`/movies/for-you/`, {
+    params: { limit }
+  })
+}
+
+/**
+ * DB 영화 목록 (장르 필터 + 정렬, 응답의 genres 는 장르별 영화 수)
+ * sort: popularity | rating | latest
+ */
+export const getMoviesFromDB = ({ genre, sort = 'popularity', limit = 20 } = {}) => {
+  return apiClient.get(`/movies/db/`, {
+    params: { genre, sort, limit }
+  })
+}
+
+/**
+ * 여러 영화 한 번에 조회 (요청 순서 유지, 최대 100개)
+ */
+export const getMoviesBatch = (movieIds) => {
+  return apiClient.get(`/movies/db/batch/`, {
+    params: { ids: movieIds.join(',') }
+  })
+}
+
+/**
+ * 홈 피드 (프로필 선호 장르/국가 기반, 로그인 필요)
+ */
+export const getHomeFeed = () => {
+  return apiClient.get(`/movies/home/`)
+}
@@ -33,68 +33,6 @@ djangoAPI.interceptors.response.use(
   }
 )
 
-// 감정 기반 영화 추천
-export async function getMoviesByEmotion(emotionId, genreIds) {
-  console.log('🎯 TMDB API 호출 시작')
-  console.log('감정 ID:', emotionId)
-  console.log('장르 IDs:', genreIds)
-
-  if (!TMDB_API_KEY) {
-    console.error(' TMDB API 키가 설정되지 않았습니다!')
-    return []
-  }
-
-  console.log(' API 키 확인됨')
-
-  try {
-    const genreQuery = genreIds.join(',')
-    console.log('장르 쿼리 문자열:', genreQuery)
-    
-    const params = {
-      api_key: TMDB_API_KEY,
-      language: 'ko-KR',
-      sort_by: 'popularity.desc',
-      with_genres: genreQuery,
-      'vote_average.gte': 5.0,
-      'vote_count.gte': 50,
-      page: 1
-    }
-    
-    console.log('API 요청 파라미터:', params)
-    
-    const url = `${TMDB_BASE_URL}/discover/movie`
-    console.log('요청 URL:', url)
-    
-    const response = await axios.get(url, { params })
-    
-    console.log(' API 응답 성공')
-    console.log('응답 데이터:', response.data)
-    console.log('총 결과 수:', response.data.total_results)
-    console.log('현재 페이지 결과 수:', response.data.results.length)
-
-    if (response.data.results.length === 0 && genreIds.length > 1) {
-      console.log('결과 없음. 첫 번째 장르만으로 재시도:', genreIds[0])
-      
-      const fallbackResponse = await axios.get(url, {
-        params: {
-          ...params,
-          with_genres: genreIds[0]  // 첫 번째 장르만
-        }
-      })
-      
-      console.log('대체 검색 결과:', fallbackResponse.data.results.length)
-      return fallbackResponse.data.results
-    }
-
-    return response.data.results
-  } catch (error) {
-    console.error(' TMDB API 에러:', error)
-    console.error('에러 응답:', error.response?.data)
-    console.error('에러 상태:', error.response?.status)
-    return []
-  }
-}
-
 // 인기 영화 가져오기
 export async function getPopularMovies(page = 1) {
   try {
@@ -1,61 +0,0 @@
-// TMDB 장르 ID 매핑
-export const TMDB_GENRES = {
-  28: '액션',
-  12: '어드벤처',
-  16: '애니메이션',
-  35: '코미디',
-  80: '범죄',
-  99: '다큐멘터리',
-  18: '드라마',
-  10751: '가족',
-  14: '판타지',
-  36: '역사',
-  27: '공포',
-  10402: '음악',
-  9648: '미스터리',
-  10749: '로맨스',
-  878: 'SF',
-  10770: 'TV 영화',
-  53: '스릴러',
-  10752: '전쟁',
-  37: '서부'
-}
-
-// 감정별 TMDB 장르 ID
-export const emotionToGenres = {
-  joy: {
-    name: '기쁨',
-    genreIds: [35, 10749, 10751, 16], // 코미디, 로맨스, 가족, 애니메이션
-    keywords: ['행복', '즐거움', '웃음', '기쁨']
-  },
-  sadness: {
-    name: '슬픔',
-    genreIds: [18, 10749, 10402, 99], // 드라마, 로맨스, 음악, 다큐멘터리, 
-    keywords: ['슬픔', '눈물', '감동', '위로']
-  },
-  anger: {
-    name: '분노',
-    genreIds: [28, 53, 80], // 액션, 스릴러, 범죄
-    keywords: ['복수', '정의', '액션', '강렬함']
-  },
-  fear: {
-    name: '두려움',
-    genreIds: [27, 53, 9648], // 공포, 스릴러, 미스터리
-    keywords: ['공포', '긴장', '서스펜스', '미스터리']
-  },
-  excitement: {
-    name: '흥분',
-    genreIds: [28, 878, 12], // 액션, SF, 어드벤처
-    keywords: ['박진감', '스펙터클', '모험', '액션']
-  },
-  calm: {
-    name: '평온',
-    genreIds: [16, 10751, 14], // 판타지, 다큐멘터리, 가족
-    keywords: ['힐링', '평화', '자연', '편안함']
-  },
-  melancholy: {
-    name: '우울',
-    genreIds: [18, 80, 36], // 드라마, 범죄, 역사
-    keywords: ['우울', '감성', '깊이', '성찰']
-  }
-}
\ No newline at end of file